@@ -0,0 +1,7 @@
+# 📄 Archivo: app/__main__.py
+# Punto de entrada de la línea de comandos: python -m app --help
+import sys
+from app.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+# 📄 Archivo: app/cli.py
+"""
+Línea de comandos sin interfaz gráfica: python -m app <subcomando> ...
+
+  probe     lista las pistas de subtítulos de uno o varios videos
+  extract   extrae pistas de subtítulos a .srt (con --translate-to, las traduce
+            en el mismo flujo sin guardar el .srt extraído)
+  translate traduce archivos .srt
+  fixtimes  copia los tiempos del original sobre una traducción
+  retime    desplaza, cambia de fps o resincroniza los tiempos de .srt/.vtt
+
+Las rutas admiten archivos, carpetas (se recorren recursivamente) y patrones
+glob ("series/**/*.mkv"). El progreso se escribe en stdout como una línea JSON
+por evento; los mensajes de log van a stderr. No importa PySide6.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+from app.services.logging_config import get_logger, set_verbose
+from app.services import instrumentation
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+ENGINES = ("google_free", "google_v1", "mymemory")
+SUBTITLE_EXT = {".srt"}
+RETIME_EXT = {".srt", ".vtt"}
+_GLOB_CHARS = set("*?[")
+
+# ------------------ Salida JSON ------------------
+_emit_lock = threading.Lock()
+
+def emit(event: str, **fields) -> None:
+    """Escribe un evento como una línea JSON en stdout (seguro entre hilos)."""
+    record = {"event": event, **fields}
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _emit_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+# ------------------ Expansión de rutas ------------------
+def expand_paths(patterns: Sequence[str], extensions: set) -> Tuple[List[Tuple[Path, Path]], List[str]]:
+    """
+    Expande archivos, carpetas y globs a una lista (archivo, raíz) sin duplicados.
+    La raíz es la carpeta indicada (o la del archivo) y se usa para rutas de salida relativas.
+    En carpetas y globs solo se incluyen archivos con las extensiones dadas.
+    Devuelve también las rutas que no existen (ya notificadas como evento "error").
+    """
+    found: List[Tuple[Path, Path]] = []
+    missing: List[str] = []
+    seen = set()
+
+    def add(path: Path, root: Path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            found.append((path, root))
+
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            for f in sorted(p.rglob("*")):
+                if f.is_file() and f.suffix.lower() in extensions:
+                    add(f, p)
+        elif p.is_file():
+            add(p, p.parent)
+        elif _GLOB_CHARS & set(pattern):
+            root = _glob_root(pattern)
+            for match in sorted(glob.glob(pattern, recursive=True)):
+                f = Path(match)
+                if f.is_file() and f.suffix.lower() in extensions:
+                    add(f, root)
+        else:
+            missing.append(pattern)
+            emit("error", path=pattern, message="No existe")
+    return found, missing
+
+def _glob_root(pattern: str) -> Path:
+    """Parte fija (sin comodines) de un patrón glob."""
+    parts = []
+    for part in Path(pattern).parts:
+        if _GLOB_CHARS & set(part):
+            break
+        parts.append(part)
+    return Path(*parts) if parts else Path(".")
+
+# ------------------ probe ------------------
+def cmd_probe(args) -> int:
+    from app.core.ffmpeg_utils import probe_video
+    from app.core.batch import VIDEO_EXT
+
+    videos, missing = expand_paths(args.paths, VIDEO_EXT)
+    failed = len(missing)
+
+    def work(video: Path):
+        return probe_video(video, use_cache=not args.no_cache)
+
+    with ThreadPoolExecutor(max_workers=_jobs(args.jobs)) as pool:
+        futures = {pool.submit(work, v): v for v, _ in videos}
+        for fut in as_completed(futures):
+            video = futures[fut]
+            try:
+                result = fut.result()
+            except Exception as e:
+                failed += 1
+                emit("error", path=str(video), message=str(e))
+                continue
+            emit("probe", path=str(video), tracks=[dict(t) for t in result.tracks])
+
+    emit("done", total=len(videos), failed=failed)
+    return 1 if failed else 0
+
+# ------------------ extract ------------------
+def _select_tracks(tracks, args) -> List[int]:
+    """Índices a extraer según --track / --lang / --all (por defecto, la pista predeterminada)."""
+    from app.core.ffmpeg_utils import BITMAP_CODECS, choose_track
+
+    text_tracks = [t for t in tracks if t["codec_name"] not in BITMAP_CODECS]
+    if args.track:
+        return list(args.track)
+    if args.all:
+        return [t["index"] for t in text_tracks]
+    if args.lang:
+        langs = {l.lower() for l in args.lang}
+        return [t["index"] for t in text_tracks if t.get("language") in langs]
+    chosen = choose_track(text_tracks, auto_select=True)
+    return [chosen["index"]] if chosen else []
+
+def _extract_and_translate(video: Path, root: Path, indexes: List[int], suffix_fmt: str, probe, args):
+    """
+    Cada pista pasa de ffmpeg a la traducción en memoria; solo se escribe el SRT traducido.
+    Devuelve (índice, ok, mensaje, salida, incidencias del SRT) por pista.
+    """
+    from app.core.batch import extract_and_translate
+    from app.core.subtitles import SrtDiagnostics
+    from app.core.translation_service import TranslationService
+
+    service = TranslationService(args.engine)
+    results = []
+    for index in indexes:
+        def on_progress(done: int, total: int, index=index):
+            emit("progress", path=str(video), track=index, done=done, total=total)
+        diagnostics = SrtDiagnostics()
+        ok, msg, out_path = extract_and_translate(
+            video, root, index, service, args.src, args.translate_to,
+            suffix=suffix_fmt.format(index=index), probe=probe, on_progress=on_progress,
+            diagnostics=diagnostics
+        )
+        results.append((index, ok, msg, out_path, len(diagnostics)))
+    return results
+
+def cmd_extract(args) -> int:
+    from app.core.batch import VIDEO_EXT, process_many
+    from app.core.ffmpeg_utils import probe_video, check_binaries
+    from app.core.scheduler import ExtractionScheduler
+
+    check_binaries()
+    videos, missing = expand_paths(args.paths, VIDEO_EXT)
+    counts = {"done": 0, "failed": len(missing)}
+    event = "translate" if args.translate_to else "extract"
+
+    def work(video: Path, root: Path):
+        probe = probe_video(video)
+        indexes = _select_tracks(probe.tracks, args)
+        if not indexes:
+            return []
+        suffix_fmt = "_track{index}" if len(indexes) > 1 else ""
+        if args.translate_to:
+            return _extract_and_translate(video, root, indexes, suffix_fmt, probe, args)
+        # Extracción a archivo: ffmpeg escribe el SRT y aquí no se analiza
+        return [(*result, None) for result in process_many(video, root, indexes, suffix_fmt=suffix_fmt, probe=probe)]
+
+    def on_done(video: Path, root: Path, results, error: Optional[BaseException]):
+        counts["done"] += 1
+        if error is not None:
+            counts["failed"] += 1
+            emit("error", path=str(video), message=str(error))
+        elif not results:
+            counts["failed"] += 1
+            emit("error", path=str(video), message="Sin pistas de texto que extraer")
+        else:
+            for index, ok, msg, out_path, issues in results:
+                if not ok:
+                    counts["failed"] += 1
+                fields = {} if issues is None else {"issues": issues}
+                emit(event, path=str(video), track=index, ok=ok, message=msg,
+                     output=str(out_path) if out_path else None, **fields)
+        emit("progress", done=counts["done"], total=len(videos))
+
+    ExtractionScheduler(max_workers=args.jobs).run(videos, work, on_done)
+    emit("done", total=len(videos), failed=counts["failed"])
+    return 1 if counts["failed"] else 0
+
+# ------------------ translate ------------------
+def cmd_translate(args) -> int:
+    from app.core.subtitles import SrtDiagnostics
+    from app.core.translation_service import TranslationService
+    from app.core.translate_pipeline import translate_file, file_concurrency
+
+    # Las carpetas de salida (Subtitles_<dst>) no se vuelven a traducir
+    out_folder = f"Subtitles_{args.dst}"
+    found, missing = expand_paths(args.paths, SUBTITLE_EXT)
+    files = [f for f, _ in found if f.parent.name != out_folder]
+    jobs = args.jobs or file_concurrency(args.engine)
+    cancel_flag = threading.Event()
+    failed = len(missing)
+
+    def work(path: Path) -> Tuple[Optional[str], SrtDiagnostics]:
+        def on_progress(done: int, total: int):
+            emit("progress", path=str(path), done=done, total=total)
+        service = TranslationService(args.engine)
+        diagnostics = SrtDiagnostics()
+        out_path = translate_file(
+            str(path), service, args.src, args.dst,
+            cancel_flag=cancel_flag, on_progress=on_progress, diagnostics=diagnostics
+        )
+        return out_path, diagnostics
+
+    log.info(f"CLI: traduciendo {len(files)} archivos, {jobs} simultáneos ({args.engine})")
+    pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="translate")
+    try:
+        futures = {pool.submit(work, f): f for f in files}
+        for fut in as_completed(futures):
+            path = futures[fut]
+            try:
+                out_path, diagnostics = fut.result()
+            except Exception as e:
+                failed += 1
+                emit("error", path=str(path), message=str(e))
+                continue
+            if out_path is not None:
+                emit("translate", path=str(path), output=out_path, issues=len(diagnostics))
+    except KeyboardInterrupt:
+        cancel_flag.set()
+        emit("cancelled")
+        return 130
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    emit("done", total=len(files), failed=failed)
+    return 1 if failed else 0
+
+# ------------------ fixtimes ------------------
+def cmd_fixtimes(args) -> int:
+    from app.core.timefix import compare_and_fix_times
+
+    out_path = args.output or args.translated
+    summary = compare_and_fix_times(args.original, args.translated, out_path)
+    emit("fixtimes", original=args.original, translated=args.translated, output=out_path, **summary)
+    return 0
+
+# ------------------ retime ------------------
+def _build_transform(args):
+    """Compone --fps, --sync y --shift, en ese orden."""
+    from app.core.timefix import TimeTransform
+
+    transform = TimeTransform()
+    if args.fps:
+        transform = transform.then(TimeTransform.fps(*args.fps))
+    if args.sync:
+        (a1, b1), (a2, b2) = args.sync
+        transform = transform.then(TimeTransform.two_point(a1, b1, a2, b2))
+    if args.shift:
+        transform = transform.then(TimeTransform.shift(args.shift))
+    return transform
+
+def cmd_retime(args) -> int:
+    from app.core.timefix import retime_files
+
+    transform = _build_transform(args)
+    found, missing = expand_paths(args.paths, RETIME_EXT)
+    out_dir = args.output_dir.resolve() if args.output_dir else None
+    jobs = []
+    for path, root in found:
+        if out_dir is None:
+            jobs.append((path, None))
+        elif out_dir not in path.resolve().parents:  # salidas de una ejecución anterior
+            jobs.append((path, out_dir / path.relative_to(root)))
+
+    log.info(f"CLI: ajustando tiempos de {len(jobs)} archivos ({transform.describe()})")
+    failed = len(missing)
+    # retime_files procesa los archivos de uno en uno: memoria constante con miles de archivos
+    for result in retime_files(jobs, transform):
+        if "error" in result:
+            failed += 1
+            emit("error", path=result["path"], message=result["error"])
+        else:
+            emit("retime", **result)
+
+    emit("done", total=len(jobs), failed=failed, transform=transform.describe())
+    return 1 if failed else 0
+
+# ------------------ Argumentos ------------------
+def _jobs(value: Optional[int]) -> int:
+    return max(1, value or os.cpu_count() or 1)
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("debe ser >= 1")
+    return n
+
+def _offset(value: str) -> int:
+    from app.core.timefix import parse_offset
+    try:
+        return parse_offset(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tiempo no válido: {value!r}")
+
+def _fps_pair(value: str):
+    from app.core.timefix import parse_fps
+    try:
+        src, dst = value.split(":")
+        return parse_fps(src), parse_fps(dst)
+    except (ValueError, ZeroDivisionError):
+        raise argparse.ArgumentTypeError(f"se esperaba ORIGEN:DESTINO, p. ej. 23.976:25 (no {value!r})")
+
+def _sync_point(value: str):
+    before, sep, after = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"se esperaba ANTES=DESPUÉS (no {value!r})")
+    return _offset(before), _offset(after)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Extracción y traducción de subtítulos sin interfaz gráfica.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log detallado (DEBUG) en stderr")
+    parser.add_argument("--profile", action="store_true", help="informe de tiempos (JSON junto a log.txt)")
+    parser.add_argument("--trace", action="store_true", help="con --profile, exporta también una traza Chrome")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("probe", help="lista las pistas de subtítulos de los videos")
+    p.add_argument("paths", nargs="+", help="videos, carpetas o patrones glob")
+    p.add_argument("-j", "--jobs", type=_positive_int, default=None, help="análisis simultáneos (por defecto, núcleos)")
+    p.add_argument("--no-cache", action="store_true", help="ignora la caché de análisis")
+    p.set_defaults(func=cmd_probe)
+
+    p = sub.add_parser("extract", help="extrae pistas de subtítulos a .srt")
+    p.add_argument("paths", nargs="+", help="videos, carpetas o patrones glob")
+    p.add_argument("-j", "--jobs", type=_positive_int, default=None, help="videos simultáneos (por defecto, extract_workers)")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--track", type=int, action="append", help="índice de pista (repetible)")
+    group.add_argument("--lang", action="append", help="idioma de las pistas, p. ej. eng (repetible)")
+    group.add_argument("--all", action="store_true", help="todas las pistas de texto")
+    p.add_argument("--translate-to", metavar="DST",
+                   help="traduce cada pista extraída a este idioma sin guardar el .srt extraído")
+    p.add_argument("--src", default="auto", help="con --translate-to: idioma origen (por defecto, auto)")
+    p.add_argument("--engine", choices=ENGINES, default="google_v1", help="con --translate-to: motor de traducción")
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("translate", help="traduce archivos .srt")
+    p.add_argument("paths", nargs="+", help="archivos .srt, carpetas o patrones glob")
+    p.add_argument("--src", default="auto", help="idioma origen (por defecto, auto)")
+    p.add_argument("--dst", required=True, help="idioma destino, p. ej. es")
+    p.add_argument("--engine", choices=ENGINES, default="google_v1")
+    p.add_argument("-j", "--jobs", type=_positive_int, default=None, help="archivos simultáneos (por defecto, según el motor)")
+    p.set_defaults(func=cmd_translate)
+
+    p = sub.add_parser("fixtimes", help="copia los tiempos del original sobre una traducción")
+    p.add_argument("original", help="SRT original")
+    p.add_argument("translated", help="SRT traducido")
+    p.add_argument("-o", "--output", help="archivo de salida (por defecto, sobrescribe el traducido)")
+    p.set_defaults(func=cmd_fixtimes)
+
+    p = sub.add_parser("retime", help="desplaza, cambia de fps o resincroniza los tiempos de .srt/.vtt",
+                       description="Ajusta los tiempos de subtítulos .srt/.vtt. Las opciones se combinan "
+                                   "y se aplican en orden: --fps, --sync, --shift.")
+    p.add_argument("paths", nargs="+", help="archivos .srt/.vtt, carpetas o patrones glob")
+    p.add_argument("--shift", type=_offset, help="desplazamiento: 1500 (ms), +00:00:01,200 o, si es negativo, --shift=-2.5s")
+    p.add_argument("--fps", type=_fps_pair, metavar="ORIGEN:DESTINO", help="cambio de fps, p. ej. 23.976:25")
+    p.add_argument("--sync", type=_sync_point, nargs=2, metavar="ANTES=DESPUÉS",
+                   help="resincronización lineal por dos puntos, p. ej. 00:01:02,000=00:01:03,500 01:40:00=01:40:05,2")
+    output = p.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--output-dir", type=Path, help="carpeta de salida (replica las subcarpetas)")
+    output.add_argument("--in-place", action="store_true", help="sobrescribe los archivos originales")
+    p.set_defaults(func=cmd_retime)
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "retime" and args.shift is None and not (args.fps or args.sync):
+        parser.error("retime: indica al menos --shift, --fps o --sync")
+    if args.verbose:
+        set_verbose(True)
+    if args.profile or args.trace:
+        instrumentation.enable(trace=args.trace)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        emit("cancelled")
+        return 130
+    except Exception as e:
+        log.exception(f"Error en {args.command}: {e}")
+        emit("error", message=str(e))
+        return 1
+    finally:
+        report_path = instrumentation.write_report(args.command)
+        if report_path is not None:
+            emit("profile", path=str(report_path))
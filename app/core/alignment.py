@@ -0,0 +1,303 @@
+# 📄 Archivo: app/core/alignment.py
+"""
+Alineación de subtítulos traducidos con el original cuando no tienen el mismo
+número de entradas (líneas partidas en dos, entradas fusionadas, perdidas o sobrantes).
+
+Programación dinámica tipo Needleman–Wunsch sobre los tiempos y la longitud del
+texto, con cinco movimientos:
+- match  1:1   una entrada original con una traducida;
+- split  1:2   una original partida en dos traducidas (se unen);
+- merge  2:1   dos originales fusionadas en una traducida (se reparte el texto);
+- missing 1:0  original sin traducción (conserva su texto);
+- extra  0:1   traducida sobrante (se descarta).
+
+Solo se evalúan las celdas a menos de `band` de un camino guía: para cada
+original, cuántas traducidas empiezan antes que él (o, sin tiempos, la misma
+fracción del texto acumulado). La guía sigue las derivas que acumulan las
+partidas y fusionadas, así que la banda no crece con |n - m| y el coste es
+O(n · band), lineal en la práctica.
+"""
+import math
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+from app.services.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from app.core.subtitles import SubtitleTrack
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Pesos del coste ------------------
+# Unidades: un segundo de desfase en inicio/fin cuesta 1.
+MAX_TIME_COST = 10.0     # tope del coste por tiempos de una pareja
+LENGTH_WEIGHT = 1.0      # peso de |log(relación de longitudes)|
+GAP_COST = 1.5           # entrada original sin traducción o traducida sobrante
+SPLIT_COST = 0.5         # penalización extra de split/merge frente a match
+BAND = 8                 # semiancho de la banda alrededor del camino guía
+OFFSET_BUCKET_MS = 100   # resolución al estimar el desfase global
+
+MATCH, SPLIT, MERGE, MISSING, EXTRA = "match", "split", "merge", "missing", "extra"
+# (avance en original, avance en traducido) de cada movimiento
+_MOVES = {MATCH: (1, 1), SPLIT: (1, 2), MERGE: (2, 1), MISSING: (1, 0), EXTRA: (0, 1)}
+# Códigos compactos de los movimientos en la matriz de retroceso (0 = sin movimiento)
+_MATCH, _SPLIT, _MERGE, _MISSING, _EXTRA = range(1, 6)
+_MOVE_NAMES = (None, MATCH, SPLIT, MERGE, MISSING, EXTRA)
+_INF = float("inf")
+
+
+@dataclass
+class AlignmentResult:
+    """Camino de alineación: pasos (movimiento, índice original, índice traducido) y coste."""
+    steps: List[Tuple[str, int, int]]
+    cost: float
+    band: int
+    offset_ms: int = 0            # desfase global estimado (traducido - original)
+    counts: dict = field(default_factory=dict)
+
+    @property
+    def mean_cost(self) -> float:
+        """Coste medio por entrada original (0 = alineación perfecta)."""
+        originals = sum(_MOVES[kind][0] for kind, _, _ in self.steps)
+        return self.cost / originals if originals else 0.0
+
+    def summary(self) -> dict:
+        return {"cost": round(self.cost, 3), "mean_cost": round(self.mean_cost, 4),
+                "band": self.band, "offset_ms": self.offset_ms, **self.counts}
+
+
+def _length_guide(o_lens, t_lens) -> List[int]:
+    """Para cada fila i, traducidas que cubren la misma fracción del texto que original[:i]."""
+    n, m = len(o_lens), len(t_lens)
+    cumulative_t = [0]
+    for x in t_lens:
+        cumulative_t.append(cumulative_t[-1] + x + 1)
+    scale = cumulative_t[-1] / (sum(o_lens) + n or 1)
+    guide, acc = [], 0
+    for i in range(n):
+        guide.append(min(m, bisect_left(cumulative_t, acc * scale)))
+        acc += o_lens[i] + 1
+    guide.append(m)
+    return guide
+
+
+def _time_guide(o_starts, t_starts, offset: int) -> List[int]:
+    """Para cada fila i, traducidas que empiezan (descontado el desfase) antes que original[i]."""
+    m = len(t_starts)
+    running, sorted_starts = -math.inf, []
+    for t in t_starts:  # máximo acumulado: tolera traducidas desordenadas
+        running = max(running, t - offset)
+        sorted_starts.append(running)
+    guide = [bisect_left(sorted_starts, s) for s in o_starts]
+    guide.append(m)
+    return guide
+
+
+def _estimate_offset(o_starts, t_starts, guide: List[int], band: int) -> int:
+    """
+    Desfase global (inicio traducido - inicio original): la diferencia más repetida
+    entre cada original muestreado y las traducidas cercanas según la guía. Las
+    parejas correctas coinciden en el mismo desfase; las demás se reparten al azar.
+    """
+    n, m = len(o_starts), len(t_starts)
+    if not n or not m:
+        return 0
+    step = max(1, n // 500)
+    buckets = Counter()
+    diffs = []
+    for i in range(0, n, step):
+        center = guide[i]
+        for j in range(max(0, center - band), min(m, center + band + 1)):
+            d = t_starts[j] - o_starts[i]
+            buckets[d // OFFSET_BUCKET_MS] += 1
+            diffs.append(d)
+    best = buckets.most_common(1)[0][0]
+    # Mediana de las diferencias del cubo ganador y sus vecinos
+    near = sorted(d for d in diffs if abs(d // OFFSET_BUCKET_MS - best) <= 1)
+    return near[len(near) // 2]
+
+
+def align(
+    o_starts: Sequence[int], o_ends: Sequence[int], o_lens: Sequence[int],
+    t_starts: Sequence[int], t_ends: Sequence[int], t_lens: Sequence[int],
+    use_times: Optional[bool] = None, band: Optional[int] = None
+) -> AlignmentResult:
+    """
+    Alinea dos secuencias de entradas descritas por inicio/fin (ms) y longitud de texto.
+    use_times: None = solo si las traducidas traen tiempos (no todos a 0).
+    """
+    n, m = len(o_starts), len(t_starts)
+    if use_times is None:
+        use_times = any(t_ends)
+    if band is None:
+        band = BAND
+    guide = _length_guide(o_lens, t_lens)
+    offset = 0
+    if use_times:
+        offset = _estimate_offset(o_starts, t_starts, guide, 2 * band)
+        guide = _time_guide(o_starts, t_starts, offset)
+    # Relación de longitudes esperada entre idiomas (el español ocupa más que el inglés, etc.)
+    log_ratio = math.log((sum(t_lens) + 1) / (sum(o_lens) + 1))
+    ln = math.log
+    # Logaritmos de longitudes precalculados (también de las parejas unidas por split/merge)
+    lo1 = [ln(x + 1) + log_ratio for x in o_lens]
+    lo2 = [ln(o_lens[i] + o_lens[i + 1] + 1) + log_ratio for i in range(n - 1)]
+    lt1 = [ln(x + 1) for x in t_lens]
+    lt2 = [ln(t_lens[j] + t_lens[j + 1] + 1) for j in range(m - 1)]
+    ts_ = [t - offset for t in t_starts]
+    te_ = [t - offset for t in t_ends]
+    time_scale = 1 / 2000 if use_times else 0.0   # media de |Δinicio| y |Δfin|, en segundos
+
+    # De los costes basta con las dos filas anteriores; para reconstruir el camino
+    # se guardan solo los movimientos (un byte por celda)
+    p1: List[float] = []
+    p2: List[float] = []
+    p1lo = p2lo = 0
+    rows_move: List[bytearray] = []
+    row_lo: List[int] = []
+    row_hi: List[int] = []
+    prev_hi = 0
+    for i in range(n + 1):
+        # Banda alrededor de la guía (monótona); empieza como mucho donde acabó la fila
+        # anterior para que siempre haya camino hasta la esquina
+        center = max(guide[i], guide[i - 1] if i else 0)
+        guide[i] = center
+        lo = max(0, min(center - band, prev_hi))
+        hi = m if i == n else min(m, center + band)
+        prev_hi = hi
+        costs = [_INF] * (hi - lo + 1)
+        moves = bytearray(hi - lo + 1)
+        # Filas anteriores: p1 = i-1 (match/split/missing), p2 = i-2 (merge)
+        np1, np2 = len(p1), len(p2)
+        if i >= 1:
+            os_, oe, l1 = o_starts[i - 1], o_ends[i - 1], lo1[i - 1]
+        if i >= 2:
+            ms_, l2 = o_starts[i - 2], lo2[i - 2]
+        for j in range(lo, hi + 1):
+            if i == 0 and j == 0:
+                costs[0] = 0.0
+                continue
+            best, move = _INF, 0
+            if j > lo:  # extra: traducida j-1 sobrante
+                c = costs[j - 1 - lo] + GAP_COST
+                if c < best:
+                    best, move = c, _EXTRA
+            if i >= 1:
+                k = j - p1lo
+                if 0 <= k < np1:  # missing: original i-1 sin traducción
+                    c = p1[k] + GAP_COST
+                    if c < best:
+                        best, move = c, _MISSING
+                if j >= 1 and 0 <= k - 1 < np1 and p1[k - 1] < best:  # match
+                    tc = (abs(ts_[j - 1] - os_) + abs(te_[j - 1] - oe)) * time_scale
+                    c = p1[k - 1] + abs(lt1[j - 1] - l1) + (tc if tc < MAX_TIME_COST else MAX_TIME_COST)
+                    if c < best:
+                        best, move = c, _MATCH
+                if j >= 2 and 0 <= k - 2 < np1 and p1[k - 2] + SPLIT_COST < best:  # split
+                    tc = (abs(ts_[j - 2] - os_) + abs(te_[j - 1] - oe)) * time_scale
+                    c = p1[k - 2] + SPLIT_COST + abs(lt2[j - 2] - l1) + (tc if tc < MAX_TIME_COST else MAX_TIME_COST)
+                    if c < best:
+                        best, move = c, _SPLIT
+            if i >= 2 and j >= 1:
+                k = j - 1 - p2lo
+                if 0 <= k < np2 and p2[k] + SPLIT_COST < best:  # merge
+                    tc = (abs(ts_[j - 1] - ms_) + abs(te_[j - 1] - oe)) * time_scale
+                    c = p2[k] + SPLIT_COST + abs(lt1[j - 1] - l2) + (tc if tc < MAX_TIME_COST else MAX_TIME_COST)
+                    if c < best:
+                        best, move = c, _MERGE
+            costs[j - lo] = best
+            moves[j - lo] = move
+        p2, p2lo = p1, p1lo
+        p1, p1lo = costs, lo
+        rows_move.append(moves)
+        row_lo.append(lo)
+        row_hi.append(hi)
+
+    total = p1[m - row_lo[n]]
+    if total == _INF:
+        raise ValueError("No se pudo alinear")  # no ocurre: la banda siempre enlaza las filas
+
+    # Reconstruir el camino desde la esquina
+    steps: List[Tuple[str, int, int]] = []
+    touches_edge = False
+    i, j = n, m
+    while i > 0 or j > 0:
+        if (j == row_lo[i] and j > 0) or (j == row_hi[i] and j < m):
+            touches_edge = True
+        kind = _MOVE_NAMES[rows_move[i][j - row_lo[i]]]
+        di, dj = _MOVES[kind]
+        i, j = i - di, j - dj
+        steps.append((kind, i, j))
+    steps.reverse()
+
+    # Si el camino óptimo roza el borde, la banda lo estaba limitando (p. ej. un bloque
+    # de traducidas sobrantes sin tiempos): repetir con el doble de ancho
+    if touches_edge and band < abs(n - m) + BAND:
+        return align(o_starts, o_ends, o_lens, t_starts, t_ends, t_lens, use_times, band * 2)
+
+    counts = {kind: 0 for kind in _MOVES}
+    for kind, _, _ in steps:
+        counts[kind] += 1
+    return AlignmentResult(steps, total, band, offset, counts)
+
+# ------------------ Reparto de textos ------------------
+def align_tracks(original: "SubtitleTrack", translated: "SubtitleTrack", **kwargs) -> AlignmentResult:
+    """align() sobre las columnas de dos SubtitleTrack (longitudes: traducción si la hay)."""
+    return align(
+        original.starts, original.ends, original.text_lengths(),
+        translated.starts, translated.ends, translated.text_lengths(),
+        **kwargs
+    )
+
+
+def split_text(text: str, weights: Tuple[int, int]) -> Tuple[str, str]:
+    """
+    Reparte un texto traducido entre dos entradas originales en proporción a
+    sus longitudes: por líneas si tiene varias, si no por palabras.
+    """
+    total = sum(weights) or 1
+    lines = [line for line in text.split("\n") if line.strip()]
+    if len(lines) >= 2:
+        k = min(len(lines) - 1, max(1, round(len(lines) * weights[0] / total)))
+        return "\n".join(lines[:k]), "\n".join(lines[k:])
+    words = text.split()
+    if len(words) < 2:
+        return text, ""
+    # Corte en la palabra cuyo final queda más cerca de la proporción de caracteres
+    target = len(text) * weights[0] / total
+    best_k, best_diff, pos = 1, _INF, 0
+    for k, word in enumerate(words[:-1], 1):
+        pos += len(word) + 1
+        if abs(pos - target) < best_diff:
+            best_k, best_diff = k, abs(pos - target)
+    return " ".join(words[:best_k]), " ".join(words[best_k:])
+
+
+def texts_for_originals(
+    result: AlignmentResult, original_texts: Sequence[str], translated_texts: Sequence[str]
+) -> List[Optional[str]]:
+    """Un texto traducido por entrada original según el camino (None = sin traducción)."""
+    out: List[Optional[str]] = [None] * len(original_texts)
+    for kind, i, j in result.steps:
+        if kind == MATCH:
+            out[i] = translated_texts[j]
+        elif kind == SPLIT:
+            out[i] = "\n".join(t.strip() for t in (translated_texts[j], translated_texts[j + 1]) if t.strip())
+        elif kind == MERGE:
+            out[i], out[i + 1] = split_text(
+                translated_texts[j], (len(original_texts[i]), len(original_texts[i + 1]))
+            )
+            if not out[i + 1]:
+                out[i + 1] = None
+    return out
+
+
+def log_result(result: AlignmentResult, label: str = "") -> None:
+    c = result.counts
+    log.info(
+        f"Alineación{' ' + label if label else ''}: coste {result.cost:.2f} "
+        f"(medio {result.mean_cost:.3f}), {c[MATCH]} 1:1, {c[SPLIT]} partidas, "
+        f"{c[MERGE]} fusionadas, {c[MISSING]} sin traducción, {c[EXTRA]} sobrantes"
+    )
@@ -0,0 +1,229 @@
+# 📄 Archivo: app/core/async_engines.py
+
+import asyncio
+import random
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, CancelledError, TimeoutError as FutureTimeout
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.core.translators import (
+    ITranslator, GoogleV1Translator, MyMemoryTranslator, REQ_TIMEOUT, engine_endpoint, _dedup, _recompose
+)
+from app.core.rate_limit import get_rate_limiter
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Límites por defecto ------------------
+DEFAULT_MAX_CONNECTIONS = 64     # conexiones HTTP abiertas en total (todas las peticiones)
+DEFAULT_ENGINE_CONCURRENCY = 16  # peticiones simultáneas por motor
+_CANCEL_POLL = 0.1               # segundos entre comprobaciones de cancelación
+
+
+def async_available() -> bool:
+    """True si httpx (dependencia opcional) está instalado."""
+    try:
+        import httpx  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# ------------------ Bucle asyncio compartido ------------------
+class EngineLoop:
+    """
+    Un único bucle asyncio en un hilo demonio, compartido por todos los workers.
+    Mantiene un cliente httpx con pool de conexiones y keep-alive, de modo que
+    cientos de peticiones en curso no necesitan cientos de hilos del sistema.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.max_connections = max(1, int(max_connections))
+        self._loop = asyncio.new_event_loop()
+        self._client = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._thread = threading.Thread(target=self._run, name="engine-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    # ------------------ Recursos del bucle (solo desde corrutinas) ------------------
+    def client(self):
+        """Cliente httpx compartido (se crea en el propio bucle la primera vez)."""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=REQ_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                headers={
+                    "user-agent": "Mozilla/5.0 (Windows NT 6.1) AppleWebKit/537.36 "
+                                  "(KHTML, like Gecko) Chrome/41.0.2228.0 Safari/537.36",
+                },
+            )
+        return self._client
+
+    def semaphore(self, engine: str) -> asyncio.Semaphore:
+        """Limita las peticiones simultáneas de un motor ("http_engine_concurrency")."""
+        sem = self._semaphores.get(engine)
+        if sem is None:
+            limits = get_settings().config.get("http_engine_concurrency") or {}
+            sem = asyncio.Semaphore(max(1, int(limits.get(engine, DEFAULT_ENGINE_CONCURRENCY))))
+            self._semaphores[engine] = sem
+        return sem
+
+    # ------------------ Envío desde otros hilos ------------------
+    def submit(self, coro: Awaitable) -> Future:
+        """Programa una corrutina en el bucle y devuelve un Future de concurrent.futures."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, cancel_flag=None):
+        """
+        Ejecuta una corrutina y espera su resultado desde un hilo normal (p. ej. un worker Qt).
+        Si cancel_flag se activa, cancela la tarea y lanza CancelledError.
+        """
+        future = self.submit(coro)
+        while True:
+            try:
+                return future.result(timeout=_CANCEL_POLL)
+            except FutureTimeout:
+                if cancel_flag is not None and cancel_flag.is_set():
+                    future.cancel()
+                    raise CancelledError()
+
+
+_engine_loop: Optional[EngineLoop] = None
+_engine_loop_lock = threading.Lock()
+
+def get_engine_loop() -> EngineLoop:
+    """Devuelve el bucle compartido; "http_max_connections" en config.json fija el pool."""
+    global _engine_loop
+    with _engine_loop_lock:
+        if _engine_loop is None:
+            S = get_settings()
+            _engine_loop = EngineLoop(S.config.get("http_max_connections") or DEFAULT_MAX_CONNECTIONS)
+        return _engine_loop
+
+# ------------------ Interfaz asíncrona ------------------
+class IAsyncTranslator(ABC):
+    """Equivalente asíncrono de ITranslator; se ejecuta dentro de EngineLoop."""
+    name = ""
+
+    @abstractmethod
+    async def translate_lines_async(
+        self, lines: List[str], src: str, dst: str, on_split: Optional[Callable[[int], None]] = None
+    ) -> List[str]:
+        ...
+
+
+async def _get_with_retries(engine: str, url: str, params: Optional[dict] = None):
+    """
+    GET respetando el limitador global del motor y su semáforo, con reintentos.
+    Un 429/503 pausa a todo el motor (no solo a esta petición). Lanza la última excepción.
+    """
+    import httpx
+    loop = get_engine_loop()
+    limiter = get_rate_limiter(engine)
+    last_error = None
+    for attempt in range(3):
+        try:
+            await limiter.acquire_async()
+            async with loop.semaphore(engine):
+                with span(f"http.{engine}") as sp:
+                    r = await loop.client().get(url, params=params)
+                    sp.bytes = len(r.content)
+            limiter.observe(r.status_code, r.headers.get("Retry-After"))
+            r.raise_for_status()
+            return r
+        except httpx.HTTPError as e:
+            last_error = e
+            await asyncio.sleep(0.12 * (2 ** attempt) + random.random() * 0.08)
+    raise last_error
+
+
+class AsyncGoogleV1Translator(GoogleV1Translator, IAsyncTranslator):
+    """GoogleV1 con todos los lotes en vuelo a la vez; reutiliza el parseo del traductor síncrono."""
+    name = "google_v1"
+
+    def __init__(self):
+        # sin sesión de requests: las peticiones van por el cliente httpx del bucle
+        self.base = engine_endpoint(self.name, self.base)
+
+    async def _translate_batch_async(self, batch: List[str], src: str, dst: str, on_split=None) -> List[str]:
+        """Igual que _translate_batch: verificación de marcadores y bisección, en paralelo."""
+        try:
+            r = await _get_with_retries(self.name, self._build_url(src, dst, self._batch_query(batch)))
+        except Exception as e:
+            log.error(f"Error en lote google_v1: {e}")
+            return list(batch)  # Usar original en caso de error
+        result = self._split_response(r.text, batch)
+        if result is not None:
+            return result
+        if len(batch) == 1:
+            return list(batch)
+        if on_split is not None:
+            on_split(len(batch))
+        mid = len(batch) // 2
+        first, second = await asyncio.gather(
+            self._translate_batch_async(batch[:mid], src, dst, on_split),
+            self._translate_batch_async(batch[mid:], src, dst, on_split),
+        )
+        return first + second
+
+    async def translate_lines_async(self, lines, src="auto", dst="es", on_split=None):
+        if not lines:
+            return lines
+        to_translate, translate_indices = self._select_lines(lines)
+        if not to_translate:
+            return lines
+        batches = self._request_batches(to_translate)
+        translated = await asyncio.gather(*(self._translate_batch_async(b, src, dst, on_split) for b in batches))
+        results = [line for batch in translated for line in batch]
+        return self._assemble(lines, translate_indices, results)
+
+
+class AsyncMyMemoryTranslator(MyMemoryTranslator, IAsyncTranslator):
+    """MyMemory (una petición por línea) sin hilos: todas las líneas comparten el pool HTTP."""
+    name = "mymemory"
+
+    def __init__(self):
+        # sin sesión de requests (ver AsyncGoogleV1Translator)
+        self.URL = engine_endpoint(self.name, self.URL)
+
+    async def _translate_one_async(self, text: str, src: str, dst: str) -> str:
+        try:
+            r = await _get_with_retries(self.name, self.URL, self._params(text, src, dst))
+            return self._parse(r.json(), text)
+        except Exception:
+            return text
+
+    async def translate_lines_async(self, lines, src="auto", dst="es", on_split=None):
+        unique, index_map = _dedup(lines)
+        out = await asyncio.gather(
+            *(self._translate_one_async(text, src, dst) if text else asyncio.sleep(0, "") for text in unique)
+        )
+        return _recompose(unique, list(out), index_map)
+
+# ------------------ Adaptador síncrono ------------------
+class AsyncEngineAdapter(ITranslator):
+    """
+    Expone un IAsyncTranslator como ITranslator: los workers Qt siguen llamando a
+    translate_lines() y la petición se resuelve en el bucle compartido.
+    """
+
+    def __init__(self, engine: IAsyncTranslator):
+        self.engine = engine
+
+    def translate_lines(self, lines, src="auto", dst="es", cancel_flag=None, on_split=None):
+        if cancel_flag and cancel_flag.is_set():
+            return lines
+        try:
+            return get_engine_loop().run(self.engine.translate_lines_async(lines, src, dst, on_split), cancel_flag)
+        except CancelledError:
+            return lines
@@ -2,8 +2,12 @@
 # 📄 Archivo: app/core/batch.py
 
 from pathlib import Path
-from typing import Callable, Iterable, Tuple, Optional
-from app.core.ffmpeg_utils import ffprobe_subs, extract_subtitle_stream, BITMAP_CODECS
+from typing import Callable, Iterable, List, Sequence, Tuple, Optional
+from app.core.ffmpeg_utils import (
+    CancelToken, ProbeResult, resolve_tracks, extract_subtitle_stream, extract_subtitle_streams,
+    iter_subtitle_entries, BITMAP_CODECS
+)
+from app.core.subtitles import SrtDiagnostics, SubtitleEntry
 from app.services.settings import get_settings
 from app.services.logging_config import get_logger
 
@@ -47,12 +51,23 @@ def resolve_output_path(input_root: Path, video_path: Path) -> Path:
         return Path(custom_base) / rel
     return S.install_dir / "subtitulos" / rel
 
+# ------------------ Ruta de salida de una pista ------------------
+def _track_output_path(video: Path, input_root: Path, track: dict, suffix: str) -> Path:
+    """
+    Construye el nombre de salida con idioma y sufijo único (por ejemplo: _track3)
+    para evitar sobrescrituras cuando hay varias pistas del mismo idioma.
+    """
+    lang = track.get("language", "und") or "und"
+    base_out = resolve_output_path(input_root=input_root, video_path=video)
+    return base_out.with_name(f"{base_out.stem} [{lang}]{suffix}.srt")
+
 # ------------------ Procesar un solo video/pista ------------------
 def process_one(
     video: Path,
     input_root: Path,
     sel_index: int,
-    suffix: str = ""
+    suffix: str = "",
+    probe: Optional[ProbeResult] = None
 ) -> Tuple[bool, str, Optional[Path]]:
     """
     Extrae una pista de subtítulos específica de un video.
@@ -60,9 +75,10 @@ def process_one(
     - input_root: carpeta raíz de entrada
     - sel_index: índice de pista a extraer
     - suffix: sufijo opcional para el nombre de salida (evita sobrescrituras)
+    - probe: análisis previo del video; solo se repite ffprobe si el archivo cambió
     """
     try:
-        tracks = ffprobe_subs(video)
+        tracks = resolve_tracks(video, probe)
     except Exception as e:
         return False, f"ffprobe falló: {e}", None
 
@@ -71,19 +87,15 @@ def process_one(
     if track is None:
         return False, "Índice de pista inválido. Saltado.", None
 
-    # 🔹 Construir nombre de salida con idioma y sufijo único
     lang = track.get("language", "und") or "und"
 
     try:
-        base_out = resolve_output_path(input_root=input_root, video_path=video)
+        out_path = _track_output_path(video, input_root, track, suffix)
     except Exception as e:
         return False, f"Error al resolver ruta de salida: {e}", None
 
-    # Incluir idioma y sufijo (por ejemplo: _track3) para evitar sobrescrituras
-    out_path = base_out.with_name(f"{base_out.stem} [{lang}]{suffix}.srt")
-
     try:
-        ok = extract_subtitle_stream(video, track_index=track["index"], out_srt=out_path)
+        ok = extract_subtitle_stream(video, track_index=track["index"], out_srt=out_path, tracks=tracks)
     except Exception as e:
         return False, f"Error al extraer subtítulos: {e}", None
 
@@ -92,6 +104,146 @@ def process_one(
 
     return True, f"Extraído: idioma={lang} codec={track['codec_name']} default={track['default']}", out_path
 
+# ------------------ Procesar varias pistas de un video ------------------
+def process_many(
+    video: Path,
+    input_root: Path,
+    sel_indexes: Sequence[int],
+    suffix_fmt: str = "_track{index}",
+    probe: Optional[ProbeResult] = None,
+    cancel: Optional[CancelToken] = None
+) -> List[Tuple[int, bool, str, Optional[Path]]]:
+    """
+    Extrae todas las pistas seleccionadas de un video con una sola pasada de ffmpeg.
+    - sel_indexes: índices de pista a extraer
+    - suffix_fmt: formato del sufijo de salida; recibe el índice de pista como {index}
+    - probe: análisis previo del video; solo se repite ffprobe si el archivo cambió
+    - cancel: permite matar el ffmpeg en curso desde otro hilo
+    Devuelve una lista (track_index, ok, mensaje, ruta) en el mismo orden que sel_indexes.
+    """
+    try:
+        tracks = resolve_tracks(video, probe)
+    except Exception as e:
+        return [(idx, False, f"ffprobe falló: {e}", None) for idx in sel_indexes]
+
+    supported = {t["index"]: t for t in tracks if t["codec_name"] not in BITMAP_CODECS}
+    results = {}
+    pending: List[Tuple[int, Path]] = []
+
+    for idx in sel_indexes:
+        track = supported.get(idx)
+        if track is None:
+            results[idx] = (idx, False, "Índice de pista inválido. Saltado.", None)
+            continue
+        try:
+            out_path = _track_output_path(video, input_root, track, suffix_fmt.format(index=idx))
+        except Exception as e:
+            results[idx] = (idx, False, f"Error al resolver ruta de salida: {e}", None)
+            continue
+        pending.append((idx, out_path))
+
+    if pending:
+        try:
+            oks = extract_subtitle_streams(
+                video,
+                track_indexes=[idx for idx, _ in pending],
+                out_paths=[out for _, out in pending],
+                tracks=tracks,
+                cancel=cancel
+            )
+        except Exception as e:
+            oks = None
+            for idx, _ in pending:
+                results[idx] = (idx, False, f"Error al extraer subtítulos: {e}", None)
+
+        if oks is not None:
+            for idx, out_path in pending:
+                track = supported[idx]
+                if oks.get(idx):
+                    lang = track.get("language", "und") or "und"
+                    msg = f"Extraído: idioma={lang} codec={track['codec_name']} default={track['default']}"
+                    results[idx] = (idx, True, msg, out_path)
+                else:
+                    results[idx] = (idx, False, "ffmpeg no pudo extraer/convertir la pista seleccionada.", None)
+
+    return [results[idx] for idx in sel_indexes]
+
+# ------------------ Extraer una pista directamente a memoria ------------------
+def extract_entries(
+    video: Path,
+    sel_index: int,
+    probe: Optional[ProbeResult] = None,
+    cancel: Optional[CancelToken] = None
+) -> List[SubtitleEntry]:
+    """
+    Extrae una pista de subtítulos a una lista de SubtitleEntry sin escribir SRT
+    intermedio, para encadenar extracción y traducción en un mismo flujo.
+    Lanza ValueError si la pista no existe o no es de texto.
+    """
+    tracks = resolve_tracks(video, probe)
+    track = next((t for t in tracks if t["index"] == sel_index and t["codec_name"] not in BITMAP_CODECS), None)
+    if track is None:
+        raise ValueError(f"Índice de pista inválido: {sel_index}")
+    return list(iter_subtitle_entries(video, track_index=sel_index, tracks=tracks, cancel=cancel))
+
+# ------------------ Extraer y traducir en un solo flujo ------------------
+def extract_and_translate(
+    video: Path,
+    input_root: Path,
+    sel_index: int,
+    service,
+    src_lang: str,
+    tgt_lang: str,
+    suffix: str = "",
+    probe: Optional[ProbeResult] = None,
+    cancel: Optional[CancelToken] = None,
+    cancel_flag=None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    diagnostics: Optional[SrtDiagnostics] = None
+) -> Tuple[bool, str, Optional[Path]]:
+    """
+    Extrae una pista (streaming desde ffmpeg) y la traduce sin escribir el SRT extraído:
+    solo se guarda la traducción, en Subtitles_<tgt_lang> junto a donde process_one
+    habría dejado la extracción. Devuelve (ok, mensaje, ruta de la traducción).
+    - diagnostics: recibe los bloques mal formados de la pista (siempre se avisa en el log).
+    """
+    from app.core.translate_pipeline import translate_file
+
+    try:
+        tracks = resolve_tracks(video, probe)
+    except Exception as e:
+        return False, f"ffprobe falló: {e}", None
+
+    track = next((t for t in tracks if t["index"] == sel_index and t["codec_name"] not in BITMAP_CODECS), None)
+    if track is None:
+        return False, "Índice de pista inválido. Saltado.", None
+
+    if diagnostics is None:
+        diagnostics = SrtDiagnostics()
+    try:
+        # Ruta que tendría la extracción: solo da nombre y carpeta a la traducción
+        extracted_path = _track_output_path(video, input_root, track, suffix)
+        # Pistas ya resueltas y validadas arriba: directo al streaming de ffmpeg
+        entries = list(iter_subtitle_entries(
+            video, track_index=sel_index, tracks=tracks, cancel=cancel, diagnostics=diagnostics
+        ))
+    except Exception as e:
+        return False, f"Error al extraer subtítulos: {e}", None
+    diagnostics.report(f"{video} (pista {sel_index})")
+    if cancel is not None and cancel.cancelled:
+        return False, "Cancelado", None
+    if not entries:
+        return False, "La pista no contiene subtítulos", None
+
+    out_path = translate_file(
+        str(extracted_path), service, src_lang, tgt_lang,
+        cancel_flag=cancel_flag, entries=entries, on_progress=on_progress
+    )
+    if out_path is None:
+        return False, "Cancelado", None
+    lang = track.get("language", "und") or "und"
+    return True, f"Extraído y traducido: idioma={lang} -> {tgt_lang} ({len(entries)} entradas)", Path(out_path)
+
 # ------------------ Procesar carpeta completa ------------------
 def process_folder(input_root: Path, progress_cb: Callable[[int, int, str], None], ask_track_cb) -> None:
     """
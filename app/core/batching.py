@@ -0,0 +1,127 @@
+# 📄 Archivo: app/core/batching.py
+
+import threading
+from typing import Dict, Sequence, Tuple
+from app.services.settings import get_settings, save_config
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Límites por motor ------------------
+# start: tamaño inicial (el que se usaba fijo); min/max: cotas del ajuste automático.
+# Un lote del pipeline es una petición de google_v1 (marcadores [[n]]); mymemory solo
+# admite una línea por petición, así que para él el lote es cuántas van a la vez.
+ENGINE_BATCH_LIMITS = {
+    "google_v1":   {"start": (60, 1400), "min": (1, 200), "max": (120, 4500)},
+    "google_free": {"start": (20, 900),  "min": (1, 200), "max": (50, 4500)},
+    "mymemory":    {"start": (16, 8000), "min": (1, 200), "max": (32, 8000)},
+}
+DEFAULT_BATCH_LIMITS = {"start": (20, 2500), "min": (1, 200), "max": (60, 5000)}
+
+TARGET_LATENCY = 3.0   # segundos por lote por debajo de los cuales se puede crecer
+GROW_FACTOR = 1.25
+SHRINK_FACTOR = 0.5
+
+
+def engine_batch_cap(engine: str) -> Tuple[int, int]:
+    """Tope (líneas, caracteres) de un lote del motor, aprendido o no."""
+    return ENGINE_BATCH_LIMITS.get(engine, DEFAULT_BATCH_LIMITS)["max"]
+
+
+def batch_end(texts: Sequence[str], start: int, max_lines: int, max_chars: int) -> int:
+    """Índice final (exclusivo) del lote que empieza en start; al menos una línea."""
+    end = start
+    chars = 0
+    limit = min(len(texts), start + max_lines)
+    while end < limit:
+        item_len = len(texts[end])
+        if end > start and chars + item_len > max_chars:
+            break
+        chars += item_len
+        end += 1
+    return end
+
+# ------------------ Lotes adaptativos ------------------
+class AdaptiveBatcher:
+    """
+    Tamaño de lote (líneas y caracteres) que se ajusta con la respuesta del motor:
+    - crece mientras los lotes vuelven completos y por debajo de TARGET_LATENCY;
+    - se reduce a la mitad ante errores, recuentos que no cuadran o marcadores
+      desalineados (el traductor tuvo que dividir la petición).
+    Es común a todos los workers del mismo motor y el óptimo aprendido se guarda
+    en config.json ("batch_tuning") para la siguiente sesión.
+    """
+
+    def __init__(self, engine: str, tuned: Dict = None):
+        limits = ENGINE_BATCH_LIMITS.get(engine, DEFAULT_BATCH_LIMITS)
+        self.engine = engine
+        self.min_lines, self.min_chars = limits["min"]
+        self.max_lines_cap, self.max_chars_cap = limits["max"]
+        lines, chars = limits["start"]
+        if tuned:
+            lines = tuned.get("max_lines", lines)
+            chars = tuned.get("max_chars", chars)
+        self.max_lines = self._clamp(lines, self.min_lines, self.max_lines_cap)
+        self.max_chars = self._clamp(chars, self.min_chars, self.max_chars_cap)
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @staticmethod
+    def _clamp(value, low, high) -> int:
+        return int(max(low, min(high, value)))
+
+    def take(self, texts: Sequence[str], start: int) -> int:
+        """Devuelve el índice final (exclusivo) del lote que empieza en start."""
+        with self._lock:
+            max_lines, max_chars = self.max_lines, self.max_chars
+        return batch_end(texts, start, max_lines, max_chars)
+
+    def record(self, lines: int, latency: float, ok: bool) -> None:
+        """Registra el resultado de un lote de `lines` líneas."""
+        with self._lock:
+            before = (self.max_lines, self.max_chars)
+            if not ok:
+                # Reducir por debajo del lote que falló, no solo del máximo actual
+                base = min(self.max_lines, max(lines, 1))
+                self.max_lines = self._clamp(base * SHRINK_FACTOR, self.min_lines, self.max_lines_cap)
+                self.max_chars = self._clamp(self.max_chars * SHRINK_FACTOR, self.min_chars, self.max_chars_cap)
+            elif latency < TARGET_LATENCY and lines >= self.max_lines:
+                # Solo crecer si el lote llegó al tope (si no, el tope no era el límite)
+                self.max_lines = self._clamp(self.max_lines * GROW_FACTOR + 1, self.min_lines, self.max_lines_cap)
+                self.max_chars = self._clamp(self.max_chars * GROW_FACTOR, self.min_chars, self.max_chars_cap)
+            elif latency > TARGET_LATENCY * 2:
+                self.max_lines = self._clamp(self.max_lines * 0.8, self.min_lines, self.max_lines_cap)
+                self.max_chars = self._clamp(self.max_chars * 0.8, self.min_chars, self.max_chars_cap)
+            if (self.max_lines, self.max_chars) != before:
+                self._dirty = True
+                log.debug(f"Lotes {self.engine}: {before} -> {(self.max_lines, self.max_chars)}")
+
+    def save(self) -> None:
+        """Guarda el tamaño aprendido en config.json si cambió."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            tuned = {"max_lines": self.max_lines, "max_chars": self.max_chars}
+        with _batchers_lock:
+            S = get_settings()
+            S.config.setdefault("batch_tuning", {})[self.engine] = tuned
+            try:
+                save_config(S.config)
+            except OSError as e:
+                log.warning(f"No se pudo guardar batch_tuning: {e}")
+
+
+_batchers: Dict[str, AdaptiveBatcher] = {}
+_batchers_lock = threading.Lock()
+
+def get_batcher(engine: str) -> AdaptiveBatcher:
+    """Devuelve el ajustador de lotes del motor, común a todo el proceso."""
+    with _batchers_lock:
+        batcher = _batchers.get(engine)
+        if batcher is None:
+            tuned = (get_settings().config.get("batch_tuning") or {}).get(engine)
+            batcher = AdaptiveBatcher(engine, tuned)
+            _batchers[engine] = batcher
+        return batcher
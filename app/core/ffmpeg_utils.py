@@ -1,10 +1,13 @@
 # 📄 Archivo: app/core/ffmpeg_utils.py
 
+from dataclasses import dataclass
 from pathlib import Path
-import subprocess, sys, json
-from typing import List, Optional
+import subprocess, sys, json, threading
+from typing import Dict, Iterator, List, Optional, Sequence
+from app.core.subtitles import SrtDiagnostics, SubtitleEntry, iter_srt
 from app.services.settings import get_settings
 from app.services.logging_config import get_logger
+from app.services.instrumentation import span
 
 # ------------------ Logger ------------------
 log = get_logger(__name__)
@@ -14,6 +17,65 @@ class SubTrack(dict):
     """Representa una pista de subtítulos con sus metadatos."""
     pass
 
+# ------------------ Cancelación de procesos en curso ------------------
+class CancelToken:
+    """
+    Agrupa los subprocesos ffmpeg lanzados por un trabajo para poder detenerlos.
+    cancel() mata los procesos vivos y hace que los siguientes se maten al registrarse.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._procs: set = set()
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def register(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            if self._cancelled:
+                proc.kill()
+                return
+            self._procs.add(proc)
+
+    def unregister(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+def _run_ffmpeg(cmd: List[str], cancel: Optional[CancelToken] = None) -> subprocess.CompletedProcess:
+    """Ejecuta ffmpeg capturando la salida; si se pasa cancel, el proceso puede matarse desde otro hilo."""
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+    )
+    if cancel is not None:
+        cancel.register(proc)
+    try:
+        with span("ffmpeg.extract") as sp:
+            out, err = proc.communicate()
+            sp.bytes = len(out or "")
+    finally:
+        if cancel is not None:
+            cancel.unregister(proc)
+    return subprocess.CompletedProcess(cmd, proc.returncode, out, err)
+
 # ------------------ Verificación de binarios ------------------
 def check_binaries() -> None:
     """
@@ -44,14 +106,16 @@ def ffprobe_subs(video: Path) -> List[SubTrack]:
     ]
     log.info(f"ffprobe: {' '.join(cmd)}")
 
-    res = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-    )
+    with span("ffmpeg.probe") as sp:
+        res = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        )
+        sp.bytes = len(res.stdout or "")
 
     if res.returncode != 0:
         raise RuntimeError(f"ffprobe falló: {res.stderr}")
@@ -71,6 +135,59 @@ def ffprobe_subs(video: Path) -> List[SubTrack]:
         }))
     return tracks
 
+# ------------------ Resultado de análisis reutilizable ------------------
+@dataclass
+class ProbeResult:
+    """
+    Pistas de un video junto con el tamaño y mtime que tenía al analizarlo.
+    Permite reutilizar el análisis mientras el archivo no cambie en disco.
+    """
+    path: Path
+    size: int
+    mtime_ns: int
+    tracks: List[SubTrack]
+
+    def is_fresh(self) -> bool:
+        """True si el archivo sigue teniendo el mismo tamaño y mtime."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+def probe_video(video: Path, use_cache: bool = True) -> ProbeResult:
+    """
+    Ejecuta ffprobe y devuelve un ProbeResult con la firma (tamaño, mtime) del archivo.
+    La firma se toma antes de analizar: si el archivo cambia durante el análisis,
+    el resultado se considerará caducado.
+    Con use_cache se consulta primero la caché persistente de análisis.
+    """
+    st = video.stat()
+    cache = None
+    if use_cache:
+        from app.core.probe_cache import get_probe_cache
+        cache = get_probe_cache()
+        cached = cache.get(video, st.st_size, st.st_mtime_ns)
+        if cached is not None:
+            return ProbeResult(
+                path=video, size=st.st_size, mtime_ns=st.st_mtime_ns,
+                tracks=[SubTrack(t) for t in cached]
+            )
+
+    tracks = ffprobe_subs(video)
+    if cache is not None:
+        cache.put(video, st.st_size, st.st_mtime_ns, tracks)
+    return ProbeResult(path=video, size=st.st_size, mtime_ns=st.st_mtime_ns, tracks=tracks)
+
+def resolve_tracks(video: Path, probe: Optional[ProbeResult] = None) -> List[SubTrack]:
+    """
+    Devuelve las pistas de un análisis previo si sigue vigente;
+    en caso contrario vuelve a analizar el archivo (pasando por la caché persistente).
+    """
+    if probe is not None and Path(probe.path) == Path(video) and probe.is_fresh():
+        return probe.tracks
+    return probe_video(video).tracks
+
 # ------------------ Codecs de subtítulos basados en imagen ------------------
 BITMAP_CODECS = {"hdmv_pgs_subtitle", "pgssub", "dvd_subtitle", "dvdsub", "xsub", "vobsub"}
 
@@ -89,15 +206,23 @@ def choose_track(tracks: List[SubTrack], auto_select: bool) -> Optional[SubTrack
     return None
 
 # ------------------ Extracción de pista de subtítulos ------------------
-def extract_subtitle_stream(video: Path, track_index: int, out_srt: Path) -> bool:
+def extract_subtitle_stream(
+    video: Path,
+    track_index: int,
+    out_srt: Path,
+    tracks: Optional[List[SubTrack]] = None,
+    cancel: Optional[CancelToken] = None
+) -> bool:
     """
     Extrae una pista de subtítulos específica a formato SRT usando ffmpeg.
+    - tracks: pistas ya analizadas del video; si se omite se ejecuta ffprobe.
+    - cancel: permite matar el proceso ffmpeg desde otro hilo.
     """
     S = get_settings()
     check_binaries()
 
     # Traducir índice global -> relativo en subtítulos
-    all_subs = ffprobe_subs(video)
+    all_subs = tracks if tracks is not None else ffprobe_subs(video)
     sub_only = [t for t in all_subs if t["codec_name"]]
     relative_index = next((i for i, t in enumerate(sub_only) if t["index"] == track_index), 0)
 
@@ -110,15 +235,128 @@ def extract_subtitle_stream(video: Path, track_index: int, out_srt: Path) -> boo
         str(out_srt)
     ]
     log.info(f"ffmpeg: {' '.join(cmd)}")
-    proc = subprocess.run(
+    proc = _run_ffmpeg(cmd, cancel)
+    if cancel is not None and cancel.cancelled:
+        return False
+    if proc.returncode != 0:
+        log.error(f"ffmpeg error: {proc.stderr.strip()}")
+        return False
+    return out_srt.exists() and out_srt.stat().st_size > 0
+
+
+# ------------------ Extracción de varias pistas en una sola pasada ------------------
+def extract_subtitle_streams(
+    video: Path,
+    track_indexes: Sequence[int],
+    out_paths: Sequence[Path],
+    tracks: Optional[List[SubTrack]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Dict[int, bool]:
+    """
+    Extrae varias pistas de subtítulos de un mismo video con una única invocación de ffmpeg.
+    Cada pista se asocia a su salida con un par -map/-c:s, de modo que el contenedor
+    se demultiplexa una sola vez sin importar cuántas pistas se pidan.
+    - tracks: pistas ya analizadas del video; si se omite se ejecuta ffprobe.
+    - cancel: permite matar el proceso ffmpeg desde otro hilo.
+    Devuelve {track_index: ok} indicando qué salidas se generaron correctamente.
+    """
+    if len(track_indexes) != len(out_paths):
+        raise ValueError("track_indexes y out_paths deben tener la misma longitud")
+    if not track_indexes:
+        return {}
+
+    S = get_settings()
+    check_binaries()
+
+    # Traducir índices globales -> relativos en subtítulos (un solo ffprobe por video)
+    all_subs = tracks if tracks is not None else ffprobe_subs(video)
+    sub_only = [t for t in all_subs if t["codec_name"]]
+    relative = {t["index"]: i for i, t in enumerate(sub_only)}
+
+    cmd = [str(S.ffmpeg_exe), "-y", "-i", str(video)]
+    for track_index, out_srt in zip(track_indexes, out_paths):
+        out_srt.parent.mkdir(parents=True, exist_ok=True)
+        cmd += [
+            "-map", f"0:s:{relative.get(track_index, 0)}",
+            "-c:s", "srt",
+            str(out_srt)
+        ]
+    log.info(f"ffmpeg: {' '.join(cmd)}")
+    proc = _run_ffmpeg(cmd, cancel)
+    if cancel is not None and cancel.cancelled:
+        return {track_index: False for track_index in track_indexes}
+    if proc.returncode != 0:
+        log.error(f"ffmpeg error: {proc.stderr.strip()}")
+        if len(track_indexes) > 1:
+            # Una pista problemática hace fallar toda la pasada: reintentar pista a pista
+            log.warning("ffmpeg falló en la pasada conjunta; reintentando cada pista por separado")
+            return {
+                track_index: extract_subtitle_stream(
+                    video, track_index=track_index, out_srt=out_srt, tracks=all_subs, cancel=cancel
+                )
+                for track_index, out_srt in zip(track_indexes, out_paths)
+            }
+        return {track_indexes[0]: False}
+
+    return {
+        track_index: out_srt.exists() and out_srt.stat().st_size > 0
+        for track_index, out_srt in zip(track_indexes, out_paths)
+    }
+
+
+# ------------------ Extracción en streaming a SubtitleEntry ------------------
+def iter_subtitle_entries(
+    video: Path,
+    track_index: int,
+    tracks: Optional[List[SubTrack]] = None,
+    cancel: Optional[CancelToken] = None,
+    diagnostics: Optional[SrtDiagnostics] = None
+) -> Iterator[SubtitleEntry]:
+    """
+    Extrae una pista con ffmpeg escribiendo SRT por stdout (-f srt pipe:1) y
+    devuelve las entradas a medida que se leen, sin archivo intermedio.
+    - diagnostics: recibe los bloques mal formados de la salida de ffmpeg.
+    Lanza RuntimeError si ffmpeg termina con error.
+    """
+    S = get_settings()
+    check_binaries()
+
+    all_subs = tracks if tracks is not None else ffprobe_subs(video)
+    sub_only = [t for t in all_subs if t["codec_name"]]
+    relative_index = next((i for i, t in enumerate(sub_only) if t["index"] == track_index), 0)
+
+    cmd = [
+        str(S.ffmpeg_exe), "-nostdin", "-v", "error",
+        "-i", str(video),
+        "-map", f"0:s:{relative_index}",
+        "-c:s", "srt",
+        "-f", "srt", "pipe:1"
+    ]
+    log.info(f"ffmpeg: {' '.join(cmd)}")
+    proc = subprocess.Popen(
         cmd,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
         encoding="utf-8",
         errors="replace",
         creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
     )
-    if proc.returncode != 0:
-        log.error(f"ffmpeg error: {proc.stderr.strip()}")
-        return False
-    return out_srt.exists() and out_srt.stat().st_size > 0
+    if cancel is not None:
+        cancel.register(proc)
+    try:
+        # Incluye el tiempo que el consumidor tarda en pedir cada entrada
+        with span("ffmpeg.stream"):
+            yield from iter_srt(proc.stdout, diagnostics)
+        stderr = proc.stderr.read()
+        proc.wait()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        if cancel is not None:
+            cancel.unregister(proc)
+
+    if proc.returncode != 0 and not (cancel is not None and cancel.cancelled):
+        log.error(f"ffmpeg error: {stderr.strip()}")
+        raise RuntimeError(f"ffmpeg falló: {stderr.strip()}")
@@ -0,0 +1,85 @@
+# 📄 Archivo: app/core/lru_cache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+def content_key(*parts: str) -> bytes:
+    """
+    Clave estable (igual entre ejecuciones, a diferencia de hash()) para un contenido.
+    Las partes se separan con NUL para que ("ab", "c") y ("a", "bc") no coincidan.
+    """
+    return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).digest()
+
+# ------------------ Caché LRU acotada por bytes ------------------
+class ByteLRUCache:
+    """
+    Caché LRU de cadenas con capacidad en bytes y operaciones O(1).
+    El tamaño de cada entrada es su valor en UTF-8 más la clave y un coste fijo
+    aproximado por entrada, de modo que muchas líneas cortas también cuentan.
+    Es segura entre hilos.
+    """
+    ENTRY_OVERHEAD = 120  # bytes aproximados de nodo, clave y str por entrada
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(1, int(max_bytes))
+        self._data: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _cost(self, key: bytes, value: str) -> int:
+        return len(key) + len(value.encode('utf-8')) + self.ENTRY_OVERHEAD
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: str) -> None:
+        cost = self._cost(key, value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= self._cost(key, old)
+            self._data[key] = value
+            self.bytes += cost
+            while self.bytes > self.max_bytes:
+                old_key, old_value = self._data.popitem(last=False)
+                self.bytes -= self._cost(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._data
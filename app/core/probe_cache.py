@@ -0,0 +1,158 @@
+# 📄 Archivo: app/core/probe_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Configuración ------------------
+CACHE_DIR_NAME = "cache"
+CACHE_FILE_NAME = "probe_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 20000
+
+# ------------------ Caché persistente de análisis ffprobe ------------------
+class ProbeCache:
+    """
+    Caché en disco (SQLite) de las pistas devueltas por ffprobe.
+    La clave es (ruta absoluta, tamaño, mtime_ns): si el archivo cambia,
+    la entrada deja de coincidir y se vuelve a analizar.
+    Al superar max_entries se eliminan las entradas usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+
+    # ------------------ Conexión ------------------
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " tracks TEXT NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS probes_last_used ON probes(last_used)")
+            self._count = conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+            self._conn = conn
+        except sqlite3.Error as e:
+            log.warning(f"Caché de análisis no disponible ({self.db_path}): {e}")
+            self._conn = None
+        return self._conn
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    # ------------------ Lectura / escritura ------------------
+    def get(self, path: Path, size: int, mtime_ns: int) -> Optional[List[dict]]:
+        """Devuelve las pistas guardadas si la firma coincide, o None."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            key = self._key(path)
+            try:
+                row = conn.execute(
+                    "SELECT tracks FROM probes WHERE path=? AND size=? AND mtime_ns=?",
+                    (key, size, mtime_ns)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE probes SET last_used=? WHERE path=?", (time.time(), key))
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                log.warning(f"Error leyendo caché de análisis: {e}")
+                return None
+
+    def put(self, path: Path, size: int, mtime_ns: int, tracks: List[dict]) -> None:
+        """Guarda (o reemplaza) las pistas de un archivo y aplica el límite de tamaño."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            key = self._key(path)
+            try:
+                existed = conn.execute("SELECT 1 FROM probes WHERE path=?", (key,)).fetchone() is not None
+                conn.execute(
+                    "INSERT OR REPLACE INTO probes(path, size, mtime_ns, tracks, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, size, mtime_ns, json.dumps([dict(t) for t in tracks], ensure_ascii=False), time.time())
+                )
+                if not existed:
+                    self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+            except sqlite3.Error as e:
+                log.warning(f"Error escribiendo caché de análisis: {e}")
+
+    def _evict(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar en el 90% del límite."""
+        target = int(self.max_entries * 0.9)
+        excess = self._count - target
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM probes WHERE path IN (SELECT path FROM probes ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+        log.info(f"Caché de análisis: {excess} entradas antiguas eliminadas")
+
+    # ------------------ Mantenimiento ------------------
+    def clear(self) -> None:
+        """Vacía la caché (acción "reconstruir caché")."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM probes")
+                conn.execute("VACUUM")
+                self._count = 0
+                log.info("Caché de análisis vaciada")
+            except sqlite3.Error as e:
+                log.warning(f"Error vaciando caché de análisis: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count if self._connect() is not None else 0
+
+
+# ------------------ Instancia compartida ------------------
+_probe_cache: Optional[ProbeCache] = None
+_probe_cache_lock = threading.Lock()
+
+def get_probe_cache() -> ProbeCache:
+    """
+    Devuelve la caché de análisis compartida por toda la aplicación.
+    Se guarda en <instalación>/cache y su tamaño se configura con
+    "probe_cache_max_entries" en config.json.
+    """
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            S = get_settings()
+            _probe_cache = ProbeCache(
+                S.install_dir / CACHE_DIR_NAME / CACHE_FILE_NAME,
+                max_entries=S.config.get("probe_cache_max_entries", DEFAULT_MAX_ENTRIES)
+            )
+        return _probe_cache
@@ -0,0 +1,137 @@
+# 📄 Archivo: app/core/rate_limit.py
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Límites por defecto (peticiones/segundo y ráfaga) ------------------
+# Se pueden ajustar por motor con "rate_limits" en config.json: {"motor": {"rate": r, "burst": b}}
+DEFAULT_RATE_LIMITS = {
+    "google_free": {"rate": 2.0, "burst": 4},
+    "google_v1": {"rate": 5.0, "burst": 10},
+    "mymemory": {"rate": 8.0, "burst": 16},
+}
+FALLBACK_RATE_LIMIT = {"rate": 3.0, "burst": 6}
+
+# Códigos HTTP que indican que el servidor nos está limitando
+THROTTLE_STATUS = (429, 503)
+
+MAX_BACKOFF = 60.0      # segundos máximos de pausa global tras un 429/503
+MIN_RATE_FACTOR = 0.1   # la tasa nunca baja del 10% de la configurada
+_SLEEP_STEP = 0.1       # las esperas se trocean para poder cancelar
+
+# ------------------ Token bucket adaptativo ------------------
+class TokenBucket:
+    """
+    Limitador token bucket compartido por todos los hilos (y el bucle asyncio).
+    - rate: peticiones por segundo sostenidas; burst: ráfaga permitida.
+    - Ante un 429/503 (penalize) reduce la tasa a la mitad y pausa a todos los
+      que usen este motor; cada petición correcta (reward) la recupera poco a poco.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.base_rate = max(0.01, float(rate))
+        self.rate = self.base_rate
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = 1.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Consume tokens (puede quedar en negativo = reserva) y devuelve cuánto esperar."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, tokens: int = 1, cancel_flag=None) -> bool:
+        """Espera turno para `tokens` peticiones. Devuelve False si se canceló esperando."""
+        wait = self._reserve(tokens)
+        if wait <= 0:
+            return True
+        deadline = time.monotonic() + wait
+        with span(f"wait.ratelimit.{self.name}"):
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                if cancel_flag is not None and cancel_flag.is_set():
+                    return False
+                time.sleep(min(_SLEEP_STEP, remaining))
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Versión para corrutinas de acquire()."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            with span(f"wait.ratelimit.{self.name}"):
+                await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """El servidor respondió 429/503: bajar la tasa y pausar a todos los workers."""
+        with self._lock:
+            now = time.monotonic()
+            pause = retry_after if retry_after and retry_after > 0 else self._backoff
+            pause = min(MAX_BACKOFF, pause)
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            self._backoff = min(MAX_BACKOFF, self._backoff * 2)
+            rate = self.rate
+        log.warning(f"{self.name}: limitado por el servidor; pausa de {pause:.1f}s, tasa {rate:.2f}/s")
+
+    def reward(self) -> None:
+        """Petición correcta: recuperar la tasa gradualmente (5% de la base por acierto)."""
+        if self.rate >= self.base_rate and self._backoff == 1.0:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+            self._backoff = 1.0
+
+    def observe(self, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """Registra el código HTTP de una respuesta. Devuelve True si fue una limitación."""
+        if status_code in THROTTLE_STATUS:
+            try:
+                seconds = float(retry_after) if retry_after else None
+            except ValueError:
+                seconds = None
+            self.penalize(seconds)
+            return True
+        if status_code < 400:
+            self.reward()
+        return False
+
+
+# ------------------ Registro por motor ------------------
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def get_rate_limiter(engine: str) -> TokenBucket:
+    """Devuelve el limitador del motor, común a todo el proceso."""
+    with _buckets_lock:
+        bucket = _buckets.get(engine)
+        if bucket is None:
+            overrides = get_settings().config.get("rate_limits") or {}
+            cfg = dict(DEFAULT_RATE_LIMITS.get(engine, FALLBACK_RATE_LIMIT))
+            cfg.update(overrides.get(engine) or {})
+            bucket = TokenBucket(engine, cfg["rate"], cfg["burst"])
+            _buckets[engine] = bucket
+        return bucket
+
+
+def reset_rate_limiters() -> None:
+    """Descarta los limitadores (y sus penalizaciones); se recrean con la configuración actual."""
+    with _buckets_lock:
+        _buckets.clear()
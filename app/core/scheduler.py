@@ -0,0 +1,96 @@
+# 📄 Archivo: app/core/scheduler.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Límites por defecto ------------------
+DEFAULT_IO_PER_DEVICE = 2
+
+# ------------------ Identificación del disco / recurso compartido ------------------
+def device_key(path: Path) -> Hashable:
+    """
+    Devuelve una clave que identifica el disco físico o recurso de red de un archivo.
+    - Windows: la raíz de la ruta ("c:\\" o "\\\\servidor\\recurso\\").
+    - Resto: el st_dev del archivo.
+    """
+    if os.name == "nt":
+        return Path(os.path.abspath(str(path))).anchor.lower()
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return Path(os.path.abspath(str(path))).anchor
+
+# ------------------ Planificador de extracciones ------------------
+class ExtractionScheduler:
+    """
+    Ejecuta trabajos de extracción en paralelo con dos límites:
+    - max_workers: trabajos simultáneos en total (CPU).
+    - io_per_device: trabajos simultáneos sobre un mismo disco o recurso de red,
+      para no saturar un NAS con lecturas concurrentes del mismo volumen.
+    Los resultados se entregan en el hilo que llama a run(), en orden de finalización.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, io_per_device: Optional[int] = None):
+        S = get_settings()
+        if max_workers is None:
+            max_workers = S.config.get("extract_workers") or os.cpu_count() or 1
+        if io_per_device is None:
+            io_per_device = S.config.get("extract_io_per_disk") or DEFAULT_IO_PER_DEVICE
+        self.max_workers = max(1, int(max_workers))
+        self.io_per_device = max(1, int(io_per_device))
+
+    def run(
+        self,
+        jobs: Sequence[Tuple[Path, Any]],
+        work: Callable[[Path, Any], Any],
+        on_done: Callable[[Path, Any, Any, Optional[BaseException]], None],
+        should_stop: Callable[[], bool] = lambda: False
+    ) -> None:
+        """
+        Ejecuta work(video, payload) para cada trabajo (video, payload).
+        on_done(video, payload, resultado, error) se llama al terminar cada uno.
+        Cuando should_stop() devuelve True no se lanzan más trabajos; los que están
+        en curso se esperan pero su resultado ya no se notifica.
+        """
+        queue: List[Tuple[Path, Any, Hashable]] = [(v, p, device_key(v)) for v, p in jobs]
+        in_use: Dict[Hashable, int] = {}
+        running: Dict[Any, Tuple[Path, Any, Hashable]] = {}
+        log.info(
+            f"Planificador: {len(queue)} trabajos, {self.max_workers} simultáneos, "
+            f"{self.io_per_device} por disco"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract") as pool:
+            while queue or running:
+                # Lanzar todos los trabajos que quepan en los límites actuales
+                if not should_stop():
+                    i = 0
+                    while i < len(queue) and len(running) < self.max_workers:
+                        video, payload, dev = queue[i]
+                        if in_use.get(dev, 0) >= self.io_per_device:
+                            i += 1
+                            continue
+                        queue.pop(i)
+                        in_use[dev] = in_use.get(dev, 0) + 1
+                        running[pool.submit(work, video, payload)] = (video, payload, dev)
+                else:
+                    queue.clear()
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    video, payload, dev = running.pop(fut)
+                    in_use[dev] -= 1
+                    if should_stop():
+                        continue
+                    err = fut.exception()
+                    on_done(video, payload, None if err else fut.result(), err)
@@ -1,187 +1,403 @@
 # app\core\subtitles.py
 import re
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator
+from app.services.logging_config import get_logger, is_verbose
+from app.services.instrumentation import span
 
+# ------------------ Logger ------------------
+log = get_logger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class SubtitleEntry:
+    """
+    Una entrada SRT. Los tiempos se guardan en milisegundos enteros
+    (exactos, sin errores de redondeo); start/end siguen disponibles en segundos.
+    """
     id: int
-    start: float
-    end: float
+    start_ms: int
+    end_ms: int
     original: str
     translated: str = ""
 
+    @property
+    def start(self) -> float:
+        return self.start_ms / 1000
 
-def _parse_time(time_str: str) -> float:
-    """Convierte formato SRT time a segundos (ej: 00:00:03,430 -> 3.43)"""
-    try:
-        time_str = time_str.strip().replace(',', '.')
-        h, m, s = time_str.split(':')
-        return int(h) * 3600 + int(m) * 60 + float(s)
-    except Exception as e:
-        print(f"[ERROR] Error parsing time '{time_str}': {e}")
-        return 0.0
+    @start.setter
+    def start(self, seconds: float):
+        self.start_ms = round(seconds * 1000)
 
+    @property
+    def end(self) -> float:
+        return self.end_ms / 1000
 
-def _format_time(seconds: float) -> str:
-    """Convierte segundos a formato SRT time"""
-    try:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
-    except Exception:
-        return "00:00:00,000"
+    @end.setter
+    def end(self, seconds: float):
+        self.end_ms = round(seconds * 1000)
 
 
-def load_srt(path: str) -> list[SubtitleEntry]:
+class SubtitleTrack:
     """
-    Parser robusto que maneja CUALQUIER formato SRT correctamente.
-    Especialmente diseñado para manejar entradas multi-línea.
+    Pista de subtítulos en columnas: inicios y fines en array('q') de milisegundos
+    y textos en listas. Ocupa mucha menos memoria que una lista de SubtitleEntry
+    y permite operar sobre todos los tiempos a la vez (desplazar, escalar, solapes).
+    Los textos son opcionales: sin ellos es una pista solo de tiempos (ajuste de
+    tiempos de archivos enteros en timefix).
     """
-    entries = []
-    try:
-        path_obj = Path(path)
-        if not path_obj.exists():
-            print(f"[ERROR] Archivo no encontrado: {path}")
-            return []
+    __slots__ = ("ids", "starts", "ends", "texts", "translations")
+
+    def __init__(self, ids=(), starts=(), ends=(), texts=None, translations=None):
+        self.starts = array('q', starts)
+        self.ends = array('q', ends)
+        self.ids = array('q', ids) if ids else array('q', range(1, len(self.starts) + 1))
+        self.texts: list[str] = list(texts) if texts is not None else [""] * len(self.starts)
+        self.translations: list[str] = list(translations) if translations is not None else [""] * len(self.texts)
+        if not (len(self.ids) == len(self.starts) == len(self.ends) == len(self.texts) == len(self.translations)):
+            raise ValueError("Las columnas de SubtitleTrack deben tener la misma longitud")
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[SubtitleEntry]) -> "SubtitleTrack":
+        entries = list(entries)
+        return cls(
+            (e.id for e in entries),
+            (e.start_ms for e in entries),
+            (e.end_ms for e in entries),
+            [e.original for e in entries],
+            [e.translated for e in entries],
+        )
 
-        # Leer archivo con múltiples encodings
-        content = None
-        for encoding in ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']:
-            try:
-                with open(path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                print(f"[SUBTITLES] Archivo leído con encoding: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
+    def to_entries(self) -> list[SubtitleEntry]:
+        return list(map(SubtitleEntry, self.ids, self.starts, self.ends, self.texts, self.translations))
 
-        if content is None:
-            print(f"[ERROR] No se pudo leer el archivo con ningún encoding")
-            return []
+    def __len__(self) -> int:
+        return len(self.texts)
 
-        # Normalizar contenido
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
-        content = re.sub(r'\n{3,}', '\n\n', content)  # Normalizar separadores múltiples
+    def __getitem__(self, i: int) -> SubtitleEntry:
+        return SubtitleEntry(self.ids[i], self.starts[i], self.ends[i], self.texts[i], self.translations[i])
 
-        # MÉTODO 1: Parser por bloques (más robusto)
-        entries = _parse_by_blocks(content)
+    def text_lengths(self) -> list[int]:
+        """Longitud del texto de cada entrada (la traducción si la hay)."""
+        return [len(t or o) for o, t in zip(self.texts, self.translations)]
 
-        if not entries:
-            # MÉTODO 2: Parser por regex como fallback
-            print("[SUBTITLES] Intentando parser alternativo...")
-            entries = _parse_by_regex(content)
+    # ------------------ Operaciones sobre todos los tiempos ------------------
+    def remap(self, factor: float, offset_ms: float) -> None:
+        """
+        Aplica t' = factor · t + offset_ms a todos los inicios y fines en una pasada
+        por columna; redondea al ms y no baja de 0. Base de shift/scale y de
+        timefix.TimeTransform (cambio de fps, resincronización por dos puntos).
+        """
+        self.starts = _remap(self.starts, factor, offset_ms)
+        self.ends = _remap(self.ends, factor, offset_ms)
 
-        print(f"[SUBTITLES] Cargadas {len(entries)} entradas exitosamente")
-        return entries
+    def shift(self, offset_ms: int) -> None:
+        """Desplaza todas las entradas offset_ms (negativo = adelantar); no baja de 0."""
+        self.remap(1.0, offset_ms)
 
-    except Exception as e:
-        print(f"[ERROR] Error crítico cargando SRT: {e}")
-        return []
+    def scale(self, factor: float, origin_ms: int = 0) -> None:
+        """Escala los tiempos respecto a origin_ms (p. ej. 25/23.976 para cambiar de fps)."""
+        self.remap(factor, origin_ms * (1 - factor))
 
+    def overlaps(self) -> list[int]:
+        """Índices i cuya entrada se solapa con la siguiente (fin[i] > inicio[i + 1])."""
+        starts = self.starts
+        return [i for i, end in enumerate(self.ends[:-1]) if end > starts[i + 1]]
 
-def _parse_by_blocks(content: str) -> list[SubtitleEntry]:
-    """Parser principal por bloques de texto"""
-    entries = []
 
-    # Dividir por bloques separados por líneas vacías
-    blocks = [block.strip() for block in content.split('\n\n') if block.strip()]
+def _remap(values: array, factor: float, offset_ms: float) -> array:
+    """Columna de ms transformada (ver SubtitleTrack.remap)."""
+    if factor == 1.0:
+        # Desplazamiento puro: aritmética entera
+        offset = round(offset_ms)
+        if offset >= 0:
+            return array('q', [t + offset for t in values])
+        return array('q', [t + offset if t > -offset else 0 for t in values])
+    return array('q', [v if v > 0 else 0 for v in [round(t * factor + offset_ms) for t in values]])
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split('\n') if line.strip()]
 
-        if len(lines) < 3:  # Necesitamos al menos: número, tiempo, texto
-            continue
+@dataclass
+class SrtIssue:
+    line: int      # línea (1-based) donde empieza el bloque problemático
+    reason: str    # motivo legible
+    snippet: str   # fragmento del bloque para localizarlo
+
+
+@dataclass
+class SrtDiagnostics:
+    """Incidencias encontradas al analizar un SRT, en lugar de descartarlas en silencio."""
+    encoding: str = ""
+    issues: list[SrtIssue] = field(default_factory=list)
+
+    def add(self, line: int, reason: str, snippet: str = ""):
+        self.issues.append(SrtIssue(line, reason, snippet[:80]))
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def report(self, source) -> None:
+        """Deja en el log cuántos bloques se descartaron o corrigieron, con el primero de ejemplo."""
+        if self.issues:
+            first = self.issues[0]
+            log.warning(
+                f"{source}: {len(self.issues)} incidencias en el SRT "
+                f"(línea {first.line}: {first.reason}{f' «{first.snippet}»' if first.snippet else ''})"
+            )
+
 
+# Tablas para convertir "00".."99" y "000".."999" sin llamar a int() en el camino rápido
+_D2 = {f"{i:02d}": i for i in range(100)}
+_D3 = {f"{i:03d}": i for i in range(1000)}
+
+# Formato tolerante: horas de 1+ dígitos, separador , o ., milisegundos de 1 a 3 dígitos
+_TIMING_RE = re.compile(
+    r'\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})'
+)
+_ENCODINGS = ('utf-8-sig', 'cp1252', 'latin-1')
+
+
+def _parse_timing(line: str) -> tuple[int, int] | None:
+    """
+    Convierte una línea 'HH:MM:SS,mmm --> HH:MM:SS,mmm' a (inicio_ms, fin_ms).
+    Camino rápido por posiciones fijas para el formato estándar; regex para el resto.
+    Devuelve None si la línea no es una línea de tiempos válida.
+    """
+    if line[12:17] == ' --> ' and len(line) >= 29:
         try:
-            # Línea 1: Número
-            index = int(lines[0])
+            return (
+                ((_D2[line[0:2]] * 60 + _D2[line[3:5]]) * 60 + _D2[line[6:8]]) * 1000 + _D3[line[9:12]],
+                ((_D2[line[17:19]] * 60 + _D2[line[20:22]]) * 60 + _D2[line[23:25]]) * 1000 + _D3[line[26:29]],
+            )
+        except KeyError:
+            pass
+    m = _TIMING_RE.match(line)
+    if m is None:
+        return None
+    h1, m1, s1, f1, h2, m2, s2, f2 = m.groups()
+    return (
+        ((int(h1) * 60 + int(m1)) * 60 + int(s1)) * 1000 + int(f1.ljust(3, '0')),
+        ((int(h2) * 60 + int(m2)) * 60 + int(s2)) * 1000 + int(f2.ljust(3, '0')),
+    )
+
+
+def _format_time(ms: int) -> str:
+    """Convierte milisegundos a formato SRT time (aritmética entera, sin errores de redondeo)"""
+    if ms <= 0:
+        return "00:00:00,000"
+    secs, ms = divmod(int(ms), 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
 
-            # Línea 2: Timestamps
-            timestamp_line = lines[1]
-            if '-->' not in timestamp_line:
-                continue
 
-            start_str, end_str = timestamp_line.split('-->')
-            start_time = _parse_time(start_str.strip())
-            end_time = _parse_time(end_str.strip())
-
-            # Línea 3+: Todo el texto (preservando líneas múltiples)
-            text_lines = lines[2:]
-
-            # CRÍTICO: Preservar saltos de línea originales
-            text = '\n'.join(text_lines)
-
-            if text:
-                entry = SubtitleEntry(
-                    id=index,
-                    start=start_time,
-                    end=end_time,
-                    original=text
-                )
-                entries.append(entry)
-
-                # Debug para primeras 3 entradas
-                if len(entries) <= 3:
-                    print(f"[SUBTITLES] Bloque {index}: {start_time:.3f}-{end_time:.3f}")
-                    print(f"[SUBTITLES] Líneas de texto: {len(text_lines)}")
-                    print(f"[SUBTITLES] Contenido: '{text[:80]}...'")
-
-        except Exception as e:
-            print(f"[ERROR] Error procesando bloque: {e}")
+def _decode(data: bytes, diagnostics: SrtDiagnostics | None = None) -> str:
+    """Decodifica probando UTF-8 (con o sin BOM), cp1252 y latin-1, en ese orden."""
+    for encoding in _ENCODINGS:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
             continue
+        if diagnostics is not None:
+            diagnostics.encoding = encoding
+        return text
+    return data.decode('latin-1', errors='replace')
 
-    return entries
 
+def load_srt(path: str, diagnostics: SrtDiagnostics | None = None) -> list[SubtitleEntry]:
+    """
+    Parser robusto que maneja CUALQUIER formato SRT correctamente.
+    Especialmente diseñado para manejar entradas multi-línea.
+    Los bloques mal formados siempre se recogen y se avisa en el log de cuántos hay.
+    - diagnostics: si se indica, recibe el encoding usado y las incidencias.
+    """
+    if diagnostics is None:
+        diagnostics = SrtDiagnostics()
+    try:
+        path_obj = Path(path)
+        if not path_obj.exists():
+            log.error(f"Archivo no encontrado: {path}")
+            return []
+
+        with span("io.load_srt") as sp:
+            data = path_obj.read_bytes()
+            sp.bytes = len(data)
+            entries = parse_srt_text(_decode(data, diagnostics), diagnostics)
+        log.debug(f"Cargadas {len(entries)} entradas de {path}")
+        diagnostics.report(path)
+        return entries
+
+    except Exception as e:
+        log.error(f"Error crítico cargando SRT {path}: {e}")
+        return []
 
-def _parse_by_regex(content: str) -> list[SubtitleEntry]:
-    """Parser alternativo usando regex para casos complejos"""
-    entries = []
 
-    # Regex más permisivo que captura bloques completos
-    pattern = r'(\d+)\s*\n(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*\n((?:.*\n?)*?)(?=\n\d+\s*\n\d{2}:\d{2}:\d{2}|\Z)'
+def parse_srt_text(content: str, diagnostics: SrtDiagnostics | None = None) -> list[SubtitleEntry]:
+    """
+    Analiza un documento SRT completo en una sola pasada.
+    Los bloques estándar (número, tiempos, texto) van por el camino rápido;
+    cualquier bloque irregular se re-analiza línea a línea con iter_srt.
+    """
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
 
-    matches = re.findall(pattern, content, re.MULTILINE | re.DOTALL)
+    entries: list[SubtitleEntry] = []
+    append = entries.append
+    blocks = content.split('\n\n')
+    # Nº de línea calculado solo cuando hace falta (bloques irregulares)
+    counted_blocks = 0
+    counted_lines = 1
+
+    for i, block in enumerate(blocks):
+        parts = block.split('\n', 2)
+        if len(parts) == 3 and parts[0].isdigit() and '-->' not in parts[2]:
+            timing = _parse_timing(parts[1])
+            text = parts[2]
+            if timing is not None and text and not text.isspace():
+                if timing[1] < timing[0] and diagnostics is not None:
+                    counted_lines += sum(b.count('\n') + 2 for b in blocks[counted_blocks:i])
+                    counted_blocks = i
+                    diagnostics.add(counted_lines + 1, "fin anterior al inicio", parts[1])
+                # Limpiar espacios de cada línea solo si hace falta
+                if text[0] in ' \t' or text[-1] in ' \t\n' or ' \n' in text or '\n ' in text or '\t' in text:
+                    text = '\n'.join(l.strip() for l in text.split('\n') if l.strip())
+                # Argumentos posicionales: notablemente más rápido en archivos grandes
+                append(SubtitleEntry(int(parts[0]), timing[0], timing[1], text))
+                continue
 
-    for match in matches:
-        try:
-            index = int(match[0])
-            start_time = _parse_time(match[1])
-            end_time = _parse_time(match[2])
-            text = match[3].strip()
-
-            if text:
-                entry = SubtitleEntry(
-                    id=index,
-                    start=start_time,
-                    end=end_time,
-                    original=text
-                )
-                entries.append(entry)
-
-        except Exception as e:
-            print(f"[ERROR] Error en regex match: {e}")
+        if not block.strip():
             continue
 
+        # Bloque irregular: líneas en blanco extra, sin número, varios bloques pegados...
+        counted_lines += sum(b.count('\n') + 2 for b in blocks[counted_blocks:i])
+        counted_blocks = i
+        entries.extend(iter_srt(block.split('\n'), diagnostics, first_line=counted_lines, first_id=len(entries) + 1))
+
     return entries
 
 
+def iter_srt(
+    lines: Iterable[str],
+    diagnostics: SrtDiagnostics | None = None,
+    first_line: int = 1,
+    first_id: int = 1
+) -> Iterator[SubtitleEntry]:
+    """
+    Parser incremental: consume líneas SRT (de un archivo o de la salida de ffmpeg)
+    y va devolviendo cada SubtitleEntry en cuanto se cierra su bloque.
+    No necesita tener el documento completo en memoria.
+    - diagnostics: recibe los bloques mal formados en lugar de descartarlos en silencio.
+    - first_line / first_id: nº de línea y posición de la primera entrada cuando se
+      analiza un trozo de un documento mayor (las entradas sin número toman su posición).
+    """
+    index = None
+    timing = None
+    block_line = first_line
+    text_lines: list[str] = []
+    count = first_id - 1
+    skipping = False  # tras una línea de tiempos inválida se descarta hasta la línea en blanco
+
+    for line_no, raw in enumerate(lines, first_line):
+        line = raw.strip()
+
+        if skipping:
+            skipping = bool(line)
+            continue
+
+        if timing is None:
+            # Buscando cabecera: número opcional + línea de tiempos
+            if not line:
+                continue
+            if '-->' in line:
+                timing = _parse_timing(line)
+                if timing is None:
+                    if diagnostics is not None:
+                        diagnostics.add(line_no, "línea de tiempos inválida", line)
+                    index = None
+                    skipping = True
+                    continue
+                elif timing[1] < timing[0] and diagnostics is not None:
+                    diagnostics.add(line_no, "fin anterior al inicio", line)
+                if index is None:
+                    block_line = line_no
+            elif line.isdigit() and index is None:
+                index = int(line)
+                block_line = line_no
+            elif diagnostics is not None:
+                diagnostics.add(line_no, "línea fuera de bloque", line)
+            continue
+
+        if line:
+            # Una línea de tiempos dentro del texto indica dos bloques sin separación
+            if '-->' in line and _parse_timing(line) is not None:
+                # El número del bloque siguiente quedó como última línea de texto
+                next_index = int(text_lines.pop()) if text_lines and text_lines[-1].isdigit() else None
+                if text_lines:
+                    count += 1
+                    yield SubtitleEntry(
+                        id=index if index is not None else count,
+                        start_ms=timing[0],
+                        end_ms=timing[1],
+                        original='\n'.join(text_lines)
+                    )
+                elif diagnostics is not None:
+                    diagnostics.add(block_line, "bloque sin texto", raw)
+                if diagnostics is not None:
+                    diagnostics.add(line_no, "bloque sin línea en blanco previa", line)
+                index = next_index
+                block_line = line_no
+                timing = _parse_timing(line)
+                text_lines = []
+                continue
+            text_lines.append(line)
+            continue
+
+        # Línea vacía: fin de bloque
+        if text_lines:
+            count += 1
+            yield SubtitleEntry(
+                id=index if index is not None else count,
+                start_ms=timing[0],
+                end_ms=timing[1],
+                original='\n'.join(text_lines)
+            )
+        elif diagnostics is not None:
+            diagnostics.add(block_line, "bloque sin texto")
+        index = None
+        timing = None
+        text_lines = []
+
+    # Último bloque sin línea vacía final
+    if timing is not None:
+        if text_lines:
+            count += 1
+            yield SubtitleEntry(
+                id=index if index is not None else count,
+                start_ms=timing[0],
+                end_ms=timing[1],
+                original='\n'.join(text_lines)
+            )
+        elif diagnostics is not None:
+            diagnostics.add(block_line, "bloque sin texto")
+    elif index is not None and diagnostics is not None:
+        diagnostics.add(block_line, "número de bloque sin tiempos", str(index))
+
+
 def save_srt(entries: list[SubtitleEntry], path: str):
     """
     Guarda entradas SRT preservando exactamente la estructura original.
     """
     try:
         if not entries:
-            print("[ERROR] No hay entradas para guardar")
+            log.error(f"No hay entradas para guardar en {path}")
             return
 
         path_obj = Path(path)
         path_obj.parent.mkdir(parents=True, exist_ok=True)
+        verbose = is_verbose()
 
-        with open(path, 'w', encoding='utf-8') as f:
+        with span("io.save_srt") as sp, open(path, 'w', encoding='utf-8') as f:
             for i, entry in enumerate(entries, 1):
                 # Usar traducción si existe, sino original
                 text_to_save = entry.translated if entry.translated.strip() else entry.original
@@ -191,25 +407,23 @@ def save_srt(entries: list[SubtitleEntry], path: str):
                 text_to_save = text_to_save.strip()
 
                 # Formatear tiempos
-                start_time = _format_time(entry.start)
-                end_time = _format_time(entry.end)
+                start_time = _format_time(entry.start_ms)
+                end_time = _format_time(entry.end_ms)
 
                 # Escribir entrada completa
                 f.write(f"{i}\n")
                 f.write(f"{start_time} --> {end_time}\n")
                 f.write(f"{text_to_save}\n\n")
 
-                # Debug para primeras 3 entradas
-                if i <= 3:
-                    num_lines = text_to_save.count('\n') + 1
-                    print(f"[SUBTITLES] Guardando {i}: {start_time}-{end_time}")
-                    print(f"[SUBTITLES] Líneas de texto: {num_lines}")
-                    print(f"[SUBTITLES] Preview: '{text_to_save[:60]}...'")
+                if verbose:
+                    log.debug(f"Guardando {i}: {start_time}-{end_time} '{text_to_save[:60]}'")
 
-        print(f"[SUBTITLES] Guardado exitoso: {path} ({len(entries)} entradas)")
+            sp.bytes = f.tell()
+
+        log.info(f"Guardado: {path} ({len(entries)} entradas)")
 
     except Exception as e:
-        print(f"[ERROR] Error guardando SRT: {e}")
+        log.error(f"Error guardando SRT {path}: {e}")
         raise
 
 
@@ -223,88 +437,82 @@ def load_srt_fallback(path: str) -> list[SubtitleEntry]:
         entries = []
 
         for s in subs:
-            start = s.start.ordinal / 1000.0
-            end = s.end.ordinal / 1000.0
             entry = SubtitleEntry(
                 id=s.index,
-                start=start,
-                end=end,
+                start_ms=s.start.ordinal,
+                end_ms=s.end.ordinal,
                 original=s.text
             )
             entries.append(entry)
 
-        print(f"[SUBTITLES] Fallback pysrt cargó {len(entries)} entradas")
+        log.info(f"Fallback pysrt cargó {len(entries)} entradas")
         return entries
 
     except Exception as e:
-        print(f"[ERROR] Fallback pysrt también falló: {e}")
+        log.error(f"Fallback pysrt también falló: {e}")
         return []
 
 
-def sync_entries_from_original(original_path: str, translated_entries: list[SubtitleEntry]) -> list[SubtitleEntry]:
+def reconcile_timings(
+    original_entries: list[SubtitleEntry], translated_entries: list[SubtitleEntry]
+) -> tuple[list[SubtitleEntry], dict]:
     """
-    Sincroniza las entradas traducidas con la estructura del archivo original.
+    Copia en memoria los tiempos y la numeración del original sobre las entradas
+    traducidas. Si no tienen el mismo número de entradas, se alinean primero
+    (app.core.alignment): las partidas se unen, las fusionadas se reparten y las
+    que faltan conservan el texto original.
+    Devuelve (entradas, resumen) con el mismo resumen que timefix.compare_and_fix_times:
+    {"blocks", "mismatches", "original_blocks", "translated_blocks"} y, si hubo
+    que alinear, "alignment" con el coste y los movimientos.
     """
-    try:
-        original_entries = load_srt(original_path)
-
-        if len(original_entries) != len(translated_entries):
-            print(f"[SYNC] Discrepancia: original={len(original_entries)}, traducido={len(translated_entries)}")
-
-            # Si el traducido tiene más entradas, intentar reagrupar
-            if len(translated_entries) > len(original_entries):
-                return _regroup_translated_entries(original_entries, translated_entries)
-
-        # Aplicar timestamps del original al traducido
-        synchronized = []
-        for i, (orig, trans) in enumerate(zip(original_entries, translated_entries)):
-            synced_entry = SubtitleEntry(
-                id=orig.id,
-                start=orig.start,  # USAR TIEMPOS DEL ORIGINAL
-                end=orig.end,  # USAR TIEMPOS DEL ORIGINAL
-                original=orig.original,
-                translated=trans.translated or trans.original
-            )
-            synchronized.append(synced_entry)
+    summary = {
+        "blocks": min(len(original_entries), len(translated_entries)),
+        "mismatches": 0,
+        "original_blocks": len(original_entries),
+        "translated_blocks": len(translated_entries),
+    }
+    texts = [t.translated or t.original for t in translated_entries]
+    pairs = list(zip(original_entries, translated_entries))
+    if len(original_entries) != len(translated_entries):
+        from app.core import alignment
+        log.warning(f"Discrepancia: original={len(original_entries)}, traducido={len(translated_entries)}; alineando")
+        result = alignment.align_tracks(
+            SubtitleTrack.from_entries(original_entries),
+            SubtitleTrack(starts=(e.start_ms for e in translated_entries),
+                          ends=(e.end_ms for e in translated_entries), texts=texts),
+        )
+        alignment.log_result(result)
+        summary["alignment"] = result.summary()
+        texts = alignment.texts_for_originals(result, [e.original for e in original_entries], texts)
+        matched = {i: translated_entries[j] for kind, i, j in result.steps if kind == alignment.MATCH}
+        pairs = [(orig, matched.get(i)) for i, orig in enumerate(original_entries)]
+        summary["blocks"] = len(original_entries)
+
+    # Aplicar timestamps del original al traducido
+    synchronized = []
+    mismatches = 0
+    for (orig, trans), text in zip(pairs, texts):
+        if trans is not None and (orig.start_ms != trans.start_ms or orig.end_ms != trans.end_ms):
+            mismatches += 1
+        synchronized.append(SubtitleEntry(
+            id=orig.id,
+            start_ms=orig.start_ms,  # USAR TIEMPOS DEL ORIGINAL
+            end_ms=orig.end_ms,  # USAR TIEMPOS DEL ORIGINAL
+            original=orig.original,
+            translated=text or ""  # sin traducción: save_srt escribe el original
+        ))
+    summary["mismatches"] = mismatches
 
-        print(f"[SYNC] Sincronizadas {len(synchronized)} entradas")
-        return synchronized
-
-    except Exception as e:
-        print(f"[ERROR] Error sincronizando: {e}")
-        return translated_entries
+    log.debug(f"Sincronizadas {len(synchronized)} entradas ({mismatches} tiempos corregidos)")
+    return synchronized, summary
 
 
-def _regroup_translated_entries(original_entries: list[SubtitleEntry], translated_entries: list[SubtitleEntry]) -> list[
-    SubtitleEntry]:
+def sync_entries_from_original(original_path: str, translated_entries: list[SubtitleEntry]) -> list[SubtitleEntry]:
     """
-    Reagrupa entradas traducidas que se dividieron incorrectamente.
+    Sincroniza las entradas traducidas con la estructura del archivo original.
     """
-    regrouped = []
-    trans_idx = 0
-
-    for orig in original_entries:
-        # Calcular cuántas líneas tiene el original
-        orig_lines = orig.original.count('\n') + 1
-
-        # Recopilar las siguientes N entradas traducidas
-        collected_text = []
-        for _ in range(orig_lines):
-            if trans_idx < len(translated_entries):
-                text = translated_entries[trans_idx].translated or translated_entries[trans_idx].original
-                collected_text.append(text.strip())
-                trans_idx += 1
-
-        # Crear entrada reagrupada
-        regrouped_text = '\n'.join(collected_text)
-        regrouped_entry = SubtitleEntry(
-            id=orig.id,
-            start=orig.start,
-            end=orig.end,
-            original=orig.original,
-            translated=regrouped_text
-        )
-        regrouped.append(regrouped_entry)
-
-    print(f"[REGROUP] Reagrupadas {len(regrouped)} entradas de {len(translated_entries)} originales")
-    return regrouped
\ No newline at end of file
+    try:
+        return reconcile_timings(load_srt(original_path), translated_entries)[0]
+    except Exception as e:
+        log.error(f"Error sincronizando: {e}")
+        return translated_entries
@@ -1,5 +1,17 @@
+import os
 import re
+import threading
+from array import array
+from dataclasses import dataclass
+from fractions import Fraction
 from pathlib import Path
+from typing import Iterable, Iterator
+from app.core.subtitles import SubtitleTrack
+from app.services.logging_config import get_logger
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
 
 TIMECODE = r"(\d{2}:\d{2}:\d{2}[,.]\d{3})"
 BLOCK_RE = re.compile(
@@ -26,38 +38,312 @@ def format_srt(blocks):
         lines.append(f"{b['index']}\n{start} --> {end}\n{b['text']}\n")
     return "\n".join(lines).strip() + "\n"
 
-def compare_and_fix_times(original_path: str, translated_path: str, out_path: str):
+def _to_ms(timecode: str) -> int:
+    h, m, rest = timecode.split(":")
+    sec, ms = rest.split(".")
+    return ((int(h) * 60 + int(m)) * 60 + int(sec)) * 1000 + int(ms)
+
+def _track(blocks) -> SubtitleTrack:
+    """Bloques de parse_srt como SubtitleTrack (tiempos en ms y textos)."""
+    return SubtitleTrack(
+        (b["index"] for b in blocks),
+        (_to_ms(b["start"]) for b in blocks),
+        (_to_ms(b["end"]) for b in blocks),
+        [b["text"] for b in blocks],
+    )
+
+def _align_texts(orig, trans):
+    """Texto traducido para cada bloque original cuando el número de bloques difiere."""
+    from app.core import alignment
+    result = alignment.align_tracks(_track(orig), _track(trans))
+    alignment.log_result(result)
+    texts = alignment.texts_for_originals(result, [b["text"] for b in orig], [b["text"] for b in trans])
+    matched = {i: trans[j] for kind, i, j in result.steps if kind == alignment.MATCH}
+    return texts, matched, result
+
+def compare_and_fix_times(original_path: str, translated_path: str, out_path: str) -> dict:
+    """
+    Copia los tiempos del original sobre el traducido y guarda el resultado en out_path.
+    Si el número de bloques difiere, los alinea por tiempos y longitud de texto
+    (app.core.alignment) en vez de truncar: los bloques partidos se unen, los
+    fusionados se reparten y los que faltan conservan el texto original.
+    Devuelve un resumen {"blocks", "mismatches", "original_blocks", "translated_blocks"}
+    y, si hubo que alinear, "alignment" con el coste y los movimientos.
+    """
     orig = parse_srt(original_path)
     trans = parse_srt(translated_path)
+    summary = {"original_blocks": len(orig), "translated_blocks": len(trans)}
 
     if len(orig) != len(trans):
-        print(f"[WARN] Diferente número de bloques: original={len(orig)} vs traducido={len(trans)}.")
-        # Alinear por mínima longitud para evitar IndexError; reporta diferencias.
-        n = min(len(orig), len(trans))
+        log.warning(f"Diferente número de bloques: original={len(orig)} vs traducido={len(trans)}; alineando.")
+        texts, matched, result = _align_texts(orig, trans)
+        summary["alignment"] = result.summary()
     else:
-        n = len(orig)
+        texts = [t["text"] for t in trans]
+        matched = dict(enumerate(trans))
 
     fixed = []
     mismatches = 0
-    for i in range(n):
-        o = orig[i]
-        t = trans[i]
+    for i, o in enumerate(orig):
+        t = matched.get(i)
         # Clonar tiempos del original, preservar texto traducido
-        if o["start"] != t["start"] or o["end"] != t["end"]:
+        if t is not None and (o["start"] != t["start"] or o["end"] != t["end"]):
             mismatches += 1
         fixed.append({
             "index": o["index"],     # mantener numeración del original
             "start": o["start"],     # SIEMPRE del original
             "end":   o["end"],       # SIEMPRE del original
-            "text":  t["text"]       # texto traducido
+            "text":  texts[i] or o["text"]  # texto traducido (o el original si no lo hay)
         })
 
-    # Si el traducido tenía más bloques, los ignoramos; si tenía menos, reportamos
-    if len(trans) > n:
-        print(f"[WARN] {len(trans)-n} bloques extra en traducido serán ignorados.")
-    if len(trans) < len(orig):
-        print(f"[WARN] {len(orig)-len(trans)} bloques faltantes en traducido; tiempos se preservan, texto no.")
-
     out_text = format_srt(fixed)
     Path(out_path).write_text(out_text, encoding="utf-8")
-    print(f"[FIX] Guardado corregido en: {out_path} | desajustes corregidos: {mismatches}/{n}")
+    log.info(f"Guardado corregido en: {out_path} | desajustes corregidos: {mismatches}/{len(orig)}")
+    summary.update({"blocks": len(orig), "mismatches": mismatches})
+    return summary
+
+
+# ------------------ Transformaciones de tiempo en lote ------------------
+# Alias de las frecuencias NTSC (valor exacto, no el redondeado que se escribe)
+FPS_ALIASES = {
+    "23.976": Fraction(24000, 1001), "23.98": Fraction(24000, 1001),
+    "29.97": Fraction(30000, 1001), "47.952": Fraction(48000, 1001),
+    "59.94": Fraction(60000, 1001),
+}
+
+# Líneas de tiempos SRT o VTT en bytes (todas las codificaciones admitidas son compatibles
+# con ASCII): el resto del archivo se copia tal cual, con su codificación, BOM y saltos.
+# Camino rápido: formato estándar "HH:MM:SS,mmm --> HH:MM:SS,mmm" (split() devuelve
+# texto, inicio, flecha, fin, texto...). Si alguna línea con "-->" no encaja, se usa el tolerante:
+# sangría, horas opcionales (VTT "MM:SS.mmm") y milisegundos de 1 a 3 dígitos; split()
+# devuelve 12 grupos por línea: sangría, h, m, s, sep, ms, flecha, h, m, s, sep, ms.
+_STD_TIMING_RE = re.compile(rb'^(\d\d:\d\d:\d\d[,.]\d\d\d)( --> )(\d\d:\d\d:\d\d[,.]\d\d\d)', re.MULTILINE)
+_TS = rb'(?:(\d+):)?(\d{1,2}):(\d{1,2})([,.])(\d{1,3})'
+_TIMING_LINE_RE = re.compile(rb'^([ \t]*)' + _TS + rb'([ \t]*-->[ \t]*)' + _TS, re.MULTILINE)
+_GROUPS = 12
+
+# Tablas del camino rápido: b"00".."99" y b"000".."999" → int, y por segundo entero
+# b"HH:MM:SS" ↔ ms (se rellenan según aparecen; un archivo usa unas pocas horas).
+_B2 = {b"%02d" % i: i for i in range(100)}
+_B3 = {b"%03d" % i: i for i in range(1000)}
+_MS3 = [b"%03d" % i for i in range(1000)]
+_HMS_MS: dict[bytes, int] = {}
+_HMS: list[bytes] = []
+_hms_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class TimeTransform:
+    """
+    Transformación lineal de tiempos en milisegundos: t' = factor · t + offset_ms.
+    Desplazar, cambiar de fps y resincronizar por dos puntos son casos de la misma
+    recta, así que se pueden componer (then) y aplicar de una vez a una SubtitleTrack.
+    """
+    factor: float = 1.0
+    offset_ms: float = 0.0
+
+    @classmethod
+    def shift(cls, offset_ms: float) -> "TimeTransform":
+        """Desplazamiento (negativo = adelantar)."""
+        return cls(1.0, float(offset_ms))
+
+    @classmethod
+    def fps(cls, src, dst) -> "TimeTransform":
+        """
+        Conversión de subtítulos sincronizados con un video a src fps para otro a dst fps
+        con los mismos fotogramas (p. ej. 23.976 → 25 en las ediciones PAL: todo se acorta).
+        """
+        src, dst = parse_fps(src), parse_fps(dst)
+        return cls(float(src / dst), 0.0)
+
+    @classmethod
+    def two_point(cls, a1_ms: float, b1_ms: float, a2_ms: float, b2_ms: float) -> "TimeTransform":
+        """Resincronización lineal: el instante a1 pasa a b1 y a2 pasa a b2."""
+        if a1_ms == a2_ms:
+            raise ValueError("Los dos puntos de sincronización deben tener tiempos distintos")
+        factor = (b2_ms - b1_ms) / (a2_ms - a1_ms)
+        if factor <= 0:
+            raise ValueError("Los puntos de sincronización invierten el orden de los subtítulos")
+        return cls(factor, b1_ms - factor * a1_ms)
+
+    def then(self, other: "TimeTransform") -> "TimeTransform":
+        """Composición: primero self, después other."""
+        return TimeTransform(self.factor * other.factor, self.offset_ms * other.factor + other.offset_ms)
+
+    def apply_to(self, track: SubtitleTrack) -> None:
+        """Aplica la transformación a todos los tiempos de la pista (SubtitleTrack.remap)."""
+        track.remap(self.factor, self.offset_ms)
+
+    def describe(self) -> str:
+        return f"t·{self.factor:.9g} {'+' if self.offset_ms >= 0 else '-'} {abs(self.offset_ms):.0f} ms"
+
+
+def parse_fps(value) -> Fraction:
+    """'25', '23.976' (alias NTSC exacto), '24000/1001' o un número."""
+    if isinstance(value, Fraction):
+        fps = value
+    elif isinstance(value, str):
+        text = value.strip()
+        fps = FPS_ALIASES.get(text) or Fraction(text)
+    else:
+        fps = FPS_ALIASES.get(f"{value:g}") or Fraction(value).limit_denominator(1001)
+    if fps <= 0:
+        raise ValueError(f"Frecuencia de fotogramas no válida: {value}")
+    return fps
+
+
+def parse_offset(value: str) -> int:
+    """
+    Tiempo o desplazamiento en ms a partir de '1500', '-2.5s', '+00:01:02,500' o '-1:02.5'.
+    Sin unidad, el número son milisegundos.
+    """
+    text = value.strip()
+    sign = -1 if text.startswith("-") else 1
+    text = text.lstrip("+-").strip()
+    try:
+        if ":" in text:
+            parts = text.replace(",", ".").split(":")
+            if len(parts) > 3:
+                raise ValueError
+            seconds = 0.0
+            for part in parts:
+                seconds = seconds * 60 + float(part)
+            return sign * round(seconds * 1000)
+        if text.endswith("ms"):
+            return sign * round(float(text[:-2]))
+        if text.endswith("s"):
+            return sign * round(float(text[:-1]) * 1000)
+        return sign * round(float(text))
+    except ValueError:
+        raise ValueError(f"Tiempo no válido: {value!r}") from None
+
+
+def _parse_std(stamps) -> list[int]:
+    """Columna de tiempos b'HH:MM:SS,mmm' → ms."""
+    hms_ms, b3 = _HMS_MS, _B3
+    try:
+        return [hms_ms[t[:8]] + b3[t[9:12]] for t in stamps]
+    except KeyError:
+        for t in stamps:
+            key = t[:8]
+            if key not in hms_ms:
+                hms_ms[key] = ((_B2[key[0:2]] * 60 + _B2[key[3:5]]) * 60 + _B2[key[6:8]]) * 1000
+        return [hms_ms[t[:8]] + b3[t[9:12]] for t in stamps]
+
+
+def _format_std(values: array, stamps) -> list[bytes]:
+    """ms → b'HH:MM:SS,mmm', conservando el separador de cada tiempo original."""
+    top = max(values) // 1000
+    if top >= len(_HMS):
+        with _hms_lock:
+            for sec in range(len(_HMS), top + 1):
+                minutes, secs = divmod(sec, 60)
+                _HMS.append(b"%02d:%02d:%02d" % (minutes // 60, minutes % 60, secs))
+    hms, ms3 = _HMS, _MS3
+    return [hms[v // 1000] + t[8:9] + ms3[v % 1000] for v, t in zip(values, stamps)]
+
+
+def _parse_ts(hours, minutes, seconds, millis) -> list[int]:
+    """Columnas de campos del formato tolerante → ms."""
+    return [
+        ((int(h) if h else 0) * 60 + int(m)) * 60_000 + int(sec) * 1000 + int(f.ljust(3, b"0"))
+        for h, m, sec, f in zip(hours, minutes, seconds, millis)
+    ]
+
+
+def _format_ts(values, hours, seps) -> list[bytes]:
+    """ms → 'HH:MM:SS,mmm' (o 'MM:SS.mmm' si el original no tenía horas y no hacen falta)."""
+    out = []
+    for ms, h, sep in zip(values, hours, seps):
+        secs, ms = divmod(ms, 1000)
+        minutes, secs = divmod(secs, 60)
+        hh, minutes = divmod(minutes, 60)
+        if h is not None or hh:
+            out.append(b"%02d:%02d:%02d%s%03d" % (hh, minutes, secs, sep, ms))
+        else:
+            out.append(b"%02d:%02d%s%03d" % (minutes, secs, sep, ms))
+    return out
+
+
+def _retime_columns(starts: list[int], ends: list[int], transform: TimeTransform) -> tuple[SubtitleTrack, dict]:
+    """Pista solo de tiempos transformada y su resumen (tiempos recortados a 0, solapes)."""
+    track = SubtitleTrack(starts=starts, ends=ends)
+    zeros = track.starts.count(0) + track.ends.count(0)
+    transform.apply_to(track)
+    return track, {
+        "cues": len(track),
+        "clamped": track.starts.count(0) + track.ends.count(0) - zeros,
+        "overlaps": len(track.overlaps()),
+    }
+
+
+def retime_bytes(data: bytes, transform: TimeTransform) -> tuple[bytes, dict]:
+    """
+    Aplica la transformación a todas las líneas de tiempos de un SRT/VTT en bytes.
+    Solo se reescriben los dos tiempos de cada línea; el resto (numeración, texto,
+    sangría, ajustes VTT tras el tiempo final) se conserva byte a byte.
+    Cada campo es una columna (slice de la salida de split): los tiempos se transforman
+    como SubtitleTrack y se vuelven a colocar con asignaciones de slice, sin bucles por línea.
+    Devuelve (contenido, {"cues", "clamped", "overlaps"}).
+    """
+    parts = _STD_TIMING_RE.split(data)
+    cues = len(parts) // 4
+    if cues == data.count(b"-->"):
+        if not cues:
+            return data, {"cues": 0, "clamped": 0, "overlaps": 0}
+        track, summary = _retime_columns(_parse_std(parts[1::4]), _parse_std(parts[3::4]), transform)
+        parts[1::4] = _format_std(track.starts, parts[1::4])
+        parts[3::4] = _format_std(track.ends, parts[3::4])
+        return b"".join(parts), summary
+
+    step = _GROUPS + 1
+    parts = _TIMING_LINE_RE.split(data)
+    if len(parts) < step:
+        return data, {"cues": 0, "clamped": 0, "overlaps": 0}
+    track, summary = _retime_columns(
+        _parse_ts(parts[2::step], parts[3::step], parts[4::step], parts[6::step]),
+        _parse_ts(parts[8::step], parts[9::step], parts[10::step], parts[12::step]),
+        transform,
+    )
+    empty = [b""] * len(track)
+    parts[2::step] = _format_ts(track.starts, parts[2::step], parts[5::step])
+    parts[8::step] = _format_ts(track.ends, parts[8::step], parts[11::step])
+    for offset in (3, 4, 5, 6, 9, 10, 11, 12):
+        parts[offset::step] = empty
+    return b"".join(parts), summary
+
+
+def retime_file(path, transform: TimeTransform, out_path=None) -> dict:
+    """
+    Reescribe los tiempos de un archivo (en out_path o en el propio archivo).
+    La escritura es atómica: se escribe a un temporal y se renombra.
+    """
+    path = Path(path)
+    out_path = Path(out_path) if out_path is not None else path
+    with span("timefix.retime_file") as sp:
+        original = path.read_bytes()
+        data, summary = retime_bytes(original, transform)
+        # Sin cambios y en el mismo archivo: no hace falta reescribirlo
+        if out_path != path or data != original:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out_path.with_name(out_path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, out_path)
+        sp.bytes = len(data)
+    if summary["clamped"]:
+        log.warning(f"{path.name}: {summary['clamped']} tiempos quedaban antes de 0 y se han recortado")
+    return {"path": str(path), "output": str(out_path), **summary}
+
+
+def retime_files(jobs: Iterable, transform: TimeTransform) -> Iterator[dict]:
+    """
+    Procesa pares (entrada, salida) uno a uno y va devolviendo el resumen de cada
+    archivo (o {"path", "error"} si falla), sin cargar la carpeta entera en memoria.
+    salida None = sobrescribir la entrada.
+    """
+    for path, out_path in jobs:
+        try:
+            yield retime_file(path, transform, out_path)
+        except OSError as e:
+            log.error(f"Error ajustando tiempos de {path}: {e}")
+            yield {"path": str(path), "error": str(e)}
@@ -0,0 +1,258 @@
+# 📄 Archivo: app/core/translate_pipeline.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+from app.core import subtitles
+from app.core.batching import get_batcher, AdaptiveBatcher
+from app.core.postprocess import postprocesar
+from app.core.subtitles import SrtDiagnostics, SubtitleEntry
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger, is_verbose
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Archivos simultáneos por motor ------------------
+# Casi todo el tiempo se espera a la red: varios archivos a la vez solapan esas esperas.
+# google_free limita mucho por IP, así que se mantiene en serie.
+# Se puede ajustar con "translation_file_concurrency" en config.json.
+ENGINE_FILE_CONCURRENCY = {
+    "google_v1": 4,
+    "mymemory": 3,
+    "google_free": 1,
+}
+
+
+def file_concurrency(engine: str) -> int:
+    """Archivos simultáneos permitidos para un motor."""
+    overrides = get_settings().config.get("translation_file_concurrency") or {}
+    budget = overrides.get(engine, ENGINE_FILE_CONCURRENCY.get(engine, 1))
+    return max(1, int(budget))
+
+
+# ------------------ Ruta de salida ------------------
+def build_output_path(path: str, tgt_lang: str) -> str:
+    """
+    Construye la ruta de salida con estructura de carpetas fija.
+    - Carpeta: 'Subtitles_<tgt_lang>' junto al archivo original.
+    - Archivo: <nombre>_<tgtLang>.srt
+    """
+    p = Path(path)
+
+    # Carpeta de salida
+    folder_base = "Subtitles"
+    output_folder = f"{folder_base}_{tgt_lang}"
+    out_dir = p.parent / output_folder
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Nombre base traducido
+    translated_name = f"{p.stem}_{tgt_lang}{p.suffix}"
+    return str(out_dir / translated_name)
+
+
+# ------------------ Traducción por lotes (sin Qt) ------------------
+class TranslationPipeline:
+    """
+    Traduce una lista de textos con lotes adaptativos, varios lotes en vuelo
+    y reensamblado por índice. No depende de Qt: el worker de la GUI y la CLI
+    la usan igual, pasando callbacks para las líneas y el progreso.
+    - service: objeto con .engine y .translate_lines(lines, src, dst, cancel_flag=..., on_split=...).
+    - batcher: ajustador de lotes; por defecto el compartido del motor (get_batcher).
+    """
+
+    def __init__(
+        self, service, src_lang: str, tgt_lang: str, cancel_flag=None,
+        max_in_flight: Optional[int] = None, batcher: Optional[AdaptiveBatcher] = None
+    ):
+        self.service = service
+        self.src_lang = src_lang
+        self.tgt_lang = tgt_lang
+        self.cancel_flag = cancel_flag if cancel_flag is not None else threading.Event()
+        if max_in_flight is None:
+            max_in_flight = get_settings().config.get("translation_batches_in_flight") or 1
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.batcher = batcher if batcher is not None else get_batcher(service.engine)
+
+    def translate_batch(self, batch_texts: List[str], batcher: AdaptiveBatcher) -> Optional[List[str]]:
+        """
+        Traduce un lote con una sola llamada al servicio y comunica el resultado al
+        ajustador. El lote falla si el motor lanza una excepción, no devuelve una
+        línea por entrada o tuvo que dividir la petición porque los marcadores no
+        cuadraban; una línea que vuelve igual (nombres, números, mismo idioma) no es
+        un fallo. La división y el reintento los hace el traductor (verificación de
+        marcadores), no el pipeline. Si el lote falla, sus líneas conservan el original.
+        Devuelve None si se canceló.
+        """
+        if self.cancel_flag.is_set():
+            return None
+
+        splits = []
+        started = time.monotonic()
+        try:
+            with span("batch.translate", lines=len(batch_texts)):
+                translated_batch = self.service.translate_lines(
+                    batch_texts, self.src_lang, self.tgt_lang,
+                    cancel_flag=self.cancel_flag, on_split=splits.append
+                )
+            error = None
+        except Exception as e:
+            translated_batch = None
+            error = e
+
+        if self.cancel_flag.is_set():
+            return None
+
+        ok = error is None and len(translated_batch) == len(batch_texts)
+        batcher.record(len(batch_texts), time.monotonic() - started, ok and not splits)
+        if ok:
+            return translated_batch
+
+        if error is not None:
+            log.error(f"Error en lote de {len(batch_texts)} líneas: {error}")
+        else:
+            log.warning(
+                f"El motor devolvió {len(translated_batch)} líneas para un lote de "
+                f"{len(batch_texts)}; se conserva el original"
+            )
+        return list(batch_texts)
+
+    def translate_texts(
+        self,
+        texts: Sequence[str],
+        on_line: Optional[Callable[[int, str, str], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        label: str = ""
+    ) -> Optional[List[str]]:
+        """
+        Traduce todos los textos manteniendo el orden 1:1.
+        on_line(índice, original, traducido) se llama en orden de llegada;
+        on_progress(completadas, total) tras cada lote. Devuelve None si se canceló.
+        """
+        verbose = is_verbose()
+        total = len(texts)
+        translated_texts = [''] * total
+
+        # Lotes adaptativos: el tamaño se ajusta con la respuesta del motor.
+        # Varios lotes en vuelo a la vez; se reensamblan por índice según terminan.
+        batcher = self.batcher
+        total_processed = 0
+        start = 0
+        in_flight = {}
+
+        log.info(
+            f"{label}: {total} entradas, lotes de hasta {batcher.max_lines} líneas, "
+            f"{self.max_in_flight} en vuelo"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="batch") as pool:
+            while start < total or in_flight:
+                # Llenar los huecos libres con los siguientes lotes
+                while start < total and len(in_flight) < self.max_in_flight and not self.cancel_flag.is_set():
+                    end = batcher.take(texts, start)
+                    in_flight[pool.submit(self.translate_batch, list(texts[start:end]), batcher)] = (start, end)
+                    if verbose:
+                        log.debug(f"Lote {start}-{end - 1}: {end - start} elementos enviado")
+                    start = end
+
+                if self.cancel_flag.is_set():
+                    log.info(f"Cancelado durante procesamiento: {label}")
+                    return None
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    batch_start, batch_end = in_flight.pop(fut)
+                    translated_batch = fut.result()
+                    if translated_batch is None:
+                        continue  # cancelado; se sale en la siguiente vuelta
+
+                    # Asignar traducciones DIRECTAMENTE por índice (orden de llegada)
+                    for original_idx, translated_text in zip(range(batch_start, batch_end), translated_batch):
+                        translated_texts[original_idx] = translated_text
+
+                        if verbose:
+                            log.debug(f"Asignando {original_idx}: '{texts[original_idx][:30]}' -> '{translated_text[:30]}'")
+
+                        if on_line is not None:
+                            on_line(original_idx, texts[original_idx], translated_text)
+
+                    total_processed += batch_end - batch_start
+                    if on_progress is not None:
+                        on_progress(total_processed, total)
+
+        batcher.save()
+        return translated_texts
+
+
+def apply_translations(entries: List[SubtitleEntry], translated_texts: List[str]) -> None:
+    """Post-procesa cada traducción y la asigna; las vacías conservan el original."""
+    verbose = is_verbose()
+    empty_count = sum(1 for t in translated_texts if not t.strip())
+    if empty_count:
+        log.warning(f"Traducciones vacías: {empty_count}/{len(translated_texts)}")
+
+    with span("cpu.postprocess", lines=len(entries)):
+        for i, (entry, translation) in enumerate(zip(entries, translated_texts)):
+            processed_translation = postprocesar(translation)
+            entry.translated = processed_translation
+
+            if verbose:
+                log.debug(f"Final {i}: '{entry.original[:30]}' -> '{processed_translation[:30]}'")
+
+            # Verificar traducciones vacías
+            if entry.original.strip() and not processed_translation.strip():
+                entry.translated = entry.original
+
+
+def translate_file(
+    file_path: str,
+    service,
+    src_lang: str,
+    tgt_lang: str,
+    cancel_flag=None,
+    entries: Optional[List[SubtitleEntry]] = None,
+    on_line: Optional[Callable[[int, str, str], None]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    max_in_flight: Optional[int] = None,
+    batcher: Optional[AdaptiveBatcher] = None,
+    diagnostics: Optional[SrtDiagnostics] = None
+) -> Optional[str]:
+    """
+    Traduce un archivo de subtítulos completo y guarda el resultado.
+    - entries: subtítulos ya cargados (p. ej. extraídos en streaming de un video);
+      si se indican, file_path solo se usa para construir la ruta de salida.
+    - diagnostics: recibe las incidencias al cargar file_path (ver subtitles.load_srt).
+    Devuelve la ruta de salida, o None si se canceló. Lanza ValueError si el
+    archivo está vacío o es inválido.
+    """
+    log.info(f"Iniciando traducción: {file_path} ({src_lang} -> {tgt_lang}, {service.engine})")
+    pipeline = TranslationPipeline(service, src_lang, tgt_lang, cancel_flag, max_in_flight, batcher)
+    if pipeline.cancel_flag.is_set():
+        log.info(f"Cancelado antes de iniciar: {file_path}")
+        return None
+
+    # Cargar subtítulos (o usar los recibidos en memoria)
+    if entries is None:
+        entries = subtitles.load_srt(file_path, diagnostics)
+    if not entries:
+        raise ValueError("Archivo de subtítulos vacío o inválido")
+
+    translated_texts = pipeline.translate_texts(
+        [e.original for e in entries], on_line=on_line, on_progress=on_progress, label=str(file_path)
+    )
+    if translated_texts is None or pipeline.cancel_flag.is_set():
+        return None
+
+    # Las traducciones se asignan 1:1 sobre las propias entradas del original, así que
+    # tiempos y orden ya son los suyos: no hace falta releer el original ni corregir
+    # el archivo guardado (ver subtitles.reconcile_timings para listas de otro origen)
+    apply_translations(entries, translated_texts)
+
+    # Guardar archivo (una sola escritura)
+    out_path = build_output_path(file_path, tgt_lang)
+    subtitles.save_srt(entries, out_path)
+    log.info(f"Traducción completada: {out_path}")
+    return out_path
@@ -0,0 +1,223 @@
+# 📄 Archivo: app/core/translation_memory.py
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.services.settings import get_settings
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Configuración ------------------
+CACHE_DIR_NAME = "cache"
+MEMORY_FILE_NAME = "translation_memory.sqlite"
+DEFAULT_MAX_ENTRIES = 200000
+# Límite de parámetros por consulta (SQLite admite 999 en versiones antiguas)
+_CHUNK = 500
+
+_SPACES_RE = re.compile(r'[ \t]+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza el texto origen para usarlo como clave: NFC, espacios colapsados
+    y recortados por línea. No cambia mayúsculas (afectan a la traducción).
+    """
+    text = unicodedata.normalize("NFC", text)
+    return '\n'.join(_SPACES_RE.sub(' ', l).strip() for l in text.strip().split('\n'))
+
+# ------------------ Memoria de traducción persistente ------------------
+class TranslationMemory:
+    """
+    Memoria de traducción en disco (SQLite, WAL) compartida entre archivos,
+    ejecuciones y hilos. La clave es (texto normalizado, origen, destino, motor).
+    Al superar max_entries se eliminan las entradas usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------ Conexión ------------------
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                " source TEXT NOT NULL,"
+                " src TEXT NOT NULL,"
+                " dst TEXT NOT NULL,"
+                " engine TEXT NOT NULL,"
+                " target TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (source, src, dst, engine))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS memory_last_used ON memory(last_used)")
+            self._count = conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+            self._conn = conn
+        except sqlite3.Error as e:
+            log.warning(f"Memoria de traducción no disponible ({self.db_path}): {e}")
+            self._conn = None
+        return self._conn
+
+    # ------------------ Lectura / escritura ------------------
+    def get_many(self, texts: Iterable[str], src: str, dst: str, engine: str) -> Dict[str, str]:
+        """
+        Busca varias líneas de una vez. Devuelve {texto original: traducción}
+        solo para las que están en memoria.
+        """
+        keys: Dict[str, List[str]] = {}
+        for text in texts:
+            keys.setdefault(normalize_text(text), []).append(text)
+        if not keys:
+            return {}
+
+        found: Dict[str, str] = {}
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                self.misses += len(keys)
+                return {}
+            try:
+                norm = list(keys)
+                for i in range(0, len(norm), _CHUNK):
+                    chunk = norm[i:i + _CHUNK]
+                    rows = conn.execute(
+                        f"SELECT source, target FROM memory WHERE src=? AND dst=? AND engine=?"
+                        f" AND source IN ({','.join('?' * len(chunk))})",
+                        (src, dst, engine, *chunk)
+                    ).fetchall()
+                    for source, target in rows:
+                        for text in keys[source]:
+                            found[text] = target
+                    if rows:
+                        conn.execute(
+                            f"UPDATE memory SET last_used=? WHERE src=? AND dst=? AND engine=?"
+                            f" AND source IN ({','.join('?' * len(rows))})",
+                            (time.time(), src, dst, engine, *(r[0] for r in rows))
+                        )
+            except sqlite3.Error as e:
+                log.warning(f"Error leyendo memoria de traducción: {e}")
+            hit_keys = {normalize_text(t) for t in found}
+            self.hits += len(hit_keys)
+            self.misses += len(keys) - len(hit_keys)
+        return found
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], src: str, dst: str, engine: str) -> None:
+        """Guarda pares (texto original, traducción); ignora traducciones vacías."""
+        now = time.time()
+        rows = [
+            (normalize_text(source), src, dst, engine, target, now)
+            for source, target in pairs
+            if source.strip() and target and target.strip()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO memory(source, src, dst, engine, target, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("COMMIT")
+                # Cota superior (los reemplazos no suman): se recuenta solo si puede haber exceso
+                self._count += len(rows)
+                if self._count > self.max_entries:
+                    self._count = conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+                    if self._count > self.max_entries:
+                        self._evict()
+            except sqlite3.Error as e:
+                log.warning(f"Error escribiendo memoria de traducción: {e}")
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+
+    def _evict(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar en el 90% del límite."""
+        target = int(self.max_entries * 0.9)
+        excess = self._count - target
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        log.info(f"Memoria de traducción: {excess} entradas antiguas eliminadas")
+
+    # ------------------ Mantenimiento ------------------
+    def clear(self) -> None:
+        """Vacía la memoria de traducción."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM memory")
+                conn.execute("VACUUM")
+                self._count = 0
+                log.info("Memoria de traducción vaciada")
+            except sqlite3.Error as e:
+                log.warning(f"Error vaciando memoria de traducción: {e}")
+
+    def stats(self) -> dict:
+        """Entradas guardadas y aciertos/fallos desde el arranque."""
+        with self._lock:
+            entries = self._count if self._connect() is not None else 0
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count if self._connect() is not None else 0
+
+
+# ------------------ Instancia compartida ------------------
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    Devuelve la memoria de traducción compartida por toda la aplicación,
+    o None si está desactivada ("translation_memory_enabled" en config.json).
+    Se guarda en <instalación>/cache y su tamaño se configura con
+    "translation_memory_max_entries".
+    """
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            S = get_settings()
+            if not S.config.get("translation_memory_enabled", True):
+                return None
+            _memory = TranslationMemory(
+                S.install_dir / CACHE_DIR_NAME / MEMORY_FILE_NAME,
+                max_entries=S.config.get("translation_memory_max_entries", DEFAULT_MAX_ENTRIES)
+            )
+        return _memory
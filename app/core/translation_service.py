@@ -1,25 +1,75 @@
-# app\gui\translate\translation_service.py
+# app\core\translation_service.py
 from app.core.translators import GoogleFreeTranslator, MyMemoryTranslator, GoogleV1Translator
-import time
+from app.core.translation_memory import get_translation_memory, normalize_text
+from app.core.lru_cache import ByteLRUCache, content_key
+from app.services.settings import get_settings
 import threading
 import unicodedata
+from app.services.logging_config import get_logger
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Caché en memoria compartida ------------------
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_translation_cache() -> ByteLRUCache:
+    """
+    Caché LRU del proceso, compartida por todos los workers (uno por archivo).
+    Capacidad en bytes configurable con "translation_cache_max_bytes".
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            S = get_settings()
+            _shared_cache = ByteLRUCache(S.config.get("translation_cache_max_bytes", DEFAULT_CACHE_MAX_BYTES))
+        return _shared_cache
+
 
 class TranslationService:
     def __init__(self, engine="google_free"):
         self.engine = engine
-        self.translators = {
-            "google_free": GoogleFreeTranslator(),
-            "google_v1": GoogleV1Translator(),
-            "mymemory": MyMemoryTranslator(),
+        # Solo se construye el motor elegido, y en la primera traducción (no al crear el servicio)
+        self._translator = None
+        self._translator_lock = threading.Lock()
+
+        # Caché LRU compartida para evitar re-traducir textos idénticos
+        self._translation_cache = get_translation_cache()
+        # Memoria de traducción persistente, compartida entre archivos y ejecuciones
+        self._memory = get_translation_memory()
+
+    @property
+    def translator(self):
+        """Motor del servicio; se crea (importando sus dependencias) al usarlo por primera vez."""
+        if self._translator is None:
+            with self._translator_lock:
+                if self._translator is None:
+                    self._translator = self._build_translator(self.engine)
+        return self._translator
+
+    @staticmethod
+    def _build_translator(engine):
+        """
+        Motores HTTP sobre el bucle asyncio compartido si httpx está instalado
+        (y "async_http" no está desactivado); si no, los traductores con requests.
+        Lanza KeyError si el motor no existe.
+        """
+        if engine in ("google_v1", "mymemory") and get_settings().config.get("async_http", True):
+            from app.core.async_engines import (
+                async_available, AsyncEngineAdapter, AsyncGoogleV1Translator, AsyncMyMemoryTranslator
+            )
+            if async_available():
+                engine_cls = AsyncGoogleV1Translator if engine == "google_v1" else AsyncMyMemoryTranslator
+                return AsyncEngineAdapter(engine_cls())
+        factories = {
+            "google_free": GoogleFreeTranslator,
+            "google_v1": GoogleV1Translator,
+            "mymemory": MyMemoryTranslator,
         }
-
-        # Cache simple para evitar re-traducir textos idénticos
-        self._translation_cache = {}
-        self._cache_lock = threading.RLock()
-
-        # Rate limiting mejorado
-        self._last_request_time = 0
-        self._request_lock = threading.RLock()
+        return factories[engine]()
 
     def _resolve_src(self, lines, src_lang, tgt_lang):
         """Resuelve el idioma fuente con detección mejorada"""
@@ -49,14 +99,14 @@ class TranslationService:
                     return lang_mapping.get(detected, 'en')
 
             except (ImportError, LangDetectException, Exception) as e:
-                print(f"[WARN] Error en detección con langdetect: {e}")
+                log.warning(f"Error en detección con langdetect: {e}")
                 # Fallback al método anterior...
 
         return src_lang or "auto"
 
     def _get_cache_key(self, text, src_lang, tgt_lang):
-        """Genera clave de cache para el texto"""
-        return f"{src_lang}_{tgt_lang}_{hash(text.strip().lower())}"
+        """Genera clave de cache estable para el texto (incluye el motor)"""
+        return content_key(self.engine, src_lang, tgt_lang, normalize_text(text))
 
     def _clean_html_tags(self, text):
         """Elimina etiquetas HTML del texto antes de traducir"""
@@ -108,29 +158,11 @@ class TranslationService:
 
         return result.strip()
 
-    def _apply_rate_limiting(self):
-        """Aplica rate limiting inteligente según el motor"""
-        with self._request_lock:
-            current_time = time.time()
-
-            if self.engine == "google_free":
-                # Google Free es más restrictivo
-                min_interval = 0.5  # 500ms entre requests
-            elif self.engine == "mymemory":
-                # MyMemory es más permisivo
-                min_interval = 0.1  # 100ms entre requests
-            else:
-                min_interval = 0.3
-
-            elapsed = current_time - self._last_request_time
-            if elapsed < min_interval:
-                sleep_time = min_interval - elapsed
-                time.sleep(sleep_time)
-
-            self._last_request_time = time.time()
-
-    def translate_lines(self, lines, src_lang, tgt_lang, cancel_flag=None):
-        """Traduce múltiples líneas con optimizaciones de velocidad"""
+    def translate_lines(self, lines, src_lang, tgt_lang, cancel_flag=None, on_split=None):
+        """
+        Traduce múltiples líneas con optimizaciones de velocidad.
+        on_split se pasa al motor (ver ITranslator.translate_lines).
+        """
         if not lines:
             return []
 
@@ -164,51 +196,67 @@ class TranslationService:
         lines_to_translate = []
         translate_indices = []
 
-        with self._cache_lock:
+        with span("cache.lru", lines=len(non_empty_lines)):
             for i, line in enumerate(non_empty_lines):
                 if cancel_flag and cancel_flag.is_set():
                     return lines
 
-                cache_key = self._get_cache_key(line, src, tgt_lang)
-                if cache_key in self._translation_cache:
-                    cached_results[i] = self._translation_cache[cache_key]
+                cached = self._translation_cache.get(self._get_cache_key(line, src, tgt_lang))
+                if cached is not None:
+                    cached_results[i] = cached
                 else:
                     lines_to_translate.append(line)
                     translate_indices.append(i)
 
-        print(f"[SERVICE] Cache hits: {len(cached_results)}, Nuevas traducciones: {len(lines_to_translate)}")
+        # Lo que no está en la caché del proceso se busca en la memoria persistente
+        if lines_to_translate and self._memory is not None:
+            with span("cache.memory", lines=len(lines_to_translate)):
+                remembered = self._memory.get_many(lines_to_translate, src, tgt_lang, self.engine)
+            if remembered:
+                pending = []
+                pending_indices = []
+                for line, i in zip(lines_to_translate, translate_indices):
+                    if line in remembered:
+                        cached_results[i] = remembered[line]
+                        self._translation_cache.put(self._get_cache_key(line, src, tgt_lang), remembered[line])
+                    else:
+                        pending.append(line)
+                        pending_indices.append(i)
+                lines_to_translate, translate_indices = pending, pending_indices
+
+        log.debug(f"Cache hits: {len(cached_results)}, nuevas traducciones: {len(lines_to_translate)}")
 
         # Traducir líneas no cacheadas
         translated_new = []
         if lines_to_translate:
             try:
-                # Aplicar rate limiting antes de traducir
-                self._apply_rate_limiting()
-
+                # El límite de peticiones lo aplica cada traductor por petición HTTP
+                # (app.core.rate_limit, compartido por todos los workers)
                 # Verificar cancelación antes de API call
                 if cancel_flag and cancel_flag.is_set():
                     return lines
 
                 # Llamar al traductor
-                translated_new = self.translators[self.engine].translate_lines(
-                    lines_to_translate, src, tgt_lang, cancel_flag=cancel_flag
+                translated_new = self.translator.translate_lines(
+                    lines_to_translate, src, tgt_lang, cancel_flag=cancel_flag, on_split=on_split
                 )
 
-                # Guardar en cache
-                with self._cache_lock:
-                    for original, translated in zip(lines_to_translate, translated_new):
-                        cache_key = self._get_cache_key(original, src, tgt_lang)
-                        self._translation_cache[cache_key] = translated
+                # Guardar en cache (la LRU expulsa lo menos usado al llenarse)
+                # (sin guardar respuestas vacías o idénticas: suelen ser fallbacks de error
+                # y deben poder reintentarse)
+                for original, translated in zip(lines_to_translate, translated_new):
+                    if translated and translated != original:
+                        self._translation_cache.put(self._get_cache_key(original, src, tgt_lang), translated)
 
-                        # Limitar tamaño de cache (mantener últimas 1000 traducciones)
-                        if len(self._translation_cache) > 1000:
-                            # Eliminar 20% más antiguas (aproximación simple)
-                            keys_to_remove = list(self._translation_cache.keys())[:200]
-                            for key in keys_to_remove:
-                                del self._translation_cache[key]
+                # Persistir; una salida idéntica a la entrada suele ser el fallback de un error
+                if self._memory is not None:
+                    self._memory.put_many(
+                        [(o, t) for o, t in zip(lines_to_translate, translated_new) if t != o],
+                        src, tgt_lang, self.engine
+                    )
 
             except Exception as e:
-                print(f"[ERROR] {self.engine} falló: {e}")
+                log.error(f"{self.engine} falló: {e}")
                 # En caso de error, devolver textos originales
                 translated_new = lines_to_translate
 
@@ -256,14 +304,15 @@ class TranslationService:
 
     def clear_cache(self):
         """Limpia el cache de traducciones"""
-        with self._cache_lock:
-            self._translation_cache.clear()
-            print("[SERVICE] Cache de traducciones limpiado")
+        self._translation_cache.clear()
+        log.info("Cache de traducciones limpiado")
 
     def get_cache_stats(self):
         """Obtiene estadísticas del cache"""
-        with self._cache_lock:
-            return {
-                'size': len(self._translation_cache),
-                'engine': self.engine
-            }
\ No newline at end of file
+        stats = self._translation_cache.stats()
+        return {
+            'size': stats['entries'],
+            'engine': self.engine,
+            'cache': stats,
+            'memory': self._memory.stats() if self._memory is not None else None
+        }
\ No newline at end of file
@@ -1,25 +1,41 @@
 # app\core\translators.py
 from abc import ABC, abstractmethod
 from time import sleep
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
-import requests
 import json
 import unicodedata
 from urllib.parse import quote_plus
+from app.services.logging_config import get_logger
+from app.core.rate_limit import get_rate_limiter
+from app.core.batching import batch_end, engine_batch_cap
+from app.services.settings import get_settings
+from app.services.instrumentation import span
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
 
-# Concurrencia interna por lote (ajusta según servicio)
-MAX_PARALLEL = 6
 # Timeouts razonables por request
 REQ_TIMEOUT = 6
 
 class ITranslator(ABC):
     @abstractmethod
-    def translate_lines(self, lines: List[str], src: str, dst: str, cancel_flag=None) -> List[str]:
+    def translate_lines(
+        self, lines: List[str], src: str, dst: str, cancel_flag=None,
+        on_split: Optional[Callable[[int], None]] = None
+    ) -> List[str]:
+        """
+        Traduce las líneas 1:1. Los motores que verifican el lote (marcadores de
+        GoogleV1) llaman a on_split(n) cada vez que dividen una petición de n líneas.
+        """
         ...
 
+def engine_endpoint(engine: str, default: str) -> str:
+    """URL del motor; "translation_endpoints" en config.json la sustituye (servidores de prueba)."""
+    return (get_settings().config.get("translation_endpoints") or {}).get(engine) or default
+
 def _dedup(lines: List[str]) -> tuple[List[str], Dict[int, int]]:
     uniq = {}
     order = []
@@ -40,44 +56,43 @@ class GoogleFreeTranslator(ITranslator):
     def __init__(self):
         from deep_translator import GoogleTranslator
         self.GoogleTranslator = GoogleTranslator
-        self._cache: Dict[tuple, str] = {}  # (src, dst, text) -> translation
 
-    def _translate_one(self, tr, text: str, src: str, dst: str) -> str:
-        # reintentos con jitter
+    def _translate_one(self, tr, text: str, limiter, cancel_flag=None):
+        """
+        Una línea = una petición de deep_translator, con su propio token del limitador:
+        el ritmo se reparte petición a petición en vez de reservar un lote entero de golpe.
+        Devuelve None si se canceló esperando turno; el texto original si fallan los reintentos.
+        """
         for attempt in range(3):
+            if not limiter.acquire(1, cancel_flag):
+                return None
             try:
-                return tr.translate(text)
-            except Exception:
-                sleep(0.12 * (2 ** attempt) + random.random() * 0.08)
-        return text  # fallback seguro
+                with span("http.google_free"):
+                    res = tr.translate(text)
+                limiter.reward()
+                return res if res else text
+            except Exception as e:
+                if type(e).__name__ == "TooManyRequests":
+                    limiter.penalize()  # pausa global en el limitador; reintenta esta línea
+                else:
+                    sleep(0.12 * (2 ** attempt) + random.random() * 0.08)
+        return text  # fallback seguro, solo para esta línea
 
-    def translate_lines(self, lines, src="auto", dst="es", cancel_flag=None):
+    def translate_lines(self, lines, src="auto", dst="es", cancel_flag=None, on_split=None):
         tr = self.GoogleTranslator(source=src, target=dst)
         unique, index_map = _dedup(lines)
-        out = [""] * len(unique)
+        out = list(unique)  # lo no traducido (cancelado o vacío) queda como el original
+        limiter = get_rate_limiter("google_free")
 
-        # deep_translator supports translate_batch; chunk to avoid overlong requests
-        CHUNK_SIZE = 50
-        chunks = [unique[i:i + CHUNK_SIZE] for i in range(0, len(unique), CHUNK_SIZE)]
-        idx = 0
-        for chunk in chunks:
+        for i, text in enumerate(unique):
             if cancel_flag and cancel_flag.is_set():
                 break
-            try:
-                batch_res = tr.translate_batch(chunk)
-            except Exception:
-                batch_res = chunk  # fallback
-            for j, text in enumerate(chunk):
-                res = batch_res[j] if j < len(batch_res) else text
-                key = (src, dst, text)
-                self._cache[key] = res
-                out[idx + j] = res
-            idx += len(chunk)
-
-        # Fill any remaining blanks if cancelled mid-way
-        for i, text in enumerate(unique):
-            if out[i] == "":
-                out[i] = text if text else ""
+            if not text:
+                continue
+            res = self._translate_one(tr, text, limiter, cancel_flag)
+            if res is None:
+                break
+            out[i] = res
 
         return _recompose(unique, out, index_map)
 
@@ -86,52 +101,62 @@ class MyMemoryTranslator(ITranslator):
     def __init__(self):
         import requests
         self.session = requests.Session()
-        self._cache: Dict[tuple, str] = {}  # (src, dst, text) -> translation
+        self.URL = engine_endpoint("mymemory", self.URL)
+
+    URL = "https://api.mymemory.translated.net/get"
+
+    @staticmethod
+    def _params(text: str, src: str, dst: str) -> dict:
+        return {"q": text, "langpair": f"{src}|{dst}"}
+
+    @staticmethod
+    def _parse(data: dict, text: str) -> str:
+        return data.get("responseData", {}).get("translatedText", text)
 
     def _translate_one(self, text: str, src: str, dst: str) -> str:
         import requests
+        limiter = get_rate_limiter("mymemory")
         for attempt in range(3):
             try:
-                r = self.session.get(
-                    "https://api.mymemory.translated.net/get",
-                    params={"q": text, "langpair": f"{src}|{dst}"},
-                    timeout=REQ_TIMEOUT,
-                )
+                limiter.acquire()
+                with span("http.mymemory") as sp:
+                    r = self.session.get(self.URL, params=self._params(text, src, dst), timeout=REQ_TIMEOUT)
+                    sp.bytes = len(r.content)
+                limiter.observe(r.status_code, r.headers.get("Retry-After"))
                 r.raise_for_status()
-                data = r.json()
-                return data.get("responseData", {}).get("translatedText", text)
+                return self._parse(r.json(), text)
             except requests.RequestException:
                 sleep(0.12 * (2 ** attempt) + random.random() * 0.08)
         return text
 
-    def translate_lines(self, lines, src="auto", dst="es", cancel_flag=None):
+    def translate_lines(self, lines, src="auto", dst="es", cancel_flag=None, on_split=None):
+        """
+        La API admite una sola línea por petición: las del lote van todas a la vez
+        (hasta el tope de lote del motor), así el tamaño de lote aprendido es la
+        concurrencia real; el ritmo lo sigue marcando el limitador.
+        """
         unique, index_map = _dedup(lines)
         out = [""] * len(unique)
 
         tasks = {}
-        with ThreadPoolExecutor(max_workers=MAX_PARALLEL) as pool:
+        workers = max(1, min(sum(1 for text in unique if text), engine_batch_cap("mymemory")[0]))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
             for i, text in enumerate(unique):
                 if cancel_flag and cancel_flag.is_set():
                     break
                 if not text:
                     out[i] = ""
                     continue
-                key = (src, dst, text)
-                if key in self._cache:
-                    out[i] = self._cache[key]
-                    continue
-                tasks[pool.submit(self._translate_one, text, src, dst)] = (i, key)
+                tasks[pool.submit(self._translate_one, text, src, dst)] = (i, text)
 
             for future in as_completed(tasks):
                 if cancel_flag and cancel_flag.is_set():
                     break
-                i, key = tasks[future]
+                i, text = tasks[future]
                 try:
-                    res = future.result()
-                    out[i] = res
-                    self._cache[key] = res
+                    out[i] = future.result()
                 except Exception:
-                    out[i] = key[2]
+                    out[i] = text
 
         for i, text in enumerate(unique):
             if out[i] == "":
@@ -140,13 +165,16 @@ class MyMemoryTranslator(ITranslator):
         return _recompose(unique, out, index_map)
 
 class GoogleV1Translator(ITranslator):
+    base = "https://translate.googleapis.com/"
+
     def __init__(self):
+        import requests
         self.session = requests.Session()
         self.session.headers.update({
             "user-agent": "Mozilla/5.0 (Windows NT 6.1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2228.0 Safari/537.36",
             "Content-Type": "application/json; charset=UTF-8",
         })
-        self.base = "https://translate.googleapis.com/"
+        self.base = engine_endpoint("google_v1", self.base)
 
     def _build_url(self, src: str, dst: str, q: str) -> str:
         return (
@@ -154,32 +182,6 @@ class GoogleV1Translator(ITranslator):
             f"client=gtx&sl={src}&tl={dst}&dt=t&q={quote_plus(q)}"
         )
 
-    def _parse_google_v1(self, payload: str) -> list[str]:
-        """Parsea la respuesta de Google Translate"""
-        try:
-            data = json.loads(payload)
-        except Exception as e:
-            print(f"Error parseando JSON: {e}")
-            return []
-
-        lines = []
-        if isinstance(data, list) and data:
-            first = data[0]
-            if isinstance(first, list):
-                for item in first:
-                    if isinstance(item, list) and item:
-                        s = item[0] or ""
-                        if isinstance(s, str):
-                            s = s.replace("\\n", "\n")
-                            s = re.sub(r'\n{2,}', '\n', s)
-                            s = unicodedata.normalize("NFC", s)
-                            lines.append(s.strip())
-                        else:
-                            lines.append("")
-                    else:
-                        lines.append("")
-        return lines
-
     def _post_process_translation(self, original: str, translated: str) -> str:
         """Post-procesamiento inteligente para mantener estructura"""
         if not translated or translated.isspace():
@@ -227,81 +229,146 @@ class GoogleV1Translator(ITranslator):
 
         return translated.strip()
 
-    def translate_lines(self, lines: list[str], src="auto", dst="es", cancel_flag=None) -> list[str]:
-        """Versión optimizada con procesamiento por lotes"""
-        if not lines:
-            return lines
+    # Protocolo por lotes: cada línea va precedida de un marcador numerado "[[n]]".
+    # Google conserva los marcadores (a lo sumo les cambia espacios), al contrario que
+    # un delimitador textual; si falta o sobra alguno, el lote se divide en dos y se reintenta.
+    # El tamaño de cada petición es el del lote recibido (lo fija el ajustador de lotes
+    # del pipeline); solo se corta al tope del motor si llega más (llamadas directas).
+    _MARKER_RE = re.compile(r'\[\s*\[\s*(\d+)\s*\]\s*\]')
 
-        # Separar líneas a traducir de las que no se deben traducir
+    def _select_lines(self, lines: list[str]) -> tuple[list[str], list[int]]:
+        """Separa las líneas a traducir de las que no (vacías, números, tiempos)."""
         to_translate = []
         translate_indices = []
-        original_lines = lines.copy()
-
         for i, line in enumerate(lines):
-            # No traducir: líneas vacías, números, formatos de tiempo
             if (not line.strip() or
                     line.strip().isdigit() or
                     re.search(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', line)):
                 continue
-
             to_translate.append(line)
             translate_indices.append(i)
+        return to_translate, translate_indices
 
+    def _batch_query(self, batch: list[str]) -> str:
+        """Codifica el lote; una sola línea se envía sin marcadores."""
+        if len(batch) == 1:
+            return batch[0]
+        return "\n".join(f"[[{n}]] {text}" for n, text in enumerate(batch, 1))
+
+    @staticmethod
+    def _raw_text(payload: str) -> str | None:
+        """Texto traducido completo (segmentos concatenados tal cual), o None si no se entiende."""
+        try:
+            data = json.loads(payload)
+            return "".join(
+                item[0] for item in data[0]
+                if isinstance(item, list) and item and isinstance(item[0], str)
+            )
+        except Exception as e:
+            log.warning(f"Error parseando JSON: {e}")
+            return None
+
+    def _split_response(self, payload: str, batch: list[str]) -> list[str] | None:
+        """
+        Convierte la respuesta de un lote en una traducción por línea.
+        Devuelve None si los marcadores no vuelven exactamente 1..n en orden.
+        """
+        text = self._raw_text(payload)
+        if text is None:
+            return None
+        if len(batch) == 1:
+            return [self._clean_segment(text)]
+
+        parts = self._MARKER_RE.split(text)
+        # parts = [antes, n1, texto1, n2, texto2, ...]
+        numbers = [int(n) for n in parts[1::2]]
+        if numbers != list(range(1, len(batch) + 1)) or parts[0].strip():
+            return None
+        return [self._clean_segment(t) for t in parts[2::2]]
+
+    @staticmethod
+    def _clean_segment(text: str) -> str:
+        text = text.replace("\\n", "\n")
+        text = re.sub(r'\n{2,}', '\n', text)
+        return unicodedata.normalize("NFC", text).strip()
+
+    def _request_batches(self, to_translate: list[str]) -> list[list[str]]:
+        """Parte las líneas en peticiones dentro del tope de lote del motor."""
+        max_lines, max_chars = engine_batch_cap("google_v1")
+        batches = []
+        start = 0
+        while start < len(to_translate):
+            end = batch_end(to_translate, start, max_lines, max_chars)
+            batches.append(to_translate[start:end])
+            start = end
+        return batches
+
+    def _translate_batch(self, batch: list[str], src: str, dst: str, cancel_flag, limiter,
+                         on_split=None) -> list[str] | None:
+        """
+        Traduce un lote verificando los marcadores; si no cuadran, avisa con
+        on_split(n), lo divide en dos y reintenta cada mitad (una línea suelta
+        nunca puede desalinearse). Los errores de red devuelven el original.
+        None si se canceló.
+        """
+        if not limiter.acquire(1, cancel_flag):
+            return None
+        try:
+            with span("http.google_v1", lines=len(batch)) as sp:
+                r = self.session.get(self._build_url(src, dst, self._batch_query(batch)), timeout=REQ_TIMEOUT)
+                sp.bytes = len(r.content)
+            limiter.observe(r.status_code, r.headers.get("Retry-After"))
+            r.raise_for_status()
+        except Exception as e:
+            log.error(f"Error en lote de {len(batch)} líneas: {e}")
+            return list(batch)  # Usar original en caso de error
+
+        result = self._split_response(r.text, batch)
+        if result is not None:
+            return result
+        if len(batch) == 1:
+            return list(batch)
+        log.debug(f"Marcadores desalineados en lote de {len(batch)} líneas; se divide")
+        if on_split is not None:
+            on_split(len(batch))
+        mid = len(batch) // 2
+        first = self._translate_batch(batch[:mid], src, dst, cancel_flag, limiter, on_split)
+        if first is None:
+            return None
+        second = self._translate_batch(batch[mid:], src, dst, cancel_flag, limiter, on_split)
+        if second is None:
+            return None
+        return first + second
+
+    def _assemble(self, lines: list[str], translate_indices: list[int], results: list[str]) -> list[str]:
+        """Reconstruye las líneas finales con post-procesamiento."""
+        final_lines = lines.copy()
+        for i, translated_line in zip(translate_indices, results):
+            if i < len(final_lines):
+                final_lines[i] = self._post_process_translation(lines[i], translated_line)
+        return final_lines
+
+    def translate_lines(self, lines: list[str], src="auto", dst="es", cancel_flag=None, on_split=None) -> list[str]:
+        """Versión optimizada con procesamiento por lotes"""
+        if not lines:
+            return lines
+
+        to_translate, translate_indices = self._select_lines(lines)
         # Si no hay nada que traducir, retornar original
         if not to_translate:
             return lines
 
-        # Procesar en lotes para mayor velocidad
-        batch_size = 20  # Ajusta según necesidad
         results = []
-
-        for batch_start in range(0, len(to_translate), batch_size):
+        limiter = get_rate_limiter("google_v1")
+        for n, batch in enumerate(self._request_batches(to_translate), 1):
             if cancel_flag and cancel_flag.is_set():
                 return lines
 
-            batch_end = min(batch_start + batch_size, len(to_translate))
-            batch = to_translate[batch_start:batch_end]
+            log.debug(f"Traduciendo lote {n}: {len(batch)} líneas")
 
-            print(f"Traduciendo lote {batch_start // batch_size + 1}: {len(batch)} líneas")
-
-            try:
-                # Unir el lote con un delimitador especial
-                delimiter = " ||| "
-                batch_text = delimiter.join(batch)
-
-                url = self._build_url(src, dst, batch_text)
-                r = self.session.get(url, timeout=REQ_TIMEOUT)
-                r.raise_for_status()
-
-                # Parsear respuesta
-                parsed = self._parse_google_v1(r.text)
-                if parsed:
-                    full_text = " ".join(parsed)
-                    # Dividir usando el delimitador
-                    translated_batch = full_text.split(delimiter)
-
-                    # Ajustar longitud si es necesario
-                    if len(translated_batch) < len(batch):
-                        translated_batch += [""] * (len(batch) - len(translated_batch))
-                    elif len(translated_batch) > len(batch):
-                        translated_batch = translated_batch[:len(batch)]
-                else:
-                    translated_batch = batch  # Fallback
-
-                results.extend(translated_batch)
-
-            except Exception as e:
-                print(f"Error en lote {batch_start // batch_size + 1}: {e}")
-                results.extend(batch)  # Usar original en caso de error
-
-        # Reconstruir las líneas finales con post-procesamiento
-        final_lines = original_lines.copy()
-
-        for i, translated_line in zip(translate_indices, results):
-            if i < len(final_lines):
-                final_lines[i] = self._post_process_translation(
-                    original_lines[i],
-                    translated_line
-                )
+            translated = self._translate_batch(batch, src, dst, cancel_flag, limiter, on_split)
+            if translated is None:
+                return lines
+            results.extend(translated)
 
-        return final_lines
\ No newline at end of file
+        return self._assemble(lines, translate_indices, results)
@@ -15,6 +15,7 @@ from app.gui.extract.video_tree_widget import VideoTreeWidget
 from app.gui.extract.workers import BatchWorker
 from app.services.settings import get_settings, save_config
 from app.services.translations import TRANSLATIONS
+from app.services.instrumentation import write_report
 from app.gui.extract.extract_widget_utils.extract_widget_ffmpeg_utils import ffmpeg_available
 
 def get_translator():
@@ -202,6 +203,7 @@ class ExtractWidget(QWidget):
             self.status_label.setText("⏹ " + self.t("process_stopped"))
 
     def _on_finished(self, stats: dict):
+        write_report("extract")  # solo si la instrumentación está activa
         winsound.MessageBeep(winsound.MB_ICONASTERISK)
         resumen = (
             f"{self.t('processed')}: {stats['total']}\n"
@@ -262,7 +264,11 @@ class ExtractWidget(QWidget):
         self.btn_stop.setEnabled(True)  # 🔹 habilitar botón de parada
 
         self.thread = QThread()
-        self.worker = BatchWorker(self.selected_folder or Path.cwd(), selected_tracks=selected_tracks)
+        self.worker = BatchWorker(
+            self.selected_folder or Path.cwd(),
+            selected_tracks=selected_tracks,
+            probes=self.tree.collect_probes()
+        )
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.progress.connect(self._progress_gui)
@@ -1,6 +1,8 @@
 # app\gui\extract\video_tree_widget.py
 # 📄 Archivo: video_tree_widget.py
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -9,15 +11,30 @@ from PySide6.QtGui import QFont, QAction, QKeySequence
 from PySide6.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QMenu, QMessageBox, QHeaderView
 )
+from shiboken6 import isValid
 
-from app.core.ffmpeg_utils import ffprobe_subs, BITMAP_CODECS
-import pycountry
+from app.core.ffmpeg_utils import ProbeResult, probe_video, BITMAP_CODECS
+from app.core.probe_cache import get_probe_cache
 import os
 import subprocess
 import sys
 from app.services.translations import TRANSLATIONS
 from app.services.settings import get_settings
 
+# ------------------ Nombres de idioma (pycountry en diferido) ------------------
+@lru_cache(maxsize=512)
+def lookup_language(code: str):
+    """
+    Devuelve el idioma de pycountry para un código ISO 639 (alpha-3 o alpha-2), o None.
+    pycountry se importa en la primera consulta y no al arrancar; el resultado se
+    memoriza porque el árbol pregunta por los mismos pocos códigos una y otra vez.
+    """
+    import pycountry
+    try:
+        return pycountry.languages.get(alpha_3=code) or pycountry.languages.get(alpha_2=code)
+    except (KeyError, LookupError):
+        return None
+
 def get_translator():
     S = get_settings()
     lang = S.config.get("ui_language", "es")
@@ -25,7 +42,14 @@ def get_translator():
 
 # ------------------ Worker para análisis con ffprobe ------------------
 class ProbeWorker(QThread):
-    probed = Signal(Path, list)   # Señal: (video_path, supported_tracks)
+    """
+    Analiza los videos con varios ffprobe en paralelo (pool acotado de hilos).
+    Los resultados se emiten en orden de finalización; el árbol ya reservó
+    una fila por video, así que el orden de inserción no cambia.
+    El número de procesos simultáneos sale de "probe_workers" en config.json
+    (por defecto, el número de CPUs).
+    """
+    probed = Signal(Path, list, object)   # Señal: (video_path, supported_tracks, ProbeResult)
     failed = Signal(Path, str)    # Señal: (video_path, error)
     finished_all = Signal()       # Señal: análisis terminado
 
@@ -33,21 +57,47 @@ class ProbeWorker(QThread):
         super().__init__(parent)
         self.videos = videos
         self._stop = False
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _probe_one(self, video: Path) -> ProbeResult | None:
+        if self._stop:
+            return None
+        return probe_video(video)
 
     def run(self):
-        for v in self.videos:
-            if self._stop:
-                break
-            try:
-                tracks = ffprobe_subs(v)
-                supported = [t for t in tracks if t["codec_name"] not in BITMAP_CODECS]
-                self.probed.emit(v, supported)
-            except Exception as e:
-                self.failed.emit(v, str(e))
+        if not self.videos:
+            self.finished_all.emit()
+            return
+
+        S = get_settings()
+        max_workers = S.config.get("probe_workers") or os.cpu_count() or 1
+        max_workers = max(1, min(int(max_workers), len(self.videos)))
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ffprobe")
+        futures = {self._pool.submit(self._probe_one, v): v for v in self.videos}
+        try:
+            for fut in as_completed(futures):
+                if self._stop:
+                    break
+                v = futures[fut]
+                try:
+                    probe = fut.result()
+                except Exception as e:
+                    self.failed.emit(v, str(e))
+                    continue
+                if probe is None:
+                    continue
+                supported = [t for t in probe.tracks if t["codec_name"] not in BITMAP_CODECS]
+                self.probed.emit(v, supported, probe)
+        finally:
+            # Cancela los análisis pendientes; los ffprobe en curso terminan solos
+            self._pool.shutdown(wait=False, cancel_futures=True)
         self.finished_all.emit()
 
     def stop(self):
         self._stop = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
 
 
 # ------------------ Widget principal de árbol de videos/subtítulos ------------------
@@ -96,8 +146,9 @@ class VideoTreeWidget(QTreeWidget):
         self.icon_video = None
         self.icon_sub = None
 
-        # Hilo de análisis
+        # Hilo de análisis y filas reservadas a la espera de su resultado
         self._probe_thread: ProbeWorker | None = None
+        self._pending_items: Dict[Path, QTreeWidgetItem] = {}
 
         # Traductor y cabeceras iniciales
         self.t = get_translator()
@@ -178,8 +229,18 @@ class VideoTreeWidget(QTreeWidget):
 
     # ------------------ Lanzar análisis con ffprobe ------------------
     def _probe_and_insert(self, videos: List[Path]):
+        # Descartar reservas cuyas filas ya no existen (p. ej. tras "Eliminar todo")
+        self._pending_items = {v: it for v, it in self._pending_items.items() if self._is_live_item(it)}
+
+        # Reservar una fila por video en el orden de entrada; los resultados la rellenan
+        for v in videos:
+            if v not in self._pending_items:
+                self._pending_items[v] = self._add_video_item(v)
+
         if self._probe_thread and self._probe_thread.isRunning():
             self._probe_thread.stop()
+            # Los videos que el hilo anterior no llegó a analizar pasan al nuevo
+            videos = list(self._pending_items.keys())
         self._probe_thread = ProbeWorker(videos, self)
         self._probe_thread.probed.connect(self._on_probed)
         self._probe_thread.failed.connect(self._on_failed)
@@ -188,8 +249,20 @@ class VideoTreeWidget(QTreeWidget):
         self.status.emit(self.t("analyzing_files").format(count=len(videos)))
 
     # ------------------ Callbacks de análisis ------------------
-    def _on_probed(self, video: Path, tracks: List[Dict[str, Any]]):
-        root = self._add_video_item(video)
+    def _is_live_item(self, item: QTreeWidgetItem | None) -> bool:
+        return item is not None and isValid(item) and self.indexOfTopLevelItem(item) >= 0
+
+    def _take_pending_item(self, video: Path) -> QTreeWidgetItem | None:
+        """Devuelve la fila reservada del video, o None si ya se resolvió o fue eliminada."""
+        root = self._pending_items.pop(video, None)
+        return root if self._is_live_item(root) else None
+
+    def _on_probed(self, video: Path, tracks: List[Dict[str, Any]], probe: ProbeResult | None = None):
+        root = self._take_pending_item(video)
+        if root is None:
+            return
+        # Guardar el análisis para que la extracción no tenga que repetir ffprobe
+        root.setData(0, Qt.UserRole, {"type": "video", "path": video, "probe": probe})
         if not tracks:
             no_item = QTreeWidgetItem(root, [self.t("no_extractable_subs"), "", "", ""])
             no_item.setFont(0, self._sub_font)
@@ -200,15 +273,17 @@ class VideoTreeWidget(QTreeWidget):
         root.setExpanded(True)
 
     def _on_failed(self, video: Path, err: str):
-        root = self._add_video_item(video)
+        root = self._take_pending_item(video)
+        if root is None:
+            return
         fail = QTreeWidgetItem(root, [self.t("ffprobe_failed").format(error=err), "", "", ""])
         fail.setFont(0, self._sub_font)
         root.setExpanded(True)
 
     # ------------------ Creación de items ------------------
-    def _add_video_item(self, video: Path) -> QTreeWidgetItem:
+    def _add_video_item(self, video: Path, probe: ProbeResult | None = None) -> QTreeWidgetItem:
         root = QTreeWidgetItem([video.name, "", "", ""])
-        root.setData(0, Qt.UserRole, {"type": "video", "path": video})
+        root.setData(0, Qt.UserRole, {"type": "video", "path": video, "probe": probe})
         root.setFont(0, self._video_font)
         if self.icon_video:
             root.setIcon(0, self.icon_video)
@@ -322,8 +397,27 @@ class VideoTreeWidget(QTreeWidget):
         act_expand = menu.addAction(self.t("expand_all"), self.expandAll)
         act_collapse = menu.addAction(self.t("collapse_all"), self.collapseAll)
 
+        # Mantenimiento de la caché de análisis
+        menu.addSeparator()
+        act_rebuild = menu.addAction(self.t("rebuild_probe_cache"), self._rebuild_probe_cache)
+
         menu.exec(event.globalPos())
 
+    # ------------------ Caché de análisis ------------------
+    def _rebuild_probe_cache(self):
+        """Vacía la caché persistente y vuelve a analizar todos los videos listados."""
+        videos = [
+            (self.topLevelItem(i).data(0, Qt.UserRole) or {}).get("path")
+            for i in range(self.topLevelItemCount())
+        ]
+        videos = [v for v in videos if v]
+        get_probe_cache().clear()
+        self.status.emit(self.t("probe_cache_rebuilt").format(count=len(videos)))
+        if videos:
+            self.clear()
+            self._pending_items.clear()
+            self._probe_and_insert(videos)
+
     # ------------------ Arrastrar y soltar ------------------
     def dropEvent(self, event):
         paths = []
@@ -374,7 +468,7 @@ class VideoTreeWidget(QTreeWidget):
             for sub_item in self._iter_sub_items(video_item):
                 code = sub_item.text(1) or "und"
                 try:
-                    name = pycountry.languages.get(alpha_3=code) or pycountry.languages.get(alpha_2=code)
+                    name = lookup_language(code)
                     langs.add((code, name.name if name else self.t("unknown_language")))
                 except:
                     langs.add((code, self.t("unknown_language")))
@@ -408,7 +502,7 @@ class VideoTreeWidget(QTreeWidget):
             "French": self.t("french")
         }
         try:
-            lang = pycountry.languages.get(alpha_3=code) or pycountry.languages.get(alpha_2=code)
+            lang = lookup_language(code)
             if lang:
                 return traducciones.get(lang.name, lang.name)
         except:
@@ -657,3 +751,15 @@ class VideoTreeWidget(QTreeWidget):
             if indexes:
                 mapping[vpath] = indexes
         return mapping
+
+    def collect_probes(self) -> Dict[Path, ProbeResult]:
+        """
+        Devuelve {video_path: ProbeResult} con los análisis guardados al añadir cada video.
+        Se entrega junto con collect_selection() para que la extracción reutilice el análisis.
+        """
+        probes: Dict[Path, ProbeResult] = {}
+        for i in range(self.topLevelItemCount()):
+            data = self.topLevelItem(i).data(0, Qt.UserRole) or {}
+            if data.get("type") == "video" and data.get("probe") is not None:
+                probes[data["path"]] = data["probe"]
+        return probes
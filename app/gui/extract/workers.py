@@ -1,7 +1,9 @@
 # app\gui\extract\workers.py
 from PySide6.QtCore import QObject, Signal
 from pathlib import Path
-from app.core.batch import process_one
+from app.core.batch import process_many
+from app.core.ffmpeg_utils import CancelToken
+from app.core.scheduler import ExtractionScheduler
 
 # ------------------ Worker de procesamiento por lotes ------------------
 class BatchWorker(QObject):
@@ -9,46 +11,54 @@ class BatchWorker(QObject):
     progress = Signal(int, int, str)   # (hechos, total, mensaje)
     finished = Signal(dict)           # estadísticas finales
 
-    def __init__(self, folder: Path, selected_tracks: dict):
+    def __init__(self, folder: Path, selected_tracks: dict, probes: dict | None = None):
         """
         folder: carpeta base de salida
         selected_tracks: {video_path: [track_index, ...]}
+        probes: {video_path: ProbeResult} análisis previos de ProbeWorker (opcional)
         """
         super().__init__()
         self.folder = folder
         self.selected_tracks = selected_tracks
+        self.probes = probes or {}
         self._stop = False  # 🔹 bandera de cancelación
+        self._cancel = CancelToken()  # 🔹 mata los ffmpeg en curso al parar
 
     def stop(self):
-        """Solicita detener el procesamiento."""
+        """Solicita detener el procesamiento y cancela las extracciones en curso."""
         self._stop = True
+        self._cancel.cancel()
 
     # ------------------ Ejecución del procesamiento ------------------
     def run(self):
         """
-        Procesa cada pista seleccionada de cada video.
+        Procesa las pistas seleccionadas agrupadas por video: todas las pistas de un
+        mismo archivo se extraen con una sola pasada de ffmpeg, y varios videos se
+        procesan en paralelo según los límites de ExtractionScheduler.
         Evita sobrescribir archivos cuando hay varias pistas con el mismo idioma
         añadiendo el índice de pista al nombre de salida.
         """
         total = sum(len(tracks) for tracks in self.selected_tracks.values())
-        done = 0
         stats = {"ok": 0, "skip": 0, "error": 0, "total": total}
+        done = 0
 
-        for video, track_indexes in self.selected_tracks.items():
-            for idx in track_indexes:
-                # 🔹 Comprobación de cancelación
-                if self._stop:
-                    self.finished.emit(stats)
-                    return
+        def work(video, track_indexes):
+            # 🔹 Una sola llamada por video con sufijo único por pista
+            return process_many(
+                video,
+                self.folder,
+                sel_indexes=track_indexes,
+                suffix_fmt="_track{index}",  # evita sobrescrituras
+                probe=self.probes.get(video),  # reutiliza el análisis si el archivo no cambió
+                cancel=self._cancel
+            )
 
-                # 🔹 Llamada a process_one con sufijo único
-                ok, msg, outp = process_one(
-                    video,
-                    self.folder,
-                    sel_index=idx,
-                    suffix=f"_track{idx}"  # evita sobrescrituras
-                )
+        def on_done(video, track_indexes, results, error):
+            nonlocal done
+            if error is not None:
+                results = [(idx, False, f"Error procesando {video.name}: {error}", None) for idx in track_indexes]
 
+            for idx, ok, msg, outp in results:
                 done += 1
                 if ok:
                     stats["ok"] += 1
@@ -60,5 +70,12 @@ class BatchWorker(QObject):
                 # Emitir progreso
                 self.progress.emit(done, total, f"{video.name} | {msg}")
 
+        ExtractionScheduler().run(
+            list(self.selected_tracks.items()),
+            work,
+            on_done,
+            should_stop=lambda: self._stop  # 🔹 comprobación de cancelación
+        )
+
         # Emitir estadísticas finales
         self.finished.emit(stats)
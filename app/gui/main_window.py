@@ -13,6 +13,11 @@ from PySide6.QtGui import QDesktopServices
 from PySide6.QtCore import QUrl
 import atexit
 from app.services.style_manager import resource_path
+from app.services.logging_config import get_logger, is_verbose, set_verbose
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
 class MainWindow(QMainWindow):
     language_changed = Signal()
 
@@ -123,6 +128,12 @@ class MainWindow(QMainWindow):
         act_dark.triggered.connect(lambda: set_theme(self._app(), "dark"))
         act_light.triggered.connect(lambda: set_theme(self._app(), "light"))
 
+        # Registro detallado (solo para diagnosticar; ralentiza archivos grandes)
+        act_verbose = menu_config.addAction(self.t("verbose_logging"))
+        act_verbose.setCheckable(True)
+        act_verbose.setChecked(is_verbose())
+        act_verbose.toggled.connect(self._toggle_verbose_logging)
+
         # Menú de ayuda (al final)
         menu_help = self.menuBar().addMenu(self.t("help"))
         act_manual = menu_help.addAction(self.t("manual"))
@@ -131,6 +142,12 @@ class MainWindow(QMainWindow):
         act_ffmpeg = menu_help.addAction("Descargar FFmpeg")
         act_ffmpeg.triggered.connect(lambda: self._abrir_ffmpeg_web())
 
+    def _toggle_verbose_logging(self, enabled: bool):
+        set_verbose(enabled)
+        S = get_settings()
+        S.config["verbose_logging"] = enabled
+        save_config(S.config)
+
     def _abrir_ffmpeg_web(self):
         import webbrowser
         webbrowser.open("https://ffmpeg.org/download.html")
@@ -181,14 +198,14 @@ class MainWindow(QMainWindow):
         try:
             self.menuBar().setEnabled(False)
         except Exception as e:
-            print(f"[WARN] Error deshabilitando menú: {e}")
+            log.warning(f"Error deshabilitando menú: {e}")
 
     def _on_processing_finished(self):
         """Maneja el fin de procesamiento de manera segura"""
         try:
             self.menuBar().setEnabled(True)
         except Exception as e:
-            print(f"[WARN] Error habilitando menú: {e}")
+            log.warning(f"Error habilitando menú: {e}")
 
     def closeEvent(self, event):
         """Maneja el cierre de la ventana de manera segura"""
@@ -198,5 +215,5 @@ class MainWindow(QMainWindow):
                 self.translation_controller.cleanup_on_shutdown()
             event.accept()
         except Exception as e:
-            print(f"[MAIN] Error en closeEvent: {e}")
+            log.error(f"Error en closeEvent: {e}")
             event.accept()
\ No newline at end of file
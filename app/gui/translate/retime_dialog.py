@@ -0,0 +1,207 @@
+# app\gui\translate\retime_dialog.py
+import time
+from pathlib import Path
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QWidget, QLabel, QLineEdit,
+    QComboBox, QCheckBox, QPushButton, QProgressBar, QStackedWidget, QMessageBox
+)
+from PySide6.QtCore import QObject, QThread, Signal
+from app.core.timefix import TimeTransform, parse_offset, retime_files
+from app.services.i18n import get_translator
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+RETIMED_FOLDER = "Subtitles_retimed"  # junto a cada archivo, como Subtitles_<idioma> al traducir
+FPS_CHOICES = ["23.976", "24", "25", "29.97", "30"]
+
+
+# ------------------ Worker de ajuste de tiempos ------------------
+class RetimeWorker(QObject):
+    progress = Signal(int, int, str)  # (hechos, total, archivo)
+    finished = Signal(dict)           # {"ok", "error", "total", "canceled"}
+
+    PROGRESS_INTERVAL = 0.05  # s entre señales: con miles de archivos no se satura la UI
+
+    def __init__(self, jobs: list, transform: TimeTransform):
+        """jobs: pares (entrada, salida); salida None = sobrescribir."""
+        super().__init__()
+        self.jobs = jobs
+        self.transform = transform
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        stats = {"ok": 0, "error": 0, "total": len(self.jobs), "canceled": False}
+        last = 0.0
+        for done, result in enumerate(retime_files(self.jobs, self.transform), 1):
+            stats["error" if "error" in result else "ok"] += 1
+            now = time.perf_counter()
+            if now - last >= self.PROGRESS_INTERVAL or done == stats["total"]:
+                last = now
+                self.progress.emit(done, stats["total"], Path(result["path"]).name)
+            if self._stop:
+                stats["canceled"] = True
+                break
+        self.finished.emit(stats)
+
+
+# ------------------ Diálogo ------------------
+class RetimeDialog(QDialog):
+    """
+    Desplazamiento, cambio de fps o resincronización por dos puntos de los
+    subtítulos de la lista (app.core.timefix, el mismo motor que `python -m app retime`).
+    """
+
+    def __init__(self, paths: list, parent=None):
+        super().__init__(parent)
+        self.t = get_translator()
+        self.paths = [Path(p) for p in paths]
+        self.thread = None
+        self.worker = None
+        self.setWindowTitle(self.t("retime_subtitles"))
+        self.setMinimumWidth(460)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        main = QVBoxLayout(self)
+
+        self.lbl_files = QLabel(self.t("retime_files").format(count=len(self.paths)))
+        main.addWidget(self.lbl_files)
+
+        form = QFormLayout()
+        self.cmb_mode = QComboBox()
+        self.cmb_mode.addItems([self.t("retime_shift"), self.t("retime_fps"), self.t("retime_sync")])
+        form.addRow(self.t("retime_mode"), self.cmb_mode)
+        main.addLayout(form)
+
+        # --- Una página de parámetros por operación ---
+        self.pages = QStackedWidget()
+
+        page = QWidget()
+        lay = QFormLayout(page)
+        self.ed_offset = QLineEdit()
+        self.ed_offset.setPlaceholderText("-1500, +2.5s, -00:00:01,200")
+        lay.addRow(self.t("retime_offset"), self.ed_offset)
+        self.pages.addWidget(page)
+
+        page = QWidget()
+        lay = QFormLayout(page)
+        self.cmb_fps_from = QComboBox()
+        self.cmb_fps_to = QComboBox()
+        for cmb, default in ((self.cmb_fps_from, "23.976"), (self.cmb_fps_to, "25")):
+            cmb.setEditable(True)
+            cmb.addItems(FPS_CHOICES)
+            cmb.setCurrentText(default)
+        lay.addRow(self.t("retime_fps_from"), self.cmb_fps_from)
+        lay.addRow(self.t("retime_fps_to"), self.cmb_fps_to)
+        self.pages.addWidget(page)
+
+        page = QWidget()
+        lay = QFormLayout(page)
+        self.sync_edits = []
+        for n in (1, 2):
+            row = QHBoxLayout()
+            before, after = QLineEdit(), QLineEdit()
+            before.setPlaceholderText("00:01:02,000")
+            after.setPlaceholderText("00:01:03,500")
+            row.addWidget(before)
+            row.addWidget(QLabel("→"))
+            row.addWidget(after)
+            lay.addRow(self.t("retime_point").format(n=n), row)
+            self.sync_edits.append((before, after))
+        self.pages.addWidget(page)
+
+        main.addWidget(self.pages)
+        self.cmb_mode.currentIndexChanged.connect(self.pages.setCurrentIndex)
+
+        self.chk_in_place = QCheckBox(self.t("retime_in_place").format(folder=RETIMED_FOLDER))
+        main.addWidget(self.chk_in_place)
+
+        self.progress = QProgressBar()
+        self.progress.setValue(0)
+        self.lbl_status = QLabel("")
+        main.addWidget(self.progress)
+        main.addWidget(self.lbl_status)
+
+        btns = QHBoxLayout()
+        self.btn_start = QPushButton(self.t("start"))
+        self.btn_start.setObjectName("PrimaryButton")
+        self.btn_close = QPushButton(self.t("cancel"))
+        btns.addStretch()
+        btns.addWidget(self.btn_start)
+        btns.addWidget(self.btn_close)
+        main.addLayout(btns)
+
+        self.btn_start.clicked.connect(self._start)
+        self.btn_close.clicked.connect(self._close_or_stop)
+
+    # --- parámetros ---
+    def _transform(self) -> TimeTransform:
+        mode = self.cmb_mode.currentIndex()
+        if mode == 0:
+            return TimeTransform.shift(parse_offset(self.ed_offset.text()))
+        if mode == 1:
+            return TimeTransform.fps(self.cmb_fps_from.currentText(), self.cmb_fps_to.currentText())
+        (a1, b1), (a2, b2) = [(parse_offset(a.text()), parse_offset(b.text())) for a, b in self.sync_edits]
+        return TimeTransform.two_point(a1, b1, a2, b2)
+
+    def _jobs(self) -> list:
+        if self.chk_in_place.isChecked():
+            return [(p, None) for p in self.paths]
+        return [(p, p.parent / RETIMED_FOLDER / p.name) for p in self.paths]
+
+    # --- ejecución ---
+    def _start(self):
+        try:
+            transform = self._transform()
+        except (ValueError, ZeroDivisionError) as e:
+            QMessageBox.warning(self, self.t("retime_subtitles"), self.t("retime_invalid").format(error=e))
+            return
+
+        log.info(f"GUI: ajustando tiempos de {len(self.paths)} archivos ({transform.describe()})")
+        self._set_busy(True)
+        self.thread = QThread()
+        self.worker = RetimeWorker(self._jobs(), transform)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self._on_progress)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.thread.start()
+
+    def _on_progress(self, done: int, total: int, name: str):
+        self.progress.setValue(int(done * 100 / total) if total else 100)
+        self.lbl_status.setText(f"{done}/{total}: {name}")
+
+    def _on_finished(self, stats: dict):
+        self.worker = None  # el hilo se borra solo (deleteLater) al terminar
+        self._set_busy(False)
+        if stats["canceled"]:
+            self.lbl_status.setText(self.t("retime_canceled"))
+        else:
+            self.progress.setValue(100)
+            self.lbl_status.setText(self.t("retime_done").format(ok=stats["ok"], failed=stats["error"]))
+        self.btn_close.setText(self.t("close"))
+
+    def _set_busy(self, busy: bool):
+        for w in (self.cmb_mode, self.pages, self.chk_in_place, self.btn_start):
+            w.setEnabled(not busy)
+
+    def _close_or_stop(self):
+        if self.worker is not None:
+            self.worker.stop()
+        else:
+            self.reject()
+
+    def reject(self):
+        # Esc o la X durante el proceso: detener en vez de cerrar con el hilo vivo
+        if self.worker is not None:
+            self.worker.stop()
+            return
+        super().reject()
@@ -3,8 +3,13 @@ from PySide6.QtCore import QObject, QTimer, QThread, Signal
 from shiboken6 import isValid
 from .translation_worker import TranslationWorker
 from app.core import subtitles
-from app.core.timefix import compare_and_fix_times
-from pathlib import Path
+from app.core.translate_pipeline import file_concurrency
+from app.services.logging_config import get_logger, is_verbose
+from app.services.instrumentation import span, signal_received, write_report
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
 
 class TranslationController(QObject):
     # Señales
@@ -42,20 +47,32 @@ class TranslationController(QObject):
         self.is_processing = False
         self.cancel_flag = threading.Event()
         self._engine = "google_free"
+        # Vista previa: sigue al archivo con foco; entradas y líneas ya traducidas por archivo
+        self._entries = {}
+        self._translated_lines = {}
+        self._preview_path = None
+        self.widget.preview_file_changed.connect(self._on_preview_file_changed)
 
         # Timer de limpieza
         self.cleanup_timer = QTimer()
         self.cleanup_timer.setInterval(2000)
         self.cleanup_timer.timeout.connect(self._cleanup_finished_threads)
 
-    def start_translations(self, files, src_lang, tgt_lang, engine, max_concurrency=1):
-        """Inicia la traducción de múltiples archivos"""
+    def start_translations(self, files, src_lang, tgt_lang, engine, max_concurrency=None):
+        """
+        Inicia la traducción de múltiples archivos.
+        max_concurrency: archivos simultáneos; por defecto, el presupuesto del motor.
+        """
         if self.is_processing:
-            print("[CONTROLLER] Ya hay un proceso en ejecución")
+            log.warning("Ya hay un proceso en ejecución")
             return
 
         self._queue = list(files)
-        self._max = 1  # serial por archivo, como pediste
+        budget = file_concurrency(engine)
+        self._max = min(budget, max_concurrency) if max_concurrency else budget
+        self._entries = {}
+        self._translated_lines = {}
+        self._preview_path = None
         self.src_lang = src_lang
         self.tgt_lang = tgt_lang
         self._engine = engine  # ✅ guardar motor
@@ -63,56 +80,54 @@ class TranslationController(QObject):
         self.is_processing = True
         self.active = 0
 
-        print(f"[CONTROLLER] Iniciando traducción de {len(files)} archivos")
+        log.info(f"Iniciando traducción de {len(files)} archivos, {self._max} simultáneos ({engine})")
         self.processing_started.emit()
         self.cleanup_timer.start()
         self._start_next()
 
     def _start_next(self):
-        """Inicia el siguiente archivo en la cola y prepara la vista previa."""
-        if not self._queue or self.active >= self._max:
-            return
-
-        file_path = self._queue.pop(0)
-
-        # Cargar preview del archivo en la UI (lado izquierdo) con DEBUG COMPLETO
+        """Lanza archivos de la cola hasta llenar el presupuesto de concurrencia."""
+        while self._queue and self.active < self._max:
+            self._start_file(self._queue.pop(0))
+
+    def _start_file(self, file_path):
+        """Inicia la traducción de un archivo en su propio hilo."""
+        # Cargar una sola vez: la misma lista sirve para la vista previa y para el worker
+        entries = None
         try:
-            print(f"[CONTROLLER] === DEBUG CARGA DE ARCHIVO ===")
-            print(f"[CONTROLLER] Cargando archivo: {file_path}")
-
             entries = subtitles.load_srt(file_path)
 
-            print(f"[CONTROLLER] Entradas cargadas: {len(entries)}")
-
-            # DEBUG: Verificar las primeras 3 entradas
-            for i, entry in enumerate(entries[:3]):
-                print(f"[CONTROLLER] Entry {i + 1}:")
-                print(f"[CONTROLLER]   ID: {entry.id}")
-                print(f"[CONTROLLER]   Start: {entry.start}")
-                print(f"[CONTROLLER]   End: {entry.end}")
-                print(f"[CONTROLLER]   Original: '{entry.original}'")
-                print(f"[CONTROLLER]   Num líneas: {entry.original.count(chr(10)) + 1}")
-                print(f"[CONTROLLER]   Contiene \\n: {'SI' if chr(10) in entry.original else 'NO'}")
+            if is_verbose():
+                for entry in entries[:3]:
+                    log.debug(f"Entrada {entry.id}: {entry.start}-{entry.end} {entry.original!r}")
 
             if entries:
-                self.widget.load_file_preview(entries)
+                self._entries[file_path] = entries
+                self._translated_lines[file_path] = {}
             else:
-                print(f"[CONTROLLER] Archivo vacío o inválido para preview: {file_path}")
+                log.warning(f"Archivo vacío o inválido para preview: {file_path}")
+                entries = None
 
         except Exception as e:
-            print(f"[CONTROLLER] Error cargando preview: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"Error cargando preview de {file_path}: {e}")
+
+        # La vista previa muestra el primer archivo lanzado hasta que el usuario elija otro
+        if self._preview_path is None and entries:
+            self._show_preview(file_path)
 
         # Crear hilo y worker con parámetros correctos
         thread = QThread()
-        worker = TranslationWorker(file_path, self.src_lang, self.tgt_lang, self.cancel_flag, self._engine)
+        worker = TranslationWorker(
+            file_path, self.src_lang, self.tgt_lang, self.cancel_flag, self._engine, entries=entries
+        )
         worker.moveToThread(thread)
 
         # Conectar señales
         worker.progress.connect(lambda v, path=file_path: self._on_worker_progress(path, v))
-        worker.line_translated.connect(self.widget.on_line_translated)  # << NUEVO
-        worker.finished.connect(lambda out_path: self._on_worker_finished(out_path))
+        worker.line_translated.connect(
+            lambda i, orig, tr, path=file_path: self._on_line_translated(path, i, orig, tr)
+        )
+        worker.finished.connect(lambda out_path, path=file_path: self._on_worker_finished(path, out_path))
         worker.error.connect(lambda msg, path=file_path: self._on_worker_error(path, msg))
         thread.started.connect(worker.run)
 
@@ -127,7 +142,7 @@ class TranslationController(QObject):
         self.threads.append(thread)
         self.workers.append(worker)
         self.active += 1
-        print(f"[CONTROLLER] Iniciado worker para: {file_path}, activos: {self.active}")
+        log.debug(f"Iniciado worker para: {file_path}, activos: {self.active}")
         thread.start()
 
     def _remove_thread(self, thread):
@@ -138,7 +153,7 @@ class TranslationController(QObject):
             if isValid(thread):
                 thread.deleteLater()
         except Exception as e:
-            print(f"[CONTROLLER] Error removiendo thread: {e}")
+            log.warning(f"Error removiendo thread: {e}")
 
     def _cleanup_finished_threads(self):
         """Limpia hilos terminados de forma segura"""
@@ -156,24 +171,48 @@ class TranslationController(QObject):
                         pass
             self.threads = active_threads
         except Exception as e:
-            print(f"[CONTROLLER] Error en cleanup threads: {e}")
-
-    def _on_worker_finished(self, out_path):
-        # Limpiar vista de preview para el próximo archivo
-        self.widget.clear_preview()
-        print(f"[CONTROLLER] Archivo terminado: {out_path}")
-
-        try:
-            # 🔹 Buscar el original correspondiente
-            orig_path = self._find_original_for(out_path)
-            if orig_path:
-                # Sobrescribir directamente el archivo traducido con tiempos corregidos
-                compare_and_fix_times(orig_path, out_path, out_path)
-                print(f"[CONTROLLER] Tiempos corregidos en: {out_path}")
-        except Exception as e:
-            print(f"[WARN] No se pudo corregir tiempos: {e}")
+            log.warning(f"Error en cleanup threads: {e}")
 
-        # Emitir señal normal con el archivo corregido
+    # ------------------ Vista previa ------------------
+    def _show_preview(self, file_path):
+        """Muestra en la vista previa un archivo en curso, con lo ya traducido."""
+        entries = self._entries.get(file_path)
+        if not entries:
+            return
+        self._preview_path = file_path
+        self.widget.load_file_preview(entries)
+        for i, (orig, tr) in sorted(self._translated_lines.get(file_path, {}).items()):
+            self.widget.on_line_translated(i, orig, tr)
+
+    def _on_preview_file_changed(self, file_path):
+        """El usuario enfocó otro archivo: seguirlo si se está traduciendo."""
+        if self.is_processing and file_path != self._preview_path and file_path in self._entries:
+            self._show_preview(file_path)
+
+    def _on_line_translated(self, file_path, index, original, translated):
+        signal_received("ui.signal.line_translated", ("line_translated", file_path))
+        lines = self._translated_lines.get(file_path)
+        if lines is not None:
+            lines[index] = (original, translated)
+        if file_path == self._preview_path:
+            with span("ui.preview"):
+                self.widget.on_line_translated(index, original, translated)
+
+    def _release_file(self, file_path):
+        """Olvida los datos de vista previa de un archivo terminado y pasa el foco a otro activo."""
+        self._entries.pop(file_path, None)
+        self._translated_lines.pop(file_path, None)
+        if file_path == self._preview_path:
+            self._preview_path = None
+            self.widget.clear_preview()
+            if self._entries:
+                self._show_preview(next(iter(self._entries)))
+
+    def _on_worker_finished(self, file_path, out_path):
+        self._release_file(file_path)
+        log.info(f"Archivo terminado: {out_path}")
+
+        # El worker ya guardó el archivo con los tiempos del original
         self.file_finished.emit(out_path)
         self.active -= 1
 
@@ -182,22 +221,9 @@ class TranslationController(QObject):
         else:
             self._start_next()
 
-    def _find_original_for(self, out_path: str) -> str | None:
-        """
-        Dado un archivo traducido, intenta encontrar el original correspondiente.
-        Ejemplo: 'video_es.srt' -> busca 'video.srt'
-        """
-        p = Path(out_path)
-        stem = p.stem
-        if "_" in stem:
-            base = stem.rsplit("_", 1)[0]  # quita sufijo de idioma
-            candidate = p.parent.parent / f"{base}{p.suffix}"
-            if candidate.exists():
-                return str(candidate)
-        return None
-
     def _on_worker_error(self, file_path, error_msg):
-        print(f"[CONTROLLER] Error en {file_path}: {error_msg}")
+        log.error(f"Error en {file_path}: {error_msg}")
+        self._release_file(file_path)
         self.file_error.emit(file_path, error_msg)
         self.active -= 1
         if not self._queue and self.active == 0:
@@ -217,10 +243,14 @@ class TranslationController(QObject):
             pass
 
         self.is_processing = False
+        self._entries = {}
+        self._translated_lines = {}
+        self._preview_path = None
+        write_report("translate")  # solo si la instrumentación está activa
         self.processing_finished.emit()
         self.all_result.emit(canceled)  # ✅ True si cancelado, False si completado
         self.all_finished.emit()
-        print("[CONTROLLER] Todas las traducciones finalizadas" + (" (canceladas)" if canceled else ""))
+        log.info("Todas las traducciones finalizadas" + (" (canceladas)" if canceled else ""))
 
     def cleanup_on_shutdown(self):
         """Apaga de forma segura todos los hilos y limpia recursos"""
@@ -234,7 +264,7 @@ class TranslationController(QObject):
                         th.quit()
                         th.wait(2000)
                 except Exception as e:
-                    print(f"[WARN] Error terminando hilo en shutdown: {e}")
+                    log.warning(f"Error terminando hilo en shutdown: {e}")
                 finally:
                     try:
                         if isValid(th):
@@ -254,17 +284,17 @@ class TranslationController(QObject):
             self.active = 0
             self._queue = []
 
-            print("[CONTROLLER] Cleanup on shutdown completado")
+            log.debug("Cleanup on shutdown completado")
         except Exception as e:
-            print(f"[CONTROLLER] Cleanup on shutdown error: {e}")
+            log.warning(f"Cleanup on shutdown error: {e}")
 
     def cancel_all(self):
         """Cancela todas las traducciones de manera segura"""
         if not self.is_processing:
-            print("[CONTROLLER] No hay proceso activo para cancelar")
+            log.debug("No hay proceso activo para cancelar")
             return
 
-        print("[CONTROLLER] Iniciando cancelación...")
+        log.info("Iniciando cancelación...")
         self.cancel_flag.set()
 
         if self.cleanup_timer.isActive():
@@ -276,7 +306,7 @@ class TranslationController(QObject):
                     th.quit()
                     th.wait(2000)
             except Exception as e:
-                print(f"[WARN] Error terminando hilo: {e}")
+                log.warning(f"Error terminando hilo: {e}")
             finally:
                 try:
                     if isValid(th):
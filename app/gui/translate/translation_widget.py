@@ -10,11 +10,30 @@ from PySide6.QtGui import QIcon
 from app.services.i18n import get_translator
 import os
 from pathlib import Path
-from langdetect import detect, DetectorFactory
-DetectorFactory.seed = 0  # resultados consistentes
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+# ------------------ Detección de idioma (carga diferida) ------------------
+_detect = None
+
+def _get_detect():
+    """
+    Importa langdetect la primera vez que se detecta un idioma, no al abrir la app.
+    (El primer detect() carga además los perfiles de idioma.)
+    """
+    global _detect
+    if _detect is None:
+        from langdetect import detect, DetectorFactory
+        DetectorFactory.seed = 0  # resultados consistentes
+        _detect = detect
+    return _detect
+
 class TranslationWidget(QWidget):
     request_translation = Signal(list, str, str, str)  # paths, src, dst, engine
     cancel_translation = Signal()
+    preview_file_changed = Signal(str)  # ruta del archivo con foco en la tabla
 
     processing_started = Signal()
     processing_finished = Signal()
@@ -184,8 +203,10 @@ class TranslationWidget(QWidget):
         self.btn_cancel = QPushButton(QIcon(str(self.icon_path / "cancel-t.svg")),self.t("cancel"));
         self.btn_cancel.setObjectName("DangerButton")
         self.btn_cancel.setEnabled(False)
+        self.btn_retime = QPushButton(self.t("retime_subtitles"))
 
         btns.addWidget(self.btn_add)
+        btns.addWidget(self.btn_retime)
         btns.addStretch()
         btns.addWidget(self.btn_translate)
         btns.addWidget(self.btn_cancel)
@@ -193,8 +214,15 @@ class TranslationWidget(QWidget):
 
     def _wire(self):
         self.btn_add.clicked.connect(self._select_files)
+        self.btn_retime.clicked.connect(self._retime)
         self.btn_translate.clicked.connect(self._start_all)
         self.btn_cancel.clicked.connect(self.cancel_translation.emit)
+        self.table.currentCellChanged.connect(self._on_current_row_changed)
+
+    def _on_current_row_changed(self, row, _col, _prev_row, _prev_col):
+        """La vista previa sigue al archivo con foco durante la traducción."""
+        if 0 <= row < len(self._files):
+            self.preview_file_changed.emit(self._files[row]["path"])
 
     # --- DnD ---
     def _drag_enter(self, e):
@@ -290,7 +318,7 @@ class TranslationWidget(QWidget):
         try:
             with open(path, "r", encoding="utf-8", errors="ignore") as f:
                 sample = f.read(2000)  # leer un fragmento
-            return detect(sample)
+            return _get_detect()(sample)
         except Exception:
             return "auto"
 
@@ -305,6 +333,8 @@ class TranslationWidget(QWidget):
         menu.addSeparator()
         a_tr_sel = menu.addAction("Traducir seleccionado")
         a_tr_all = menu.addAction("Traducir todos")
+        menu.addSeparator()
+        a_retime = menu.addAction(self.t("retime_subtitles"))
         act = menu.exec(self.table.mapToGlobal(pos))
         if act == a_add:
             self._select_files()
@@ -320,6 +350,8 @@ class TranslationWidget(QWidget):
             self._start_selected()
         elif act == a_tr_all:
             self._start_all()
+        elif act == a_retime:
+            self._retime()
 
     def _remove_selected(self):
         rows = sorted({i.row() for i in self.table.selectedIndexes()}, reverse=True)
@@ -358,6 +390,19 @@ class TranslationWidget(QWidget):
         self.processing_started.emit()
         self.request_translation.emit(paths, src, dst, engine)
 
+    # --- ajuste de tiempos ---
+    def _retime(self):
+        """Abre el diálogo de ajuste de tiempos con los archivos seleccionados (o todos)."""
+        from app.gui.translate.retime_dialog import RetimeDialog
+
+        idxs = sorted({i.row() for i in self.table.selectedIndexes()})
+        paths = [self._files[i]["path"] for i in idxs if 0 <= i < len(self._files)]
+        paths = paths or [row["path"] for row in self._files]
+        if not paths:
+            self.lbl_status.setText(self.t("retime_no_files"))
+            return
+        RetimeDialog(paths, self).exec()
+
     # --- hooks desde controller ---
     def on_file_progress(self, path, value):
         for r, row in enumerate(self._files):
@@ -394,7 +439,7 @@ class TranslationWidget(QWidget):
                 break
 
     def on_all_finished(self, canceled=False):
-        print(f"[WIDGET] on_all_finished recibido, canceled={canceled}")
+        log.debug(f"on_all_finished recibido, canceled={canceled}")
         try:
             self._set_busy(False)
             self.btn_cancel.setEnabled(False)
@@ -418,10 +463,10 @@ class TranslationWidget(QWidget):
                 self.lbl_status.setText(self.t("processing_completed"))
                 self.progress.setValue(100)  # Asegurar 100% en completado
         except Exception as e:
-            print(f"[ERROR] Error en on_all_finished: {e}")
+            log.error(f"Error en on_all_finished: {e}")
 
     def _set_busy(self, busy: bool):
-        for w in (self.btn_add, self.btn_translate, self.cmb_source, self.cmb_target, self.cmb_engine):
+        for w in (self.btn_add, self.btn_retime, self.btn_translate, self.cmb_source, self.cmb_target, self.cmb_engine):
             w.setEnabled(not busy)
         # 🔹 Deshabilitar menú contextual de la tabla
         if busy:
@@ -479,6 +524,7 @@ class TranslationWidget(QWidget):
 
         # Botones y labels
         self.btn_add.setText(self.t("add_subtitles"))
+        self.btn_retime.setText(self.t("retime_subtitles"))
         self.btn_translate.setText(self.t("start"))
         self.btn_cancel.setText(self.t("cancel"))
         self.lbl_status.setText(self.t("ready_to_start"))
@@ -489,7 +535,7 @@ class TranslationWidget(QWidget):
         self.table_original.setRowCount(count)
         self.table_translated.setRowCount(count)
 
-        print(f"[WIDGET] Cargando preview: {count} entradas")
+        log.debug(f"Cargando preview: {count} entradas")
 
         for i, entry in enumerate(entries):
             # CRÍTICO: No alterar la estructura del texto original
@@ -506,11 +552,6 @@ class TranslationWidget(QWidget):
             self.table_translated.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             self.table_translated.setItem(i, 1, QTableWidgetItem(""))
 
-            # Debug para primeras 3 entradas
-            if i < 3:
-                print(f"[WIDGET] Preview {i + 1}: '{original_text[:50]}...'")
-                print(f"[WIDGET] Líneas en texto: {original_text.count(chr(10)) + 1}")
-
         # Reaplizar modos de header sin alterar contenido
         header_orig = self.table_original.horizontalHeader()
         header_orig.setSectionResizeMode(0, QHeaderView.Fixed)
@@ -535,11 +576,6 @@ class TranslationWidget(QWidget):
 
             self.table_translated.setItem(index, 1, QTableWidgetItem(display_translated))
 
-            # Debug para primeras 3
-            if index < 3:
-                print(f"[WIDGET] Traducción {index}: '{translated[:50]}...'")
-                print(f"[WIDGET] Líneas en traducción: {translated.count(chr(10)) + 1}")
-
         except Exception as e:
-            print(f"[WIDGET] Error actualizando línea {index}: {e}")
+            log.warning(f"Error actualizando línea {index}: {e}")
 
@@ -0,0 +1,262 @@
+# app\services\instrumentation.py
+"""
+Instrumentación opcional de los caminos calientes.
+
+    with span("io.load_srt") as s:
+        ...
+        s.bytes = len(data)
+
+Cada span se agrega por nombre (cuenta, total, p50/p95/p99, bytes) y
+write_report() escribe el informe de la ejecución en JSON junto a log.txt.
+El prefijo del nombre es la categoría ("http", "ffmpeg", "io", "cache",
+"cpu", "ui") y permite ver si una ejecución lenta espera a la red, a la CPU
+o a la interfaz. Con "instrumentation_trace" se exporta además una traza en
+formato Chrome trace-event (chrome://tracing o https://ui.perfetto.dev).
+
+Desactivada (por defecto, "instrumentation" en config.json) span() devuelve
+un objeto vacío compartido: el coste es una comprobación y una llamada.
+"""
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from app.services.settings import get_install_dir, get_settings
+from app.services.logging_config import get_logger
+
+# ------------------ Logger ------------------
+log = get_logger(__name__)
+
+MAX_TRACE_EVENTS = 200_000  # tope de eventos guardados para la traza (memoria acotada)
+
+# ------------------ Estado ------------------
+_lock = threading.Lock()
+_enabled = False
+_trace = False
+_run_started = time.time()
+_t0 = time.perf_counter()
+_durations: Dict[str, array] = {}   # nombre -> duraciones en segundos
+_bytes: Dict[str, int] = {}
+_events: list = []                  # (nombre, inicio, duración, hilo, asíncrono, args)
+_dropped_events = 0
+_pending_signals: Dict[object, deque] = {}
+_thread_names: Dict[int, str] = {}
+
+
+def _load() -> None:
+    global _enabled, _trace
+    cfg = get_settings().config
+    _enabled = bool(cfg.get("instrumentation", False))
+    _trace = _enabled and bool(cfg.get("instrumentation_trace", False))
+
+_load()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(trace: bool = False) -> None:
+    """Activa la instrumentación en este proceso (p. ej. desde la CLI con --profile)."""
+    global _enabled, _trace
+    _enabled = True
+    _trace = _trace or bool(trace)
+
+# ------------------ Registro ------------------
+def _record(name: str, start: float, duration: float, nbytes: int = 0, args: Optional[dict] = None) -> None:
+    global _dropped_events
+    tid = threading.get_ident()
+    with _lock:
+        samples = _durations.get(name)
+        if samples is None:
+            samples = _durations[name] = array('d')
+        samples.append(duration)
+        if nbytes:
+            _bytes[name] = _bytes.get(name, 0) + nbytes
+        if _trace:
+            if len(_events) < MAX_TRACE_EVENTS:
+                if tid not in _thread_names:
+                    _thread_names[tid] = threading.current_thread().name
+                # Dentro del bucle asyncio varios spans se solapan en el mismo hilo
+                is_async = asyncio._get_running_loop() is not None
+                _events.append((name, start, duration, tid, is_async, args))
+            else:
+                _dropped_events += 1
+
+
+class _Span:
+    """Temporizador de un tramo; `bytes` se puede fijar dentro del with."""
+    __slots__ = ("name", "args", "bytes", "_start")
+
+    def __init__(self, name: str, args: Optional[dict]):
+        self.name = name
+        self.args = args
+        self.bytes = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        _record(self.name, self._start, duration, self.bytes, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+    bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # s.bytes = n no hace nada si está desactivada
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """Context manager que mide un tramo con nombre "categoría.detalle"."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+# ------------------ Entrega de señales Qt ------------------
+def signal_sent(channel) -> None:
+    """Anota la emisión de una señal encolada (llamar justo antes de emit)."""
+    if _enabled:
+        with _lock:
+            _pending_signals.setdefault(channel, deque()).append(time.perf_counter())
+
+
+def signal_received(name: str, channel) -> None:
+    """
+    Anota la llegada al slot de la señal más antigua pendiente del canal:
+    el span va de la emisión en el worker a la ejecución en el hilo de la UI.
+    Las señales de un mismo emisor llegan en orden, así que basta una cola FIFO.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        pending = _pending_signals.get(channel)
+        sent = pending.popleft() if pending else None
+        if pending is not None and not pending:
+            del _pending_signals[channel]
+    if sent is not None:
+        _record(name, sent, time.perf_counter() - sent)
+
+# ------------------ Informe ------------------
+def _percentile(sorted_values, q: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summary() -> dict:
+    """Agregados por span y por categoría desde el último informe."""
+    with _lock:
+        data = {name: sorted(values) for name, values in _durations.items()}
+        nbytes = dict(_bytes)
+    spans = {}
+    categories: Dict[str, dict] = {}
+    for name, values in sorted(data.items()):
+        total = sum(values)
+        spans[name] = {
+            "count": len(values),
+            "total_ms": round(total * 1000, 3),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3),
+            "bytes": nbytes.get(name, 0),
+        }
+        category = categories.setdefault(name.split(".", 1)[0], {"count": 0, "total_ms": 0.0})
+        category["count"] += len(values)
+        category["total_ms"] = round(category["total_ms"] + total * 1000, 3)
+    return {"spans": spans, "categories": categories}
+
+
+def _trace_events() -> list:
+    """Convierte los eventos guardados a formato Chrome trace-event (tiempos en µs)."""
+    pid = os.getpid()
+    out = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in _thread_names.items()
+    ]
+    for seq, (name, start, duration, tid, is_async, args) in enumerate(_events):
+        ts = (start - _t0) * 1e6
+        cat = name.split(".", 1)[0]
+        if is_async:
+            base = {"name": name, "cat": cat, "pid": pid, "tid": tid, "id": seq}
+            out.append(dict(base, ph="b", ts=ts, args=args or {}))
+            out.append(dict(base, ph="e", ts=ts + duration * 1e6))
+        else:
+            out.append({
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": ts, "dur": duration * 1e6, "args": args or {},
+            })
+    return out
+
+
+def write_report(label: str = "run") -> Optional[Path]:
+    """
+    Escribe el informe de la ejecución (y la traza si está activa) junto a log.txt
+    y reinicia los agregados. Devuelve la ruta del informe, o None si no hay nada.
+    """
+    global _run_started, _dropped_events
+    if not _enabled:
+        return None
+    report = summary()
+    if not report["spans"]:
+        return None
+
+    with _lock:
+        events = _trace_events() if _trace else None
+        dropped = _dropped_events
+        started = _run_started
+        _durations.clear()
+        _bytes.clear()
+        _events.clear()
+        _pending_signals.clear()
+        _dropped_events = 0
+        _run_started = time.time()
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    out_dir = get_install_dir()
+    report_path = out_dir / f"profile_{label}_{stamp}.json"
+    report.update({
+        "label": label,
+        "started": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+        "wall_s": round(time.time() - started, 3),
+    })
+    try:
+        report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        if events is not None:
+            trace_path = out_dir / f"trace_{label}_{stamp}.json"
+            trace = {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": dropped}}
+            trace_path.write_text(json.dumps(trace), encoding="utf-8")
+            log.info(f"Traza guardada en: {trace_path}")
+    except OSError as e:
+        log.warning(f"No se pudo guardar el informe de instrumentación: {e}")
+        return None
+
+    busiest = sorted(report["categories"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    log.info(
+        f"Informe de instrumentación: {report_path} ("
+        + ", ".join(f"{cat} {data['total_ms'] / 1000:.2f}s" for cat, data in busiest) + ")"
+    )
+    return report_path
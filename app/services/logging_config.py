@@ -1,11 +1,79 @@
 # app\services\logging_config.py
+import sys
+import threading
 from loguru import logger
-from app.services.settings import get_install_dir
+from app.services.settings import get_install_dir, load_config
 
+# ------------------ Configuración ------------------
+LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <7} | {extra[context]} | {message}"
+
+_lock = threading.Lock()
+_handler_ids: list[int] = []
+_configured = False
+_verbose = False
+
+# ------------------ Sinks ------------------
+def _install_handlers() -> None:
+    """
+    (Re)instala los sinks de consola y archivo con el nivel actual.
+    El nivel se fija en el propio sink para que loguru descarte los
+    mensajes DEBUG antes de formatearlos cuando el modo detallado está apagado.
+    """
+    for handler_id in _handler_ids:
+        try:
+            logger.remove(handler_id)
+        except ValueError:
+            pass
+    _handler_ids.clear()
+
+    level = "DEBUG" if _verbose else "INFO"
+    # En el exe sin consola sys.stderr es None
+    if sys.stderr is not None:
+        _handler_ids.append(logger.add(sys.stderr, level=level, format=LOG_FORMAT, backtrace=False, diagnose=False))
+
+    log_file = get_install_dir() / "log.txt"
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    _handler_ids.append(logger.add(
+        str(log_file), level=level, format=LOG_FORMAT, rotation="1 week",
+        encoding="utf-8", backtrace=False, diagnose=False
+    ))
+
+
+def _configure() -> None:
+    global _configured, _verbose
+    with _lock:
+        if _configured:
+            return
+        # Quitar el sink por defecto de loguru (stderr en DEBUG)
+        logger.remove()
+        logger.configure(extra={"context": "app"})
+        _verbose = bool(load_config().get("verbose_logging", False))
+        _install_handlers()
+        _configured = True
+
+# ------------------ API pública ------------------
 def get_logger(name: str):
-    base = get_install_dir()
-    log_file = base / "log.txt"
-    if not any(h._sink == str(log_file) for h in logger._core.handlers.values()):
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        logger.add(str(log_file), rotation="1 week", encoding="utf-8", backtrace=False, diagnose=False)
+    """Devuelve el logger de la aplicación asociado al módulo `name`."""
+    _configure()
     return logger.bind(context=name)
+
+
+def is_verbose() -> bool:
+    """
+    True si está activo el modo detallado (trazas por entrada / por lote).
+    Los bucles calientes lo consultan una vez y omiten por completo
+    el formateo de mensajes cuando está apagado.
+    """
+    return _verbose
+
+
+def set_verbose(enabled: bool) -> None:
+    """Activa o desactiva en caliente el registro detallado (nivel DEBUG)."""
+    global _verbose
+    _configure()
+    with _lock:
+        if _verbose == bool(enabled):
+            return
+        _verbose = bool(enabled)
+        _install_handlers()
+    logger.bind(context=__name__).info(f"Registro detallado {'activado' if enabled else 'desactivado'}")
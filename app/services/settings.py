@@ -44,6 +44,37 @@ def load_config() -> dict:
     # en load_config()
     data.setdefault("ui_language", "es")
     data.setdefault("ui_theme", "dark")  # dark | light
+    # Caché persistente de análisis ffprobe (entradas máximas antes de expulsar por LRU)
+    data.setdefault("probe_cache_max_entries", 20000)
+    # ffprobe simultáneos al añadir videos (None = número de CPUs)
+    data.setdefault("probe_workers", None)
+    # Extracciones simultáneas (None = número de CPUs) y máximo por disco/recurso de red
+    data.setdefault("extract_workers", None)
+    data.setdefault("extract_io_per_disk", 2)
+    # Registro detallado (trazas por entrada y por lote); se cambia también desde el menú
+    data.setdefault("verbose_logging", False)
+    # Caché de traducciones en memoria (bytes; compartida por todos los archivos)
+    data.setdefault("translation_cache_max_bytes", 32 * 1024 * 1024)
+    # Motores HTTP asíncronos (requiere httpx): conexiones totales y peticiones por motor
+    data.setdefault("async_http", True)
+    data.setdefault("http_max_connections", 64)
+    data.setdefault("http_engine_concurrency", {"google_v1": 8, "mymemory": 16})
+    # URL base por motor para apuntar a otro servidor (p. ej. el simulado de benchmarks); vacío = oficial
+    data.setdefault("translation_endpoints", {})
+    # Límite de peticiones por motor, p. ej. {"google_v1": {"rate": 5, "burst": 10}} (vacío = por defecto)
+    data.setdefault("rate_limits", {})
+    # Tamaño de lote aprendido por motor ({"motor": {"max_lines", "max_chars"}}); se actualiza solo
+    data.setdefault("batch_tuning", {})
+    # Lotes en vuelo a la vez por archivo (se reensamblan por índice)
+    data.setdefault("translation_batches_in_flight", 4)
+    # Memoria de traducción persistente (cache/translation_memory.sqlite)
+    data.setdefault("translation_memory_enabled", True)
+    data.setdefault("translation_memory_max_entries", 200000)
+    # Medir cada import al arrancar e incluir los más lentos en el log (como -X importtime)
+    data.setdefault("startup_profile", False)
+    # Instrumentación por tramos (informe JSON junto a log.txt) y traza Chrome opcional
+    data.setdefault("instrumentation", False)
+    data.setdefault("instrumentation_trace", False)
 
     return data
 
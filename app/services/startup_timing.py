@@ -0,0 +1,121 @@
+# app\services\startup_timing.py
+"""
+Tiempos de arranque.
+
+- mark(etiqueta) anota hitos (imports, ventana creada, ventana visible...) y
+  report() los escribe en el log en una sola línea.
+- Con "startup_profile" en config.json (o la variable SUBTITLESUP_IMPORTTIME=1)
+  se mide además cada import, al estilo de `python -X importtime`, y el informe
+  incluye los módulos más lentos. Funciona también en el exe empaquetado, donde
+  no se pueden pasar opciones -X al intérprete.
+
+Este módulo no importa nada pesado: debe ser lo primero que importa main.py.
+"""
+import builtins
+import os
+import sys
+import threading
+import time
+
+# ------------------ Configuración ------------------
+ENV_VAR = "SUBTITLESUP_IMPORTTIME"
+REPORT_TOP = 15          # módulos listados en el informe
+MIN_REPORT_SECONDS = 0.002
+
+_t0 = time.perf_counter()
+_marks: list[tuple[str, float]] = []
+_imports: dict[str, list[float]] = {}  # módulo -> [propio, acumulado] en segundos
+_local = threading.local()
+_original_import = None
+_reported = False
+
+
+def profiling_enabled() -> bool:
+    """True si se pidió medir los imports (variable de entorno o config.json)."""
+    value = os.environ.get(ENV_VAR)
+    if value is not None:
+        return value not in ("", "0")
+    from app.services.settings import load_config
+    return bool(load_config().get("startup_profile", False))
+
+# ------------------ Medición de imports ------------------
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Solo cuenta la primera carga de cada módulo; el resto es una consulta a sys.modules
+    full = name
+    if level and globals:
+        package = globals.get("__package__") or ""
+        base = package.rsplit(".", level - 1)[0] if level > 1 else package
+        full = f"{base}.{name}" if name else base
+    module = sys.modules.get(full)
+    if module is not None:
+        # "from paquete import submódulo" carga el submódulo sin pasar por __import__
+        missing = [n for n in fromlist or () if n != "*" and not hasattr(module, n)]
+        if not missing:
+            return _original_import(name, globals, locals, fromlist, level)
+        full = f"{full}.{missing[0]}" if len(missing) == 1 else full
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        entry = _imports.setdefault(full, [0.0, 0.0])
+        entry[0] += elapsed - children
+        entry[1] += elapsed
+
+
+def install() -> None:
+    """Empieza a medir los imports si está activado. Llamar antes de cualquier otro import."""
+    global _original_import
+    if _original_import is not None or not profiling_enabled():
+        return
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def _uninstall() -> None:
+    global _original_import
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+
+# ------------------ Hitos e informe ------------------
+def mark(label: str) -> None:
+    """Anota un hito con el tiempo transcurrido desde que se importó este módulo."""
+    _marks.append((label, time.perf_counter() - _t0))
+
+
+def report(final_label: str = None) -> None:
+    """
+    Escribe en el log los hitos de arranque y, si se midieron, los imports más lentos
+    (tiempo propio y acumulado, como -X importtime). Solo informa una vez.
+    """
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    if final_label:
+        mark(final_label)
+    profiled = _original_import is not None
+    _uninstall()
+
+    from app.services.logging_config import get_logger
+    log = get_logger(__name__)
+    log.info("Arranque: " + " · ".join(f"{label} {t:.2f}s" for label, t in _marks))
+
+    if not profiled:
+        return
+    slowest = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)
+    total = sum(own for own, _ in _imports.values())
+    log.info(f"Imports: {len(_imports)} módulos, {total:.2f}s en total; los más lentos (propio | acumulado):")
+    for name, (own, cumulative) in slowest[:REPORT_TOP]:
+        if own < MIN_REPORT_SECONDS:
+            break
+        log.info(f"  {own * 1000:8.1f} ms | {cumulative * 1000:8.1f} ms | {name}")
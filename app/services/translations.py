@@ -117,6 +117,9 @@ TRANSLATIONS = {
     "open_selected_file_folder": "Abrir carpeta del archivo seleccionado",
     "expand_all": "Expandir todo",
     "collapse_all": "Colapsar todo",
+    "rebuild_probe_cache": "Reconstruir caché de análisis",
+    "probe_cache_rebuilt": "Caché de análisis vaciada; volviendo a analizar {count} archivo(s)...",
+    "verbose_logging": "Registro detallado (diagnóstico)",
 
     # Tooltips y mensajes de estado
     "no_files_loaded": "No hay archivos cargados",
@@ -132,6 +135,23 @@ TRANSLATIONS = {
     "list_updated": "Listado actualizado.",
     "analyzing_files": "Analizando {count} archivo(s)...",
 
+    # Ajuste de tiempos
+    "retime_subtitles": "Ajustar tiempos...",
+    "retime_files": "{count} archivo(s) seleccionado(s)",
+    "retime_mode": "Operación",
+    "retime_shift": "Desplazar",
+    "retime_fps": "Cambiar fps",
+    "retime_sync": "Resincronizar por dos puntos",
+    "retime_offset": "Desplazamiento",
+    "retime_fps_from": "De (fps)",
+    "retime_fps_to": "A (fps)",
+    "retime_point": "Punto {n} (actual → correcto)",
+    "retime_in_place": "Sobrescribir los originales (si no, se guardan en {folder})",
+    "retime_invalid": "Valores no válidos: {error}",
+    "retime_done": "Tiempos ajustados: {ok} archivo(s), {failed} con error",
+    "retime_canceled": "Ajuste de tiempos cancelado",
+    "retime_no_files": "Añade subtítulos a la lista para ajustar sus tiempos",
+
     # Info de pistas
     "no_default_track": "Sin default",
     "no_default_track_msg": "Este video no tiene pista marcada como predeterminada.",
@@ -265,6 +285,9 @@ TRANSLATIONS = {
     "open_selected_file_folder": "Open Selected File Folder",
     "expand_all": "Expand All",
     "collapse_all": "Collapse All",
+    "rebuild_probe_cache": "Rebuild probe cache",
+    "probe_cache_rebuilt": "Probe cache cleared; re-analyzing {count} file(s)...",
+    "verbose_logging": "Verbose logging (diagnostics)",
 
     # Tooltips and status messages
     "no_files_loaded": "No files loaded",
@@ -280,6 +303,23 @@ TRANSLATIONS = {
     "list_updated": "List updated.",
     "analyzing_files": "Analyzing {count} file(s)...",
 
+    # Timing adjustment
+    "retime_subtitles": "Adjust timings...",
+    "retime_files": "{count} file(s) selected",
+    "retime_mode": "Operation",
+    "retime_shift": "Shift",
+    "retime_fps": "Convert frame rate",
+    "retime_sync": "Two-point resync",
+    "retime_offset": "Offset",
+    "retime_fps_from": "From (fps)",
+    "retime_fps_to": "To (fps)",
+    "retime_point": "Point {n} (current → correct)",
+    "retime_in_place": "Overwrite the originals (otherwise they are saved to {folder})",
+    "retime_invalid": "Invalid values: {error}",
+    "retime_done": "Timings adjusted: {ok} file(s), {failed} failed",
+    "retime_canceled": "Timing adjustment canceled",
+    "retime_no_files": "Add subtitles to the list to adjust their timings",
+
     # Track info
     "no_default_track": "No default",
     "no_default_track_msg": "This video has no track marked as default.",
@@ -413,6 +453,9 @@ TRANSLATIONS = {
     "open_selected_file_folder": "Ouvrir le dossier du fichier sélectionné",
     "expand_all": "Tout développer",
     "collapse_all": "Tout réduire",
+    "rebuild_probe_cache": "Reconstruire le cache d'analyse",
+    "probe_cache_rebuilt": "Cache d'analyse vidé ; nouvelle analyse de {count} fichier(s)...",
+    "verbose_logging": "Journal détaillé (diagnostic)",
 
     # Info-bulles et messages d'état
     "no_files_loaded": "Aucun fichier chargé",
@@ -428,6 +471,23 @@ TRANSLATIONS = {
     "list_updated": "Liste mise à jour.",
     "analyzing_files": "Analyse de {count} fichier(s)...",
 
+    # Ajustement des temps
+    "retime_subtitles": "Ajuster les temps...",
+    "retime_files": "{count} fichier(s) sélectionné(s)",
+    "retime_mode": "Opération",
+    "retime_shift": "Décaler",
+    "retime_fps": "Convertir la fréquence d'images",
+    "retime_sync": "Resynchronisation sur deux points",
+    "retime_offset": "Décalage",
+    "retime_fps_from": "De (fps)",
+    "retime_fps_to": "À (fps)",
+    "retime_point": "Point {n} (actuel → correct)",
+    "retime_in_place": "Écraser les originaux (sinon ils sont enregistrés dans {folder})",
+    "retime_invalid": "Valeurs non valides : {error}",
+    "retime_done": "Temps ajustés : {ok} fichier(s), {failed} en erreur",
+    "retime_canceled": "Ajustement des temps annulé",
+    "retime_no_files": "Ajoutez des sous-titres à la liste pour ajuster leurs temps",
+
     # Informations sur les pistes
     "no_default_track": "Aucune par défaut",
     "no_default_track_msg": "Cette vidéo n'a aucune piste marquée par défaut.",
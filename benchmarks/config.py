@@ -0,0 +1,43 @@
+# benchmarks\config.py
+"""
+Configuración sustituida solo en este proceso (benchmarks y pruebas), sin tocar el
+config.json de la instalación: app.services.settings pasa a leer y guardar un
+config.json temporal (copia del real más los valores fijados). get_settings() ve
+así los valores de prueba y lo que la aplicación guarde (p. ej. batch_tuning) se
+queda en el temporal.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.services import settings
+
+_temp_dir: Optional[Path] = None
+_config_name: Optional[str] = None
+
+
+def override_config(**values) -> None:
+    """Fija claves de configuración para este proceso sin tocar config.json."""
+    global _temp_dir, _config_name
+    if _temp_dir is None:
+        real = settings.get_install_dir() / settings.CONFIG_NAME
+        _temp_dir = Path(tempfile.mkdtemp(prefix="bench-config-"))
+        temp = _temp_dir / "config.json"
+        if real.exists():
+            shutil.copyfile(real, temp)
+        # Ruta absoluta: get_install_dir() / CONFIG_NAME resuelve al temporal
+        _config_name, settings.CONFIG_NAME = settings.CONFIG_NAME, str(temp)
+    cfg = settings.load_config()
+    cfg.update(values)
+    settings.save_config(cfg)
+
+
+def clear_config_overrides() -> None:
+    """Vuelve al config.json de la instalación y borra el temporal."""
+    global _temp_dir, _config_name
+    if _temp_dir is None:
+        return
+    settings.CONFIG_NAME = _config_name
+    shutil.rmtree(_temp_dir, ignore_errors=True)
+    _temp_dir = _config_name = None
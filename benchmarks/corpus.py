@@ -0,0 +1,96 @@
+# benchmarks\corpus.py
+"""
+Corpus SRT sintéticos y deterministas (misma semilla = mismos bytes).
+
+Variantes:
+- plain:     UTF-8, LF, una o dos líneas por entrada.
+- multiline: hasta cuatro líneas con etiquetas <i>/<b>/<font>.
+- crlf:      CRLF y latin-1 (fuerza el fallback de codificación).
+- malformed: BOM, bloques sin tiempos, numeración rota, tiempos con punto
+             y huecos extra entre bloques.
+"""
+import random
+from pathlib import Path
+
+VARIANTS = ("plain", "multiline", "crlf", "malformed")
+
+_WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this "
+    "have from or one had by word but not what all were we when your can said there "
+    "use an each which she do how their if will up other about out many then them "
+    "these so some her would make like him into time has look two more write go see "
+    "número canción mañana corazón después también así está aquí ¿qué ¡vamos"
+).split()
+
+
+def _time(ms: int, sep: str = ",") -> str:
+    h, rem = divmod(ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02}:{m:02}:{s:02}{sep}{ms:03}"
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(3, 9))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice((".", "?", "!", "...", ","))
+
+
+def _text(rng: random.Random, variant: str) -> str:
+    if variant == "multiline":
+        lines = [_sentence(rng) for _ in range(rng.randint(1, 4))]
+        tag = rng.random()
+        if tag < 0.3:
+            lines = [f"<i>{line}</i>" for line in lines]
+        elif tag < 0.4:
+            lines[0] = f"<b>{lines[0]}</b>"
+        elif tag < 0.5:
+            lines[-1] = f'<font color="#ffff00">{lines[-1]}</font>'
+        return "\n".join(lines)
+    return "\n".join(_sentence(rng) for _ in range(rng.randint(1, 2)))
+
+
+def generate(cues: int, variant: str = "plain", seed: int = 1234) -> bytes:
+    """Devuelve el contenido de un SRT de `cues` entradas en la variante pedida."""
+    if variant not in VARIANTS:
+        raise ValueError(f"Variante desconocida: {variant}")
+    rng = random.Random(f"{seed}-{variant}-{cues}")
+    blocks = []
+    t = 1000
+    for i in range(1, cues + 1):
+        start = t + rng.randint(0, 800)
+        end = start + rng.randint(700, 5000)
+        t = end
+        text = _text(rng, variant)
+        sep = ","
+        number = str(i)
+        gap = "\n"
+        if variant == "malformed":
+            roll = rng.random()
+            if roll < 0.03:
+                blocks.append(f"{i}\n{text}\n")  # bloque sin tiempos
+                continue
+            if roll < 0.06:
+                number = str(i + 1000)       # numeración rota
+            elif roll < 0.10:
+                sep = "."                    # milisegundos con punto
+            elif roll < 0.13:
+                gap = "\n\n"                 # huecos extra
+        blocks.append(f"{number}\n{_time(start, sep)} --> {_time(end, sep)}\n{text}\n{gap}")
+    content = "".join(blocks)
+
+    if variant == "crlf":
+        return content.replace("\n", "\r\n").encode("latin-1", errors="replace")
+    data = content.encode("utf-8")
+    if variant == "malformed":
+        data = b"\xef\xbb\xbf" + data
+    return data
+
+
+def write(directory: Path, cues: int, variant: str = "plain", seed: int = 1234) -> Path:
+    """Escribe el corpus en `directory` (si no existe ya) y devuelve su ruta."""
+    path = Path(directory) / f"{variant}_{cues}.srt"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(generate(cues, variant, seed))
+    return path
@@ -0,0 +1,200 @@
+# benchmarks\engines.py
+"""
+Benchmark de los motores de traducción contra el servidor simulado (sin red).
+
+    python -m benchmarks.engines
+    python -m benchmarks.engines --engines google_v1 --pipeline-batch adaptive,20,60 --in-flight 1,4
+    python -m benchmarks.engines --throttle 0.05 --mangle 0.1 --transport async,sync --json engines.json
+
+Cada combinación (motor, transporte, lote del pipeline, lotes en vuelo) traduce un SRT sintético de punta a punta con translate_file y
+TranslationService, el mismo camino que TranslationWorker (en GoogleV1 cada lote
+del pipeline es una petición HTTP), e informa:
+- líneas/s;
+- peticiones por línea (incluye reintentos tras 429 y divisiones por marcadores);
+- tasa de fallback: líneas que vuelven sin traducir.
+
+La configuración se sustituye solo en este proceso (benchmarks.config: un config.json
+temporal; el de la instalación no se toca), sin memoria de traducción persistente y
+con la caché LRU vacía en cada ejecución.
+"""
+import argparse
+import itertools
+import json
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks import corpus
+from benchmarks.config import clear_config_overrides, override_config
+from benchmarks.mock_server import MockTranslationServer, add_config_arguments, config_from_args
+from benchmarks.run import _meta
+
+ENGINES = ("google_v1", "mymemory")   # google_free usa deep_translator, sin URL configurable
+UNLIMITED_RATE = {"rate": 1e6, "burst": 1_000_000}
+
+
+def _batcher_class():
+    """Ajustadores de lote que no escriben batch_tuning en config.json."""
+    from app.core.batching import AdaptiveBatcher
+
+    class BenchBatcher(AdaptiveBatcher):
+        """Adaptativo como el de la aplicación, pero sin persistir lo aprendido."""
+
+        def save(self) -> None:
+            pass
+
+    class FixedBatcher(BenchBatcher):
+        """Lotes de exactamente `lines` líneas (sin tope de caracteres ni ajuste)."""
+
+        def __init__(self, engine: str, lines: int):
+            super().__init__(engine)
+            self.max_lines = max(1, lines)
+            self.max_chars = sys.maxsize
+
+        def record(self, lines: int, latency: float, ok: bool) -> None:
+            pass
+
+    return BenchBatcher, FixedBatcher
+
+
+def _parse_list(value: str, cast=str) -> list:
+    return [cast(v.strip()) for v in value.split(",") if v.strip()]
+
+
+def _configure(endpoints: dict, engine: str, transport: str, unlimited: bool) -> None:
+    """Ajusta la configuración del proceso (sin escribir config.json) para una ejecución."""
+    from app.core.rate_limit import reset_rate_limiters
+    from app.core.translation_service import get_translation_cache
+
+    override_config(
+        translation_endpoints=endpoints,
+        translation_memory_enabled=False,
+        async_http=transport == "async",
+        rate_limits={engine: UNLIMITED_RATE} if unlimited else {},
+    )
+    reset_rate_limiters()
+    get_translation_cache().clear()
+
+
+def run_case(server, srt_path: Path, out_dir: Path, engine: str, transport: str, batch, in_flight: int,
+             unlimited: bool) -> Dict[str, float]:
+    """Traduce el corpus una vez con la combinación indicada y devuelve sus métricas."""
+    from app.core.translate_pipeline import translate_file
+    from app.core.translation_service import TranslationService
+
+    _configure(server.endpoints(), engine, transport, unlimited)
+    BenchBatcher, FixedBatcher = _batcher_class()
+    batcher = BenchBatcher(engine) if batch == "adaptive" else FixedBatcher(engine, int(batch))
+
+    service = TranslationService(engine)
+
+    counts = {"lines": 0, "checked": 0, "fallback": 0}
+    lock = threading.Lock()
+
+    def on_line(index: int, original: str, translated: str):
+        with lock:
+            counts["lines"] += 1
+            if any(c.isalpha() for c in original):
+                counts["checked"] += 1
+                if not translated.strip() or translated.strip() == original.strip():
+                    counts["fallback"] += 1
+
+    # Cada ejecución escribe en su carpeta (translate_file crea Subtitles_<tgt> junto a la entrada)
+    case_dir = Path(tempfile.mkdtemp(prefix="case-", dir=out_dir))
+    case_path = case_dir / srt_path.name
+    case_path.write_bytes(srt_path.read_bytes())
+
+    server.reset()
+    started = time.perf_counter()
+    translate_file(str(case_path), service, "en", "es", on_line=on_line, max_in_flight=in_flight, batcher=batcher)
+    wall = time.perf_counter() - started
+    stats = server.reset()
+
+    lines = counts["lines"]
+    return {
+        "wall_s": wall,
+        "lines": lines,
+        "lines_per_s": lines / wall if wall else 0.0,
+        "requests": stats.requests,
+        "requests_per_line": stats.requests / lines if lines else 0.0,
+        "fallback_rate": counts["fallback"] / counts["checked"] if counts["checked"] else 0.0,
+        "throttled": stats.throttled,
+        "mangled": stats.mangled,
+        "bytes_out": stats.bytes_out,
+    }
+
+
+def _cases(args) -> List[tuple]:
+    cases = []
+    for engine, transport in itertools.product(args.engines, args.transport):
+        for batch, in_flight in itertools.product(args.pipeline_batch, args.in_flight):
+            cases.append((engine, transport, batch, in_flight))
+    return cases
+
+
+def _key(engine, transport, batch, in_flight) -> str:
+    return f"{engine}/{transport} lote={batch} vuelo={in_flight}"
+
+# ------------------ Entrada ------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.engines", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", type=lambda v: _parse_list(v), default=list(ENGINES),
+                        help="motores separados por comas (google_v1,mymemory)")
+    parser.add_argument("--transport", type=lambda v: _parse_list(v), default=["async"],
+                        help="async (httpx), sync (requests) o ambos separados por comas")
+    parser.add_argument("--pipeline-batch", type=lambda v: _parse_list(v), default=["adaptive", "60"],
+                        help="líneas por lote del pipeline; 'adaptive' usa el ajuste automático")
+    parser.add_argument("--in-flight", type=lambda v: _parse_list(v, int), default=[1, 4],
+                        help="lotes del pipeline en vuelo a la vez")
+    parser.add_argument("--lines", type=int, default=500, help="entradas del SRT de prueba")
+    parser.add_argument("--variant", choices=corpus.VARIANTS, default="plain")
+    parser.add_argument("--no-rate-limit", action="store_true",
+                        help="sin limitador de peticiones (mide solo motor y servidor)")
+    add_config_arguments(parser)
+    parser.add_argument("--json", type=Path, help="escribe también los resultados en este archivo")
+    parser.add_argument("--keep-logs", action="store_true", help="no silenciar el log de la aplicación")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    unknown = set(args.engines) - set(ENGINES)
+    if unknown:
+        print(f"Motores no soportados por el servidor simulado: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    if not args.keep_logs:
+        from loguru import logger
+        logger.disable("app")
+
+    mock_config = config_from_args(args)
+    results: Dict[str, dict] = {}
+    with MockTranslationServer(config=mock_config) as server, tempfile.TemporaryDirectory(prefix="engine-bench-") as tmp:
+        srt_path = corpus.write(Path(tmp), args.lines, args.variant)
+        print(f"Servidor simulado en {server.url} ({json.dumps(asdict(mock_config))})")
+        print(f"{'caso':<52} {'líneas/s':>10} {'pet/línea':>10} {'fallback':>9} {'429':>5} {'alter.':>6} {'s':>7}")
+        try:
+            for case in _cases(args):
+                res = run_case(server, srt_path, Path(tmp), *case, unlimited=args.no_rate_limit)
+                key = _key(*case)
+                results[key] = res
+                print(
+                    f"{key:<52} {res['lines_per_s']:>10,.1f} {res['requests_per_line']:>10.3f} "
+                    f"{res['fallback_rate'] * 100:>8.1f}% {res['throttled']:>5} {res['mangled']:>6} {res['wall_s']:>7.2f}",
+                    flush=True
+                )
+        finally:
+            clear_config_overrides()
+
+    if args.json:
+        output = {"meta": _meta(), "server": asdict(mock_config), "lines": args.lines, "results": results}
+        args.json.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# benchmarks\mock_server.py
+"""
+Servidor HTTP local que imita a los motores de traducción, para medir sin red.
+
+    python -m benchmarks.mock_server --port 8765 --latency 120 --jitter 60 --throttle 0.02
+
+Rutas:
+- /translate_a/single?sl=..&tl=..&q=..   forma de Google (GoogleV1): [[[seg, orig, ...], ...], None, sl]
+- /get?q=..&langpair=src|dst             forma de MyMemory: {"responseData": {"translatedText": ...}}
+
+La "traducción" es determinista: cada línea se devuelve como "<tl>: <texto>",
+conservando los marcadores "[[n]]" de los lotes. Se puede inyectar:
+- latencia base, jitter y coste por línea;
+- respuestas 429 con Retry-After (probabilidad --throttle);
+- marcadores alterados en los lotes de Google (probabilidad --mangle):
+  un marcador perdido, dos líneas fusionadas o números cambiados.
+
+Para usar la aplicación contra el servidor, en config.json:
+    "translation_endpoints": {"google_v1": "http://127.0.0.1:8765/",
+                              "mymemory": "http://127.0.0.1:8765/get"}
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+_MARKER_RE = re.compile(r'^(\[\[\d+\]\]\s*)?(.*)$')
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 80.0      # latencia base por petición
+    jitter_ms: float = 40.0       # extra aleatorio uniforme en [0, jitter_ms]
+    per_line_ms: float = 1.0      # coste adicional por línea del lote
+    throttle_rate: float = 0.0    # probabilidad de responder 429
+    retry_after_s: float = 0.5    # Retry-After de los 429
+    mangle_rate: float = 0.0      # probabilidad de alterar los marcadores de un lote
+    seed: int = 1234
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    lines: int = 0            # líneas recibidas (todas las peticiones, incluidos reintentos)
+    throttled: int = 0
+    mangled: int = 0
+    bytes_out: int = 0
+
+
+def fake_translate(text: str, tl: str) -> str:
+    """Traducción simulada línea a línea, respetando los marcadores numerados."""
+    out = []
+    for line in text.split("\n"):
+        marker, body = _MARKER_RE.match(line).groups()
+        out.append(f"{marker or ''}{tl}: {body}" if body.strip() else line)
+    return "\n".join(out)
+
+
+def _mangle(text: str, rng: random.Random) -> str:
+    """Altera los marcadores como lo hace a veces el traductor real."""
+    markers = re.findall(r'\[\[\d+\]\]', text)
+    if len(markers) < 2:
+        return text
+    victim = rng.choice(markers[1:])
+    roll = rng.random()
+    if roll < 0.4:
+        return text.replace(victim, "", 1)                      # marcador perdido
+    if roll < 0.7:
+        return text.replace("\n" + victim, " " + victim, 1).replace(victim, "", 1)  # líneas fusionadas
+    return text.replace(victim, f"[[{rng.randint(100, 999)}]]", 1)                  # número cambiado
+
+
+class MockTranslationServer:
+    """ThreadingHTTPServer en un hilo demonio; start()/stop() o como context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: MockConfig = None):
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ------------------ Ciclo de vida ------------------
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def endpoints(self) -> dict:
+        """Valor para "translation_endpoints" en la configuración."""
+        return {"google_v1": self.url, "mymemory": self.url + "get"}
+
+    def start(self) -> "MockTranslationServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-translate", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def reset(self, config: MockConfig = None) -> MockStats:
+        """Devuelve las estadísticas acumuladas y empieza de cero (opcionalmente con otra config)."""
+        with self._lock:
+            stats, self.stats = self.stats, MockStats()
+            if config is not None:
+                self.config = config
+                self._rng = random.Random(config.seed)
+        return stats
+
+    # ------------------ Simulación ------------------
+    def _decide(self, lines: int):
+        """(espera en s, responder 429, alterar marcadores, rng propio) para una petición de `lines` líneas."""
+        cfg = self.config
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.lines += lines
+            delay = (cfg.latency_ms + self._rng.random() * cfg.jitter_ms + cfg.per_line_ms * lines) / 1000
+            throttle = self._rng.random() < cfg.throttle_rate
+            mangle = not throttle and self._rng.random() < cfg.mangle_rate
+            if throttle:
+                self.stats.throttled += 1
+            return delay, throttle, mangle, random.Random(self._rng.random())
+
+    def _count(self, nbytes: int, mangled: bool) -> None:
+        with self._lock:
+            self.stats.bytes_out += nbytes
+            if mangled:
+                self.stats.mangled += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como los servidores reales
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+                text = query.get("q", "")
+                if parts.path.endswith("/translate_a/single"):
+                    tl = query.get("tl", "es")
+                elif parts.path.endswith("/get"):
+                    tl = query.get("langpair", "auto|es").split("|")[-1]
+                else:
+                    self._send(404, b'{"error": "not found"}')
+                    return
+
+                delay, throttle, mangle, rng = server._decide(text.count("\n") + 1)
+                time.sleep(delay)
+                if throttle:
+                    self._send(429, b'{"error": "too many requests"}',
+                               {"Retry-After": f"{server.config.retry_after_s:g}"})
+                    return
+
+                translated = fake_translate(text, tl)
+                if parts.path.endswith("/get"):
+                    body = json.dumps({
+                        "responseData": {"translatedText": translated, "match": 1},
+                        "responseStatus": 200,
+                    })
+                    mangle = False
+                else:
+                    if mangle:
+                        translated = _mangle(translated, rng)
+                    # Google trocea la respuesta en segmentos (aquí, uno por línea)
+                    segments = [[seg, seg, None, None, 3] for seg in translated.splitlines(keepends=True)]
+                    body = json.dumps([segments, None, query.get("sl", "auto")])
+                data = body.encode("utf-8")
+                server._count(len(data), mangle)
+                self._send(200, data)
+
+        return Handler
+
+
+# ------------------ Entrada ------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mock_server",
+                                     description=__doc__.strip().splitlines()[0])
+    add_config_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opciones de MockConfig (compartidas con benchmarks.engines)."""
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency_ms, help="latencia base en ms")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter_ms, help="jitter máximo en ms")
+    parser.add_argument("--per-line", type=float, default=defaults.per_line_ms, help="ms extra por línea")
+    parser.add_argument("--throttle", type=float, default=defaults.throttle_rate, help="probabilidad de 429")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after_s, help="Retry-After de los 429 (s)")
+    parser.add_argument("--mangle", type=float, default=defaults.mangle_rate,
+                        help="probabilidad de alterar marcadores en lotes de Google")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency, jitter_ms=args.jitter, per_line_ms=args.per_line,
+        throttle_rate=args.throttle, retry_after_s=args.retry_after,
+        mangle_rate=args.mangle, seed=args.seed,
+    )
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    server = MockTranslationServer(args.host, args.port, config_from_args(args)).start()
+    print(f"Servidor simulado en {server.url}")
+    print(json.dumps({"translation_endpoints": server.endpoints()}))
+    try:
+        while True:
+            time.sleep(5)
+            print(json.dumps(asdict(server.stats)), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+# benchmarks\run.py
+"""
+Benchmarks de parseo, escritura, corrección y ajuste de tiempos de subtítulos.
+
+    python -m benchmarks                      # compara con benchmarks/baseline.json
+    python -m benchmarks --update-baseline    # guarda los resultados como nueva referencia
+    python -m benchmarks --quick --only load_srt,save_srt
+
+Cada caso se mide con el mejor de varios intentos (tiempo) y, aparte, con
+tracemalloc (memoria pico), para que el seguimiento de memoria no distorsione
+los tiempos. Sale con código 1 si algún caso empeora más que el umbral.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import corpus
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+QUICK_SIZES = (100, 1_000)
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25      # +25% de tiempo o memoria = regresión
+MIN_DELTA_S = 0.0005          # por debajo de 0,5 ms la diferencia es ruido
+MIN_REPEAT = 3
+MIN_TIME_S = 0.3              # repetir hasta acumular al menos este tiempo
+MAX_REPEAT = 50
+RECHECKS = 2                  # nuevas mediciones de un caso antes de darlo por regresión
+
+# ------------------ Casos ------------------
+@dataclass
+class Case:
+    function: str
+    variant: str
+    cues: int
+    setup: Callable[[], Any]       # prepara los argumentos (sin medir)
+    run: Callable[[Any], Any]      # lo que se mide
+    nbytes: int = 0                # bytes procesados, para MB/s
+
+    @property
+    def key(self) -> str:
+        return f"{self.function}[{self.variant}-{self.cues}]"
+
+
+def build_cases(sizes, work_dir: Path, only: Optional[set] = None) -> List[Case]:
+    """Genera los corpus necesarios y devuelve los casos a medir."""
+    from app.core import subtitles, timefix
+    from app.core.postprocess import postprocesar
+
+    out_dir = work_dir / "out"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cases: List[Case] = []
+
+    def add(function, variant, cues, setup, run, nbytes=0):
+        if only is None or function in only:
+            cases.append(Case(function, variant, cues, setup, run, nbytes))
+
+    for n in sizes:
+        paths = {v: corpus.write(work_dir, n, v) for v in corpus.VARIANTS}
+        size = {v: p.stat().st_size for v, p in paths.items()}
+
+        for variant in corpus.VARIANTS:
+            add("load_srt", variant, n, lambda p=paths[variant]: p,
+                lambda p: subtitles.load_srt(str(p)), size[variant])
+
+        for variant in ("plain", "multiline"):
+            def setup_save(p=paths[variant]):
+                entries = subtitles.load_srt(str(p))
+                for e in entries:
+                    e.translated = e.original.upper()
+                return entries
+            out = out_dir / f"save_{variant}_{n}.srt"
+            add("save_srt", variant, n, setup_save,
+                lambda entries, out=out: subtitles.save_srt(entries, str(out)), size[variant])
+
+        def setup_sync(p=paths["plain"]):
+            entries = subtitles.load_srt(str(p))
+            for e in entries:
+                e.translated = e.original.upper()
+            return p, entries
+        add("sync_entries_from_original", "plain", n, setup_sync,
+            lambda a: subtitles.sync_entries_from_original(str(a[0]), a[1]), size["plain"])
+        def setup_reconcile(p=paths["plain"], setup_sync=setup_sync):
+            return subtitles.load_srt(str(p)), setup_sync()[1]
+        add("reconcile_timings", "plain", n, setup_reconcile,
+            lambda a: subtitles.reconcile_timings(a[0], a[1]), size["plain"])
+
+        def setup_align(p=paths["plain"]):
+            # 1% de entradas partidas en dos: fuerza la alineación por bandas
+            original = subtitles.load_srt(str(p))
+            translated = []
+            for i, e in enumerate(original):
+                if i % 100 == 50:
+                    mid = (e.start_ms + e.end_ms) // 2
+                    translated.append(subtitles.SubtitleEntry(e.id, e.start_ms, mid, e.original, e.original.upper()))
+                    translated.append(subtitles.SubtitleEntry(e.id, mid, e.end_ms, "", "-"))
+                else:
+                    translated.append(subtitles.SubtitleEntry(e.id, e.start_ms, e.end_ms, e.original, e.original.upper()))
+            return original, translated
+        add("reconcile_timings", "split1pct", n, setup_align,
+            lambda a: subtitles.reconcile_timings(a[0], a[1]), size["plain"])
+
+        for variant in ("plain", "multiline"):
+            add("timefix.parse_srt", variant, n, lambda p=paths[variant]: p,
+                lambda p: timefix.parse_srt(str(p)), size[variant])
+
+        def setup_fix(p=paths["plain"], n=n):
+            translated = out_dir / f"fix_in_{n}.srt"
+            entries = subtitles.load_srt(str(p))
+            for e in entries:
+                e.translated = e.original.upper()
+                e.start_ms += 40  # tiempos desplazados que hay que corregir
+            subtitles.save_srt(entries, str(translated))
+            return p, translated, out_dir / f"fix_out_{n}.srt"
+        add("timefix.compare_and_fix_times", "plain", n, setup_fix,
+            lambda a: timefix.compare_and_fix_times(str(a[0]), str(a[1]), str(a[2])), size["plain"])
+
+        # 23.976 → 25 fps más un desplazamiento, sobre los bytes del archivo (como `retime`)
+        retime = timefix.TimeTransform.fps("23.976", "25").then(timefix.TimeTransform.shift(-500))
+        for variant in ("plain", "malformed"):
+            add("timefix.retime_bytes", variant, n, lambda p=paths[variant]: p.read_bytes(),
+                lambda data: timefix.retime_bytes(data, retime), size[variant])
+
+        for variant in ("plain", "multiline"):
+            add("postprocesar", variant, n,
+                lambda p=paths[variant]: [e.original for e in subtitles.load_srt(str(p))],
+                lambda texts: [postprocesar(t) for t in texts], size[variant])
+    return cases
+
+# ------------------ Medición ------------------
+def measure(case: Case, track_memory: bool = True) -> Dict[str, float]:
+    """Mejor tiempo y mediana de varias repeticiones, y memoria pico de una ejecución aparte."""
+    args = case.setup()
+    case.run(args)  # calentamiento (cachés del sistema, regex compiladas)
+
+    # Como timeit: sin recolector durante la medición, que si no dispara según la basura
+    # que hayan dejado los casos anteriores y vuelve bimodales los tiempos
+    times = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(times) < MIN_REPEAT or (time.perf_counter() - started < MIN_TIME_S and len(times) < MAX_REPEAT):
+            t0 = time.perf_counter()
+            case.run(args)
+            times.append(time.perf_counter() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    result = {
+        "best_s": min(times),
+        "median_s": statistics.median(times),
+        "repeats": len(times),
+        "cues_per_s": case.cues / min(times),
+        "mb_per_s": case.nbytes / min(times) / 1e6 if case.nbytes else 0.0,
+    }
+    if track_memory:
+        tracemalloc.start()
+        try:
+            case.run(args)
+            result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return result
+
+# ------------------ Comparación con la referencia ------------------
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Devuelve la lista de regresiones (tiempo o memoria) respecto a la referencia."""
+    regressions = []
+    for key, cur in results.items():
+        ref = baseline.get(key)
+        if not ref:
+            continue
+        if cur["best_s"] > ref["best_s"] * (1 + threshold) and cur["best_s"] - ref["best_s"] > MIN_DELTA_S:
+            regressions.append(
+                f"{key}: tiempo {ref['best_s'] * 1000:.2f} ms -> {cur['best_s'] * 1000:.2f} ms "
+                f"(+{(cur['best_s'] / ref['best_s'] - 1) * 100:.0f}%)"
+            )
+        if "peak_kib" in cur and ref.get("peak_kib") and cur["peak_kib"] > ref["peak_kib"] * (1 + threshold):
+            regressions.append(
+                f"{key}: memoria {ref['peak_kib']:.0f} KiB -> {cur['peak_kib']:.0f} KiB "
+                f"(+{(cur['peak_kib'] / ref['peak_kib'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def _meta() -> dict:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+# ------------------ Entrada ------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", help="tamaños en entradas separados por comas (por defecto 100,1000,10000,50000)")
+    parser.add_argument("--quick", action="store_true", help="solo 100 y 1000 entradas")
+    parser.add_argument("--only", help="funciones a medir separadas por comas, p. ej. load_srt,save_srt")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="JSON de referencia")
+    parser.add_argument("--update-baseline", action="store_true", help="guarda los resultados como referencia")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="regresión tolerada (0.25 = +25%%)")
+    parser.add_argument("--no-memory", action="store_true", help="no medir memoria pico")
+    parser.add_argument("--json", type=Path, help="escribe también los resultados en este archivo")
+    parser.add_argument("--corpus-dir", type=Path, help="carpeta para los corpus (por defecto, temporal)")
+    parser.add_argument("--keep-logs", action="store_true", help="no silenciar el log de la aplicación")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.sizes:
+        sizes = tuple(int(s) for s in args.sizes.split(","))
+    else:
+        sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    only = set(args.only.split(",")) if args.only else None
+
+    if not args.keep_logs:
+        # save_srt y compare_and_fix_times registran cada archivo; el log no es lo que se mide
+        from loguru import logger
+        logger.disable("app")
+
+    baseline_data = {}
+    if args.baseline.exists():
+        baseline_data = json.loads(args.baseline.read_text(encoding="utf-8"))
+    baseline = baseline_data.get("results", {})
+
+    with tempfile.TemporaryDirectory(prefix="srt-bench-") as tmp:
+        work_dir = args.corpus_dir or Path(tmp)
+        cases = build_cases(sizes, work_dir, only)
+        results: Dict[str, dict] = {}
+        print(f"{'caso':<48} {'mejor ms':>10} {'entradas/s':>12} {'MB/s':>8} {'pico KiB':>10} {'vs ref':>8}")
+        for case in cases:
+            res = measure(case, track_memory=not args.no_memory)
+            results[case.key] = res
+            ref = baseline.get(case.key)
+            delta = f"{(res['best_s'] / ref['best_s'] - 1) * 100:+.0f}%" if ref else "-"
+            print(
+                f"{case.key:<48} {res['best_s'] * 1000:>10.2f} {res['cues_per_s']:>12,.0f} "
+                f"{res['mb_per_s']:>8.1f} {res.get('peak_kib', 0):>10,.0f} {delta:>8}",
+                flush=True
+            )
+
+    output = {"meta": _meta(), "threshold": args.threshold, "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(output, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        # Se conservan los casos no medidos en esta ejecución (p. ej. con --only)
+        merged = dict(baseline)
+        merged.update(results)
+        output["results"] = dict(sorted(merged.items()))
+        args.baseline.write_text(json.dumps(output, indent=2), encoding="utf-8")
+        print(f"\nReferencia actualizada: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nSin referencia en {args.baseline}; usa --update-baseline para crearla.")
+        return 0
+
+    ref_meta = baseline_data.get("meta", {})
+    if ref_meta.get("machine") != platform.machine() or ref_meta.get("python") != platform.python_version():
+        print(f"\nAviso: referencia tomada en {ref_meta.get('platform')} / Python {ref_meta.get('python')}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        # Confirmar: volver a medir los casos señalados y quedarse con lo mejor (descarta picos de carga)
+        flagged = {line.split(":", 1)[0] for line in regressions}
+        with tempfile.TemporaryDirectory(prefix="srt-bench-") as tmp:
+            work_dir = args.corpus_dir or Path(tmp)
+            retry = {c.key: c for c in build_cases(sizes, work_dir, only) if c.key in flagged}
+            for key, case in retry.items():
+                for _ in range(RECHECKS):
+                    res = measure(case, track_memory=not args.no_memory)
+                    best = results[key]
+                    best["best_s"] = min(best["best_s"], res["best_s"])
+                    if "peak_kib" in res:
+                        best["peak_kib"] = min(best["peak_kib"], res["peak_kib"])
+        regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} regresiones (umbral +{args.threshold * 100:.0f}%):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nSin regresiones (umbral +{args.threshold * 100:.0f}%).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
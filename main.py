@@ -1,12 +1,19 @@
 # main.py
+# 🔹 Primero: mide el arranque (y los imports si "startup_profile" está activo)
+from app.services import startup_timing
+startup_timing.install()
+
 import sys, os
 from pathlib import Path
 from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtGui import QIcon
+from PySide6.QtCore import QTimer
 from app.gui.main_window import MainWindow
 from app.services.settings import get_settings
 from app.services.style_manager import apply_theme
 
+startup_timing.mark("imports")
+
 def resource_path(relative_path: str) -> str:
     """Devuelve la ruta absoluta al recurso, compatible con PyInstaller"""
     if hasattr(sys, '_MEIPASS'):
@@ -22,6 +29,7 @@ def show_fatal_error(message):
 def main():
     try:
         app = QApplication(sys.argv)
+        startup_timing.mark("QApplication")
         S = get_settings()
 
         # 🔹 Aplica el tema guardado en config.json (dark/light)
@@ -34,8 +42,11 @@ def main():
         win = MainWindow()
         # Opcional: también puedes fijar el icono en la ventana principal
         win.setWindowIcon(QIcon(icon_path))
+        startup_timing.mark("ventana creada")
 
         win.show()
+        # Al vaciarse la cola de eventos la ventana ya está pintada
+        QTimer.singleShot(0, lambda: startup_timing.report("ventana visible"))
         sys.exit(app.exec())
 
     except Exception as e:
@@ -0,0 +1,69 @@
+# tests\test_extract_translate.py
+"""
+`python -m app extract --translate-to`: la pista pasa de ffmpeg a la traducción en
+memoria y solo se escribe el SRT traducido. ffprobe/ffmpeg se sustituyen por la
+salida que darían (-f srt pipe:1) y la traducción va al servidor simulado.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app import cli
+from app.core import batch, ffmpeg_utils, subtitles
+from app.core.rate_limit import reset_rate_limiters
+from benchmarks import corpus
+from benchmarks.config import clear_config_overrides, override_config
+from benchmarks.mock_server import MockConfig, MockTranslationServer
+
+TRACKS = [{"index": 2, "codec_name": "subrip", "language": "eng", "default": True, "title": ""}]
+SRT = corpus.generate(40, "plain").decode("utf-8")
+
+
+def _stream(video, track_index, tracks=None, cancel=None, diagnostics=None):
+    yield from subtitles.iter_srt(iter(SRT.splitlines(keepends=True)), diagnostics)
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    def probe(video, use_cache=True):
+        st = Path(video).stat()
+        return ffmpeg_utils.ProbeResult(Path(video), st.st_size, st.st_mtime_ns, TRACKS)
+
+    monkeypatch.setattr(ffmpeg_utils, "probe_video", probe)
+    monkeypatch.setattr(ffmpeg_utils, "check_binaries", lambda: None)
+    monkeypatch.setattr(batch, "iter_subtitle_entries", _stream)
+
+
+@pytest.fixture
+def mock_server():
+    with MockTranslationServer(config=MockConfig(latency_ms=1, jitter_ms=0)) as server:
+        override_config(
+            output_mode="same",
+            translation_endpoints=server.endpoints(),
+            translation_memory_enabled=False,
+            rate_limits={"google_v1": {"rate": 1e6, "burst": 1_000_000}},
+        )
+        reset_rate_limiters()
+        yield server
+    clear_config_overrides()
+    reset_rate_limiters()
+
+
+def test_extract_translate_writes_only_translation(tmp_path, capsys, fake_ffmpeg, mock_server):
+    video = tmp_path / "show" / "ep1.mkv"
+    video.parent.mkdir()
+    video.write_bytes(b"video")
+
+    assert cli.main(["extract", str(tmp_path), "--translate-to", "es", "--engine", "google_v1"]) == 0
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [e["issues"] for e in events if e["event"] == "translate"] == [0]
+
+    written = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file())
+    assert written == ["show/Subtitles_es/ep1 [eng]_es.srt", "show/ep1.mkv"]
+
+    original = list(subtitles.iter_srt(iter(SRT.splitlines(keepends=True))))
+    translated = subtitles.load_srt(str(tmp_path / written[0]))
+    assert [(e.start_ms, e.end_ms) for e in translated] == [(e.start_ms, e.end_ms) for e in original]
+    assert all(e.original.startswith("es: ") for e in translated)